@@ -5,7 +5,8 @@ import logging
 import os
 import time
 import sys
-from modules import secui_mf2, secui_ngf, paloalto_api, analysis_module, deletion_process
+from modules import secui_mf2, secui_ngf, secui_ngf_v2, paloalto_api, analysis_module, deletion_process, deletion_pipeline, exception_engine, frame_io, object_resolver, fleet_analysis, change_token, metrics, profiling
+from contextlib import nullcontext
 
 # Load Configuration
 os.path.dirname(os.path.abspath(__file__))
@@ -21,6 +22,68 @@ def setup_logging(hostname):
             return True
     logging.getLogger().addFilter(HostnameFilter)
 
+def get_index_file(args, device_name):
+    if not args.cache_dir:
+        return None
+    os.makedirs(args.cache_dir, exist_ok=True)
+    return os.path.join(args.cache_dir, f'{device_name}_{args.type}_redundant_index.pkl')
+
+class ErrorCounter(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+def subcommand_name(args):
+    return getattr(args, f'{args.feature}_command', None)
+
+# 설정 변경 없이도 결과가 달라지는 명령 (show는 항상 실행합니다)
+CHANGE_TOKEN_EXEMPT = {('export', 'hitcount')}
+
+def check_change_token(args, hostname, config_type, probe):
+    """
+    --if-changed 옵션이 있으면 장비의 변경 토큰을 이전 실행 토큰과 비교합니다.
+    변경이 없으면 (None, True), 변경이 있으면 (기록할 키와 토큰, False)를 반환합니다.
+    """
+    if args.feature == 'show' or not args.if_changed:
+        return None, False
+    if (args.feature, subcommand_name(args)) in CHANGE_TOKEN_EXEMPT:
+        logging.info(f"'{args.feature} {subcommand_name(args)}' does not depend on configuration changes; ignoring --if-changed")
+        return None, False
+    key = f'{args.model}:{hostname}:{config_type}:{args.feature}:{subcommand_name(args)}'
+    try:
+        token = probe()
+    except Exception as e:
+        logging.warning(f"Failed to read change token, running anyway: {e}")
+        return None, False
+    if not change_token.TokenCache(args.token_file).has_changed(key, token):
+        logging.info(f"No configuration change since last run; skipping '{args.feature} {subcommand_name(args)}'")
+        return None, True
+    return (key, token), False
+
+def save_change_token(args, pending, errors):
+    # 실패한 실행의 토큰을 남기면 다음 실행이 건너뛰어지므로, 오류 없이 끝난 경우에만 기록합니다.
+    if pending is not None and errors.count == 0:
+        change_token.TokenCache(args.token_file).update(*pending)
+
+def save_export(args, save_excel, dfs, sheet_names, file_name):
+    """
+    --format이 xlsx이면 장비별 save_dfs_to_excel을, 그 밖의 형식이면 frame_io로 저장합니다.
+    """
+    if args.format == 'xlsx':
+        return save_excel(dfs, sheet_names, file_name)
+    files = frame_io.save_frames(dfs, sheet_names, frame_io.replace_extension(file_name, args.format))
+    logging.info(f"Saved {', '.join(files)}")
+    return True
+
+def fetch_rules(loader):
+    with metrics.stage('fetch') as record:
+        rule_df = loader()
+        record.rows = len(rule_df)
+    return rule_df
+
 def paloalto_command(args):
     try:
         hostname_list = args.ip.split(',')
@@ -34,6 +97,13 @@ def paloalto_command(args):
         api = paloalto_api.PaloAltoAPI(hostname, usesrname, password)
         fw_name = api.get_system_info()['hostname'].iloc[0]
 
+        config_type = 'candidate' if subcommand_name(args) == 'validation' else getattr(args, 'type', None) or 'running'
+        pending, unchanged = check_change_token(args, hostname, config_type, lambda: change_token.paloalto_change_token(api, config_type))
+        if unchanged:
+            continue
+        errors = ErrorCounter()
+        logging.getLogger().addHandler(errors)
+
         if args.feature == 'show':
             if args.show_command == 'info':
                 try:
@@ -67,8 +137,9 @@ def paloalto_command(args):
                     logging.info(f"Starting '{args.feature} {args.export_command}'")
                     current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
                     file_name = f'{current_date}_{fw_name}_{args.type}_{args.export_command}.xlsx'
-                    rule_df = api.export_security_rules(args.type)
-                    api.save_dfs_to_excel(rule_df, 'rules', file_name)
+                    rule_df = fetch_rules(lambda: api.export_security_rules(args.type))
+                    with metrics.stage('write', rows=len(rule_df)):
+                        save_export(args, api.save_dfs_to_excel, rule_df, 'rules', file_name)
                     logging.info(f"Completed '{args.feature} {args.export_command}'")
                 except Exception as e:
                     logging.exception(f"Exception in '{args.feature} {args.export_command}': {e}")
@@ -104,7 +175,7 @@ def paloalto_command(args):
                         dfs = api.export_service_group_objects(args.type)
                         sheet_names = args.option
                     
-                    api.save_dfs_to_excel(dfs, sheet_names, file_name)
+                    save_export(args, api.save_dfs_to_excel, dfs, sheet_names, file_name)
                     logging.info(f"Completed '{args.feature} {args.export_command}'")
                 except Exception as e:
                     logging.exception(f"Exception in '{args.feature} {args.export_command}': {e}")
@@ -114,9 +185,12 @@ def paloalto_command(args):
                     logging.info(f"Starting '{args.feature} {args.export_command}'")
                     current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
                     file_name = f'{current_date}_{fw_name}_{args.type}_{args.export_command}.xlsx'
-                    df = api.export_hit_count(args.vsys)
+                    if args.vsys == 'all':
+                        df = api.export_hit_count_all()
+                    else:
+                        df = api.export_hit_count(args.vsys)
                     sheet_names = args.export_command
-                    api.save_dfs_to_excel(df, sheet_names, file_name)
+                    save_export(args, api.save_dfs_to_excel, df, sheet_names, file_name)
                     logging.info(f"Completed '{args.feature} {args.export_command}'")
                 except Exception as e:
                     logging.exception(f"Exception in '{args.feature} {args.export_command}': {e}")
@@ -128,26 +202,42 @@ def paloalto_command(args):
                     current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
                     file_name = f'{current_date}_{fw_name}_{args.type}_{args.analyze_command}.xlsx'
                     sheet_names = args.analyze_command
-                    rule_df = api.export_security_rules(args.type)
-                    analysis_module.analyze_redundant_policies(rule_df, 'paloalto', file_name)
+                    rule_df = fetch_rules(lambda: api.export_security_rules(args.type))
+                    resolver = object_resolver.ObjectResolver.from_paloalto(api, args.type) if args.resolve_objects else None
+                    analysis_module.analyze_redundant_policies(rule_df, 'paloalto', file_name, resolver, args.workers, get_index_file(args, fw_name))
                     logging.info(f"Completed '{args.feature} {args.analyze_command}'")
                 except Exception as e:
                     logging.exception(f"Exception in '{args.feature} {args.analyze_command}': {e}")
             
+            elif args.analyze_command == 'shadow':
+                try:
+                    logging.info(f"Starting '{args.feature} {args.analyze_command}'")
+                    current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
+                    file_name = f'{current_date}_{fw_name}_{args.type}_{args.analyze_command}.xlsx'
+                    rule_df = fetch_rules(lambda: api.export_security_rules(args.type))
+                    resolver = object_resolver.ObjectResolver.from_paloalto(api, args.type) if args.resolve_objects else None
+                    analysis_module.analyze_shadowed_policies(rule_df, 'paloalto', file_name, resolver)
+                    logging.info(f"Completed '{args.feature} {args.analyze_command}'")
+                except Exception as e:
+                    logging.exception(f"Exception in '{args.feature} {args.analyze_command}': {e}")
+
             elif args.analyze_command == 'validation':
                 try:
                     logging.info(f"Starting '{args.feature} {args.analyze_command}'")
                     current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
                     file_name = f'{current_date}_{fw_name}_{args.type}_{args.analyze_command}.xlsx'
-                    running_df = api.export_security_rules('running')
-                    candidate_df = api.export_security_rules('candidate')
-                    analysis_module.compare_and_save_firewall_policies(running_df, candidate_df, file_name)
+                    running_df = fetch_rules(lambda: api.export_security_rules('running'))
+                    candidate_df = fetch_rules(lambda: api.export_security_rules('candidate'))
+                    analysis_module.compare_and_save_firewall_policies(running_df, candidate_df, file_name, order_aware=args.order_aware)
                     logging.info(f"Completed '{args.feature} {args.analyze_command}'")
                 except Exception as e:
                     logging.exception(f"Exception in '{args.feature} {args.analyze_command}': {e}")
             else:
                 logging.error("Invalid Arguments")
 
+        logging.getLogger().removeHandler(errors)
+        save_change_token(args, pending, errors)
+
 def mf2_command(args):
     try:
         hostname_list = args.ip.split(',')
@@ -158,6 +248,12 @@ def mf2_command(args):
     
     for hostname in hostname_list:
         setup_logging(hostname)
+        pending, unchanged = check_change_token(args, hostname, 'running', lambda: change_token.mf2_change_token(hostname, username, password))
+        if unchanged:
+            continue
+        errors = ErrorCounter()
+        logging.getLogger().addHandler(errors)
+
         if args.feature == 'show':
             if args.show_command == 'info':
                 try:
@@ -173,8 +269,9 @@ def mf2_command(args):
                     logging.info(f"Starting '{args.feature} {args.export_command}'")
                     current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
                     file_name = f'{current_date}_{hostname}_{args.export_command}.xlsx'
-                    rule_df = secui_mf2.export_security_rules(hostname, username, password)
-                    secui_mf2.save_dfs_to_excel(rule_df, args.export_command, file_name)
+                    rule_df = fetch_rules(lambda: secui_mf2.export_security_rules(hostname, username, password))
+                    with metrics.stage('write', rows=len(rule_df)):
+                        save_export(args, secui_mf2.save_dfs_to_excel, rule_df, args.export_command, file_name)
                     logging.info(f"Completed '{args.feature} {args.export_command}'")
                 except Exception as e:
                     logging.exception(f"Exception in '{args.feature} {args.export_command}': {e}")
@@ -185,7 +282,7 @@ def mf2_command(args):
                     current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
                     file_name = f'{current_date}_{hostname}_{args.export_command}.xlsx'
                     dfs = secui_mf2.export_objects(hostname, username, password)
-                    secui_mf2.save_dfs_to_excel(dfs, ['address', 'address_group', 'service'], file_name)
+                    save_export(args, secui_mf2.save_dfs_to_excel, dfs, ['address', 'address_group', 'service'], file_name)
                     logging.info(f"Completed '{args.feature} {args.export_command}'")
                 except Exception as e:
                     logging.exception(f"Exception in '{args.feature} {args.export_command}': {e}")
@@ -196,8 +293,20 @@ def mf2_command(args):
                     logging.info(f"Starting '{args.feature} {args.analyze_command}'")
                     current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
                     file_name = f'{current_date}_{hostname}_{args.analyze_command}.xlsx'
-                    rule_df = secui_mf2.export_security_rules(hostname, username, password)
-                    analysis_module.analyze_redundant_policies(rule_df, 'mf2', file_name)
+                    rule_df = fetch_rules(lambda: secui_mf2.export_security_rules(hostname, username, password))
+                    resolver = object_resolver.ObjectResolver.from_mf2(secui_mf2.export_objects(hostname, username, password)) if args.resolve_objects else None
+                    analysis_module.analyze_redundant_policies(rule_df, 'mf2', file_name, resolver, args.workers, get_index_file(args, hostname))
+                    logging.info(f"Completed '{args.feature} {args.analyze_command}'")
+                except Exception as e:
+                    logging.exception(f"Exception in '{args.feature} {args.analyze_command}': {e}")
+            elif args.analyze_command == 'shadow':
+                try:
+                    logging.info(f"Starting '{args.feature} {args.analyze_command}'")
+                    current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
+                    file_name = f'{current_date}_{hostname}_{args.analyze_command}.xlsx'
+                    rule_df = fetch_rules(lambda: secui_mf2.export_security_rules(hostname, username, password))
+                    resolver = object_resolver.ObjectResolver.from_mf2(secui_mf2.export_objects(hostname, username, password)) if args.resolve_objects else None
+                    analysis_module.analyze_shadowed_policies(rule_df, 'mf2', file_name, resolver)
                     logging.info(f"Completed '{args.feature} {args.analyze_command}'")
                 except Exception as e:
                     logging.exception(f"Exception in '{args.feature} {args.analyze_command}': {e}")
@@ -206,6 +315,9 @@ def mf2_command(args):
         else:
             logging.error("This command is currently not supported")
 
+        logging.getLogger().removeHandler(errors)
+        save_change_token(args, pending, errors)
+
 
 def ngf_command(args):
     if ',' in args.ip:
@@ -217,14 +329,25 @@ def ngf_command(args):
     client_secret = args.password
     
     setup_logging(hostname)
+    pending, unchanged = check_change_token(args, hostname, 'running', lambda: change_token.ngf_change_token(hostname, client_id, client_secret))
+    if unchanged:
+        return True
+    errors = ErrorCounter()
+    logging.getLogger().addHandler(errors)
+
     if args.feature == 'export':
         if args.export_command == 'rules':
             try:
                 logging.info(f"Starting '{args.feature} {args.export_command}'")
                 current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
                 file_name = f'{current_date}_{hostname}_{args.export_command}.xlsx'
-                rule_df = secui_ngf.export_security_rules(hostname, client_id, client_secret)
-                secui_ngf.save_dfs_to_excel(rule_df, args.export_command, file_name)
+                if args.chunked:
+                    client = secui_ngf_v2.NGFClient(hostname, client_id, client_secret)
+                    rule_df = fetch_rules(lambda: client.export_security_rules_chunked(args.chunk_size))
+                else:
+                    rule_df = fetch_rules(lambda: secui_ngf.export_security_rules(hostname, client_id, client_secret))
+                with metrics.stage('write', rows=len(rule_df)):
+                    save_export(args, frame_io.save_frames, rule_df, args.export_command, file_name)
                 logging.info(f"Completed '{args.feature} {args.export_command}'")
             except Exception as e:
                 logging.exception(f"Exception in '{args.feature} {args.export_command}': {e}")
@@ -235,8 +358,18 @@ def ngf_command(args):
                 logging.info(f"Starting '{args.feature} {args.analyze_command}'")
                 current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
                 file_name = f'{current_date}_{hostname}_{args.analyze_command}.xlsx'
-                rule_df = secui_ngf.export_security_rules(hostname, client_id, client_secret)
-                analysis_module.analyze_redundant_policies(rule_df, 'ngf', file_name)
+                rule_df = fetch_rules(lambda: secui_ngf.export_security_rules(hostname, client_id, client_secret))
+                analysis_module.analyze_redundant_policies(rule_df, 'ngf', file_name, workers=args.workers, index_file=get_index_file(args, hostname))
+                logging.info(f"Completed '{args.feature} {args.analyze_command}'")
+            except Exception as e:
+                logging.exception(f"Exception in '{args.feature} {args.analyze_command}': {e}")
+        elif args.analyze_command == 'shadow':
+            try:
+                logging.info(f"Starting '{args.feature} {args.analyze_command}'")
+                current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
+                file_name = f'{current_date}_{hostname}_{args.analyze_command}.xlsx'
+                rule_df = fetch_rules(lambda: secui_ngf.export_security_rules(hostname, client_id, client_secret))
+                analysis_module.analyze_shadowed_policies(rule_df, 'ngf', file_name)
                 logging.info(f"Completed '{args.feature} {args.analyze_command}'")
             except Exception as e:
                 logging.exception(f"Exception in '{args.feature} {args.analyze_command}': {e}")
@@ -245,17 +378,142 @@ def ngf_command(args):
     else:
         logging.error("This command is currently not supported")
 
+    logging.getLogger().removeHandler(errors)
+    save_change_token(args, pending, errors)
+
+def fleet_redundant_command(args):
+    hostname_list = args.ip.split(',')
+    index = fleet_analysis.FleetIndex.load(args.index)
+
+    for hostname in hostname_list:
+        setup_logging(hostname)
+        try:
+            logging.info(f"Indexing rules of {hostname}")
+            if args.model == 'paloalto':
+                api = paloalto_api.PaloAltoAPI(hostname, args.username, args.password)
+                device_name = api.get_system_info()['hostname'].iloc[0]
+                rule_df = fetch_rules(lambda: api.export_security_rules(args.type))
+            elif args.model == 'mf2':
+                device_name = hostname
+                rule_df = fetch_rules(lambda: secui_mf2.export_security_rules(hostname, args.username, args.password))
+            elif args.model == 'ngf':
+                device_name = hostname
+                rule_df = fetch_rules(lambda: secui_ngf.export_security_rules(hostname, args.username, args.password))
+            index.add_device(device_name, args.model, rule_df)
+        except Exception as e:
+            logging.exception(f"Exception in indexing {hostname}: {e}")
+
+    index.save(args.index)
+
+    try:
+        logging.info(f"Starting '{args.feature} {args.analyze_command}'")
+        current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
+        file_name = f'{current_date}_fleet_{args.analyze_command}.xlsx'
+        duplicates = index.find_duplicates()
+        fleet_analysis.save_fleet_report(duplicates, file_name)
+        logging.info(f"Completed '{args.feature} {args.analyze_command}'")
+    except Exception as e:
+        logging.exception(f"Exception in '{args.feature} {args.analyze_command}': {e}")
+
+def deletion_command(args):
+    if args.usage and len(args.usage) != len(args.rules):
+        logging.error("--usage requires one hit count file per --rules file")
+        return
+    if args.redundant and len(args.redundant) != len(args.rules):
+        logging.error("--redundant requires one redundancy result file per --rules file")
+        return
+    stages = args.tasks.split(',')
+    unknown = [stage for stage in stages if stage not in deletion_pipeline.STAGES]
+    if unknown:
+        logging.error(f"Unknown deletion tasks: {', '.join(unknown)} (choose from {', '.join(deletion_pipeline.STAGES)})")
+        return
+    try:
+        for file_format in (args.format, args.checkpoint_format):
+            if file_format:
+                frame_io.require_pyarrow(file_format)
+    except ImportError as e:
+        logging.error(e)
+        return
+
+    exception_rules = exception_engine.load_rules(args.exception_rules) if args.exception_rules else None
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    jobs = []
+    for i, rule_file in enumerate(args.rules):
+        jobs.append({
+            'rules': rule_file,
+            'vendor': args.vendor,
+            'usage': args.usage[i] if args.usage else None,
+            'redundant': args.redundant[i] if args.redundant else None,
+            'output_base': os.path.join(args.output_dir, deletion_process.remove_extension(os.path.basename(rule_file))),
+            'stages': stages,
+            'checkpoint_dir': args.checkpoint_dir,
+            'unused_days': args.unused_days,
+            'checkpoint_format': args.checkpoint_format,
+            'output_format': args.format,
+            'exception_rules': exception_rules,
+        })
+
+    info_df = None
+    if args.info:
+        with metrics.stage('read_info') as record:
+            # 모든 매칭 키에 신청번호가 포함되므로 정책 파일들의 신청번호로 미리 걸러도 결과는 같습니다.
+            info_df = deletion_process.read_request_info(args.info, deletion_pipeline.request_ids(args.rules, stages))
+            record.rows = len(info_df)
+
+    logging.info(f"Starting '{args.feature} {args.deletion_command}' for {len(jobs)} rule files")
+    results = deletion_pipeline.run_jobs(jobs, info_df, args.workers)
+    failed = [result for result in results if 'error' in result]
+    for result in results:
+        if 'error' in result:
+            logging.error(f"Failed '{result['rules']}': {result['error']}")
+        else:
+            logging.info(f"Completed '{result['rules']}' ({result['rows']} rules): {', '.join(result['files'])}")
+    logging.info(f"Completed '{args.feature} {args.deletion_command}' ({len(results) - len(failed)} succeeded, {len(failed)} failed)")
+
+def run_command(args):
+    if args.feature == 'deletion':
+        if args.deletion_command == 'run':
+            deletion_command(args)
+        else:
+            deletion_process.deletion_process_main()
+        if metrics.current().stages:
+            metrics.current().emit(args.metrics)
+    else:
+        try:
+            if args.feature == 'analyze' and args.analyze_command == 'fleet-redundant':
+                fleet_redundant_command(args)
+            elif args.model == 'paloalto':
+                paloalto_command(args)
+            elif args.model == 'mf2':
+                mf2_command(args)
+            elif args.model == 'ngf':
+                ngf_command(args)
+        except ValueError as e:
+            logging.exception(f"Exception: {e}")
+            return
+        finally:
+            if metrics.current().stages:
+                metrics.current().emit(args.metrics)
+
 def main():
     parser = argparse.ArgumentParser(prog='FPAT', description='FPAT | Firewall Policy Analysis Tool')
     parser.add_argument('-v', '--version', action='version', version='%(prog)s 2.1.0')
+    parser.add_argument('--metrics', type=str, default=None, help='Write stage timings, row counts and peak RSS to a JSON file')
+    parser.add_argument('--profile', action='store_true', help=f'Write cProfile (.prof) and collapsed stack (.collapsed) files (or set {profiling.PROFILE_ENV}=1)')
+    parser.add_argument('--profile-memory', action='store_true', help=f'Save a tracemalloc snapshot after each stage (or set {profiling.PROFILE_MEMORY_ENV}=1)')
 
     subparsers = parser.add_subparsers(dest='feature', required=True)
 
+    def add_change_token_args(subparser):
+        subparser.add_argument('--if-changed', action='store_true', help='Skip devices whose configuration has not changed since the last successful run')
+        subparser.add_argument('--token-file', type=str, default='.fpat_change_tokens.json', help='Local change token cache')
+
     def add_common_args(subparser):
-        parser.add_argument('model', type=str, choices=['paloalto', 'mf2', 'ngf'], help='Firewall Model')
-        parser.add_argument('username', type=str, help='Username(NGF: Client ID)')
-        parser.add_argument('password', type=str, help='Password(Client Secret)')
-        parser.add_argument('ip', type=str, help='Firewall IP Address e.g. 192.168.0.1,192.168.0.2...')
+        subparser.add_argument('model', type=str, choices=['paloalto', 'mf2', 'ngf'], help='Firewall Model')
+        subparser.add_argument('username', type=str, help='Username(NGF: Client ID)')
+        subparser.add_argument('password', type=str, help='Password(Client Secret)')
+        subparser.add_argument('ip', type=str, help='Firewall IP Address e.g. 192.168.0.1,192.168.0.2...')
 
     # show
     parser_show = subparsers.add_parser('show', help='Show Information')
@@ -267,44 +525,76 @@ def main():
     # export
     parser_export = subparsers.add_parser('export', help='Export Information')
     parser_export.add_argument('--type', type=str, choices=['running', 'candidate'], default='running', help='Configuration Type')
+    parser_export.add_argument('--format', type=str, choices=frame_io.EXPORT_FORMATS, default='xlsx', help='Output file format (parquet/feather require pyarrow)')
     # export config
     subparsers_export = parser_export.add_subparsers(dest='export_command', required=True)
     subparsers_export.add_parser('config', help='Export Configuration')
     # export rules
-    subparsers_export.add_parser('rules', help='Export Security Rules')
+    parser_export_rules = subparsers_export.add_parser('rules', help='Export Security Rules')
+    parser_export_rules.add_argument('--chunked', action='store_true', help='Stream the rule response and build the table in chunks (ngf)')
+    parser_export_rules.add_argument('--chunk-size', type=int, default=5000, help='Rules per chunk with --chunked')
     # export objects
     parser_export_objects = subparsers_export.add_parser('objects', help='Export Objects')
     parser_export_objects.add_argument('--option', type=str, choices=['all', 'network', 'network-group', 'service', 'service-group'], default='all', help='Object Type')
     # export hitcount
     parser_export_hitcount = subparsers_export.add_parser('hitcount', help='Export Hit Count')
-    parser_export_hitcount.add_argument('--vsys', type=str, default='vsys1', help='Vsys Name')
+    parser_export_hitcount.add_argument('--vsys', type=str, default='vsys1', help="Vsys Name ('all': every vsys)")
+    add_change_token_args(parser_export)
     add_common_args(parser_export)
 
     # analyze
     parser_analyze = subparsers.add_parser('analyze', help='Analyze Information')
     parser_analyze.add_argument('--type', type=str, choices=['running', 'candidate'], default='running', help='Configuration Type')
+    parser_analyze.add_argument('--workers', type=int, default=None, help='Number of processes for partitioned redundancy analysis')
+    parser_analyze.add_argument('--cache-dir', type=str, default=None, help='Directory for incremental redundancy analysis index')
+    parser_analyze.add_argument('--resolve-objects', action='store_true', help='Compare resolved object values instead of object names (paloalto, mf2)')
+    add_change_token_args(parser_analyze)
     subparsers_analyze = parser_analyze.add_subparsers(dest='analyze_command', required=True)
     # analyze redundant
     subparsers_analyze.add_parser('redundant', help='Analyze Redundant Policies')
+    # analyze shadow
+    subparsers_analyze.add_parser('shadow', help='Analyze Shadowed Policies')
+    # analyze fleet-redundant
+    parser_analyze_fleet = subparsers_analyze.add_parser('fleet-redundant', help='Analyze Redundant Policies Across Devices')
+    parser_analyze_fleet.add_argument('--index', type=str, default='fleet_index.pkl', help='Fleet index file (updated incrementally)')
     # analyze validation
-    subparsers_analyze.add_parser('validation', help='Analyze Validation')
+    parser_analyze_validation = subparsers_analyze.add_parser('validation', help='Analyze Validation')
+    parser_analyze_validation.add_argument('--order-aware', action='store_true', help='Detect moved rules and member-level changes')
     add_common_args(parser_analyze)
 
+    # deletion
+    parser_deletion = subparsers.add_parser('deletion', help='Policy Deletion Workflow')
+    subparsers_deletion = parser_deletion.add_subparsers(dest='deletion_command', required=True)
+    # deletion menu
+    subparsers_deletion.add_parser('menu', help='Interactive Task Menu')
+    # deletion run
+    parser_deletion_run = subparsers_deletion.add_parser('run', help='Run Deletion Tasks Non-interactively')
+    parser_deletion_run.add_argument('--vendor', type=str, choices=list(deletion_pipeline.EXCEPTION_VENDORS), required=True, help='Firewall Vendor of the rule files')
+    parser_deletion_run.add_argument('--rules', type=str, nargs='+', required=True, help='Rule files (.xlsx, .parquet, .feather, .csv[.gz] or .pkl checkpoint), one per firewall')
+    parser_deletion_run.add_argument('--info', type=str, default=None, help='Request info file (required for the enrich task)')
+    parser_deletion_run.add_argument('--usage', type=str, nargs='+', default=None, help='Hit count files (Rule Name, Unused Days), one per rule file (notice files are skipped when 미사용여부 is empty)')
+    parser_deletion_run.add_argument('--redundant', type=str, nargs='+', default=None, help='Redundant policy results (_정리.xlsx from the menu: Rule Name, 작업구분), one per rule file; fills 중복여부 so those rules are left out of notices')
+    parser_deletion_run.add_argument('--tasks', type=str, default=','.join(deletion_pipeline.STAGES), help=f"Comma separated tasks (default: {','.join(deletion_pipeline.STAGES)})")
+    parser_deletion_run.add_argument('--exception-rules', type=str, default=None, help='JSON file of exception rules replacing the vendor defaults (first matching rule wins)')
+    parser_deletion_run.add_argument('--unused-days', type=int, default=90, help='Unused days threshold for 미사용 rules')
+    parser_deletion_run.add_argument('--output-dir', type=str, default='.', help='Directory for result files')
+    parser_deletion_run.add_argument('--checkpoint-dir', type=str, default=None, help='Directory for per-task checkpoints')
+    parser_deletion_run.add_argument('--checkpoint-format', type=str, choices=['parquet', 'feather', 'csv.gz', 'pkl'], default=None, help='Checkpoint format (default: parquet if pyarrow is installed, otherwise pkl)')
+    parser_deletion_run.add_argument('--format', type=str, choices=frame_io.EXPORT_FORMATS, default='xlsx', help='Format of the final rule file (notice files are always xlsx)')
+    parser_deletion_run.add_argument('--workers', type=int, default=None, help='Number of processes (one rule file per process)')
+
     args = parser.parse_args()
 
-    if args.feature == 'deletion':
-        deletion_process.deletion_process_main()
+    profile_memory = args.profile_memory or profiling.env_enabled(profiling.PROFILE_MEMORY_ENV)
+    if args.profile or profile_memory or profiling.env_enabled(profiling.PROFILE_ENV):
+        current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
+        command = '_'.join(part for part in [args.feature, getattr(args, 'model', None), subcommand_name(args)] if part)
+        profiler = profiling.profile_run(f'{current_date}_{command}_profile', memory=profile_memory)
     else:
-        try:
-            if args.model == 'paloalto':
-                paloalto_command(args)
-            elif args.model == 'mf2':
-                mf2_command(args)
-            elif args.model == 'ngf':
-                ngf_command(args)
-        except ValueError as e:
-            logging.exception(f"Exception: {e}")
-            return
+        profiler = nullcontext()
+
+    with profiler:
+        run_command(args)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,323 @@
+"""
+벤치마크용 합성 방화벽 설정 생성기
+
+같은 규칙 모델(generate_rules)을 Palo Alto XML, MF2 .fwrules/.conf, NGF JSON 형식으로 출력합니다.
+시드가 같으면 항상 같은 데이터를 만들며, 일부 규칙은 앞선 규칙의 멤버를 복사해 중복정책 분석이
+실제로 그룹을 찾도록 합니다.
+"""
+import os
+import json
+import random
+from xml.sax.saxutils import escape, quoteattr
+
+import pandas as pd
+
+PROTOCOLS = ['tcp', 'udp']
+APPLICATIONS = ['ssl', 'web-browsing', 'dns', 'ssh', 'ftp', 'smtp', 'ldap', 'ms-rdp', 'snmp', 'ntp']
+DUPLICATE_RATIO = 0.05
+
+
+def object_counts(rule_count: int) -> dict:
+    return {
+        'hosts': max(50, rule_count // 5),
+        'networks': max(20, rule_count // 20),
+        'groups': max(10, rule_count // 50),
+        'services': max(20, rule_count // 50),
+        'users': max(10, rule_count // 100),
+    }
+
+
+def generate_objects(rule_count: int, seed: int = 0) -> dict:
+    """
+    규칙 수에 비례하는 호스트/네트워크/그룹/서비스/사용자 객체를 생성합니다.
+    """
+    rng = random.Random(seed)
+    counts = object_counts(rule_count)
+    hosts = [(f'h_{i}', f'10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}') for i in range(counts['hosts'])]
+    networks = [(f'n_{i}', f'172.{16 + (i >> 8) % 16}.{i & 255}.0', '24') for i in range(counts['networks'])]
+    groups = []
+    for i in range(counts['groups']):
+        members = rng.sample(range(len(hosts)), k=min(len(hosts), rng.randint(2, 6)))
+        nets = rng.sample(range(len(networks)), k=min(len(networks), rng.randint(0, 2)))
+        groups.append((f'g_{i}', members, nets))
+    services = [(f'{protocol}_{port}', protocol, str(port)) for protocol, port in
+                ((PROTOCOLS[i % 2], 1024 + i * 7) for i in range(counts['services']))]
+    users = [f'user{i}' for i in range(counts['users'])]
+    return {'hosts': hosts, 'networks': networks, 'groups': groups, 'services': services, 'users': users}
+
+
+def generate_rules(rule_count: int, seed: int = 0, objects: dict = None) -> list:
+    """
+    공통 규칙 모델을 생성합니다. 멤버는 객체 이름 리스트이며, 빈 리스트는 any입니다.
+    """
+    rng = random.Random(seed)
+    objects = objects or generate_objects(rule_count, seed)
+    address_names = [name for name, _ in objects['hosts']] + [name for name, _, _ in objects['networks']] + [name for name, _, _ in objects['groups']]
+    service_names = [name for name, _, _ in objects['services']]
+
+    def pick(names, low, high, any_ratio):
+        if rng.random() < any_ratio:
+            return []
+        return sorted(rng.sample(names, k=min(len(names), rng.randint(low, high))))
+
+    rules = []
+    for i in range(rule_count):
+        if rules and rng.random() < DUPLICATE_RATIO:
+            source = rules[rng.randrange(len(rules))]
+            rule = dict(source)
+            # 멤버 순서만 바꾼 중복 규칙
+            for field in ['source', 'destination', 'service']:
+                rule[field] = list(reversed(source[field]))
+        else:
+            rule = {
+                'source': pick(address_names, 1, 3, 0.05),
+                'user': pick(objects['users'], 1, 2, 0.9),
+                'destination': pick(address_names, 1, 3, 0.05),
+                'service': pick(service_names, 1, 2, 0.1),
+                'application': pick(APPLICATIONS, 1, 2, 0.6),
+                'action': 'allow' if rng.random() < 0.85 else 'deny',
+                'enable': rng.random() < 0.95,
+            }
+        rule['name'] = f'rule_{i + 1}'
+        rule['description'] = f'REQ-{rng.randint(1000, 9999)} synthetic rule {i + 1}'
+        rules.append(rule)
+    return rules
+
+
+# ────────────── PALO ALTO ──────────────
+
+def _members(tag: str, values: list) -> str:
+    values = values or ['any']
+    return f'<{tag}>' + ''.join(f'<member>{escape(value)}</member>' for value in values) + f'</{tag}>'
+
+
+def paloalto_config_xml(rules: list, objects: dict, vsys_count: int = 2) -> str:
+    """
+    PaloAltoAPI.get_config 응답 형식(<response><result><config>...)의 XML 문자열을 생성합니다.
+    규칙은 vsys_count개의 vsys에 순서대로 나누어 배치합니다.
+    """
+    addresses = ''.join(f'<entry name={quoteattr(name)}><ip-netmask>{ip}/32</ip-netmask></entry>' for name, ip in objects['hosts'])
+    addresses += ''.join(f'<entry name={quoteattr(name)}><ip-netmask>{ip}/{mask}</ip-netmask></entry>' for name, ip, mask in objects['networks'])
+    address_groups = ''.join(
+        f'<entry name={quoteattr(name)}><static>'
+        + ''.join(f'<member>{objects["hosts"][i][0]}</member>' for i in members)
+        + ''.join(f'<member>{objects["networks"][i][0]}</member>' for i in nets)
+        + '</static></entry>'
+        for name, members, nets in objects['groups']
+    )
+    services = ''.join(f'<entry name={quoteattr(name)}><protocol><{protocol}><port>{port}</port></{protocol}></protocol></entry>' for name, protocol, port in objects['services'])
+
+    per_vsys = (len(rules) + vsys_count - 1) // vsys_count
+    vsys_entries = []
+    for v in range(vsys_count):
+        entries = []
+        for rule in rules[v * per_vsys:(v + 1) * per_vsys]:
+            entries.append(
+                f'<entry name={quoteattr(rule["name"])}>'
+                + _members('from', []) + _members('to', [])
+                + _members('source', rule['source']) + _members('source-user', rule['user'])
+                + _members('destination', rule['destination']) + _members('service', rule['service'])
+                + _members('application', rule['application']) + _members('category', [])
+                + f'<action>{rule["action"]}</action>'
+                + ('' if rule['enable'] else '<disabled>yes</disabled>')
+                + f'<description>{escape(rule["description"])}</description>'
+                + '</entry>'
+            )
+        vsys_entries.append(
+            f'<entry name="vsys{v + 1}">'
+            f'<address>{addresses}</address><address-group>{address_groups}</address-group>'
+            f'<service>{services}</service><service-group/>'
+            f'<rulebase><security><rules>{"".join(entries)}</rules></security></rulebase>'
+            '</entry>'
+        )
+    return (
+        '<response status="success"><result><config><devices><entry name="localhost.localdomain">'
+        f'<vsys>{"".join(vsys_entries)}</vsys>'
+        '</entry></devices></config></result></response>'
+    )
+
+
+def paloalto_hit_count_xml(rules: list, vsys_name: str = 'vsys1', seed: int = 0) -> str:
+    rng = random.Random(seed)
+    entries = []
+    for rule in rules:
+        hit = rng.choice([0, 0, rng.randint(1, 10 ** 6)])
+        last_hit = 0 if hit == 0 else rng.randint(1_600_000_000, 1_700_000_000)
+        entries.append(
+            f'<entry name={quoteattr(rule["name"])}><latest>yes</latest><hit-count>{hit}</hit-count>'
+            f'<last-hit-timestamp>{last_hit}</last-hit-timestamp><last-reset-timestamp>0</last-reset-timestamp>'
+            f'<first-hit-timestamp>{last_hit}</first-hit-timestamp><rule-creation-timestamp>1600000000</rule-creation-timestamp>'
+            f'<rule-modification-timestamp>1600000000</rule-modification-timestamp></entry>'
+        )
+    return (
+        '<response status="success"><result><rule-hit-count><vsys><entry name='
+        f'{quoteattr(vsys_name)}><rule-base><entry name="security"><rules>{"".join(entries)}</rules>'
+        '</entry></rule-base></entry></vsys></rule-hit-count></result></response>'
+    )
+
+
+# ────────────── MF2 ──────────────
+
+def _mf2_members(names: list, ids: dict) -> str:
+    return ','.join(f'{ids[name]} "{name}"' for name in names)
+
+
+def mf2_rule_file(rules: list, objects: dict) -> str:
+    """
+    secui_mf2_v2.rule_parsing이 읽는 중괄호 형식의 .fwrules 내용을 생성합니다.
+    """
+    ids = {name: i + 1 for i, name in enumerate(
+        [name for name, _ in objects['hosts']] + [name for name, _, _ in objects['networks']]
+        + [name for name, _, _ in objects['groups']] + [name for name, _, _ in objects['services']] + objects['users']
+    )}
+    lines = ['{', '{']
+    for i, rule in enumerate(rules):
+        lines.append(
+            f'{{rid={i + 1}, description="{rule["description"]}", use="{"Y" if rule["enable"] else "N"}", '
+            f'action="{rule["action"]}", group="0", shaping_string="", bi_di="0", '
+            f'from = {{{_mf2_members(rule["source"], ids)}}},  '
+            f'to = {{{_mf2_members(rule["destination"], ids)}}},  '
+            f'service = {{{_mf2_members(rule["service"], ids)}}},  vid="0", '
+            f'ua = {{{_mf2_members(rule["user"], ids)}}}, unuse="0"}}'
+        )
+    lines += ['}', '}']
+    return '\n'.join(lines)
+
+
+def _mf2_object_file(blocks: list) -> str:
+    return '\n'.join(['{', '{version = 1}'] + blocks + ['}'])
+
+
+def mf2_object_files(objects: dict) -> dict:
+    """
+    hostobject/networkobject/groupobject/serviceobject.conf 내용을 {파일명: 내용} 사전으로 생성합니다.
+    """
+    header = 'zone = "internal", user = "admin", date = "2024-01-01"'
+    hosts = [f'{{id = {i + 1}, name = "{name}", {header}, ip = "{ip}", d = "host {i + 1}"}}' for i, (name, ip) in enumerate(objects['hosts'])]
+    networks = [f'{{id = {i + 1}, name = "{name}", {header}, ip="{ip}", mask="{mask}", d = "network {i + 1}"}}' for i, (name, ip, mask) in enumerate(objects['networks'])]
+    groups = []
+    for i, (name, members, nets) in enumerate(objects['groups']):
+        host_ids = ','.join(f'[{m + 1}]=1' for m in members)
+        net_ids = ','.join(f'[{m + 1}]=1' for m in nets)
+        groups.append(
+            f'{{id = {i + 1}, name = "{name}", {header}, count = {{hosts={len(members)},networks={len(nets)}}}, '
+            f'hosts={{{host_ids}}}, networks={{{net_ids}}}, d = "group {i + 1}"}}'
+        )
+    services = [
+        f'{{id = {i + 1}, name = "{name}", protocol="{protocol}", str_src_port="0-65535", str_svc_port="{port}", svc_type="normal", d = "service {i + 1}"}}'
+        for i, (name, protocol, port) in enumerate(objects['services'])
+    ]
+    return {
+        'groupobject.conf': _mf2_object_file(groups),
+        'hostobject.conf': _mf2_object_file(hosts),
+        'networkobject.conf': _mf2_object_file(networks),
+        # serviceobject.conf는 앞의 두 블록을 건너뛰고 읽습니다.
+        'serviceobject.conf': '\n'.join(['{', '{version = 1}', '{type = 0}'] + services + ['}']),
+    }
+
+
+# ────────────── NGF ──────────────
+
+def ngf_rules_payload(rules: list, seed: int = 0) -> dict:
+    """
+    NGFClient.get_fw4_rules 응답 형식({"result": [...]})의 사전을 생성합니다. 마지막에 default 규칙을 포함합니다.
+    """
+    rng = random.Random(seed)
+    result = []
+    for i, rule in enumerate(rules):
+        result.append({
+            'seq': i + 1,
+            'fw_rule_id': i + 1,
+            'name': rule['name'],
+            'use': 1 if rule['enable'] else 0,
+            'action': 1 if rule['action'] == 'allow' else 0,
+            'src': [{'name': name} for name in rule['source']],
+            'user': [{'name': name} for name in rule['user']],
+            'dst': [{'name': name} for name in rule['destination']],
+            'srv': [{'name': name} for name in rule['service']],
+            'app': [{'name': name} for name in rule['application']],
+            'last_hit_time': None if rng.random() < 0.3 else f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 00:00:00',
+            'desc': rule['description'],
+        })
+    result.append({'seq': len(rules) + 1, 'fw_rule_id': 0, 'name': 'default', 'use': 1, 'action': 0})
+    return {'result': result}
+
+
+# ────────────── COMMON ──────────────
+
+def rules_to_dataframe(rules: list, vsys_count: int = 0) -> pd.DataFrame:
+    """
+    익스포터 출력과 같은 컬럼의 규칙 DataFrame을 생성합니다(파싱 없이 분석 벤치마크에 사용).
+    """
+    def join(values):
+        return ','.join(values) if values else 'any'
+
+    rows = []
+    per_vsys = (len(rules) + vsys_count - 1) // vsys_count if vsys_count else len(rules)
+    for i, rule in enumerate(rules):
+        row = {}
+        if vsys_count:
+            row['Vsys'] = f'vsys{i // per_vsys + 1}'
+        row.update({
+            'Seq': i % per_vsys + 1,
+            'Rule Name': rule['name'],
+            'Enable': 'Y' if rule['enable'] else 'N',
+            'Action': rule['action'].capitalize(),
+            'Source': join(rule['source']),
+            'User': join(rule['user']),
+            'Destination': join(rule['destination']),
+            'Service': join(rule['service']),
+            'Application': join(rule['application']),
+            'Description': rule['description'],
+        })
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def extracted_dataframe(rules: list, objects: dict) -> pd.DataFrame:
+    """
+    checking_overlapped가 사용하는 Extracted Source/Destination/Service 컬럼을 가진 DataFrame을 생성합니다.
+    """
+    values = {name: f'{ip}/32' for name, ip in objects['hosts']}
+    values.update({name: f'{ip}/{mask}' for name, ip, mask in objects['networks']})
+    for name, members, nets in objects['groups']:
+        values[name] = ','.join([values[objects['hosts'][i][0]] for i in members] + [values[objects['networks'][i][0]] for i in nets])
+    services = {name: f'{protocol}/{port}' for name, protocol, port in objects['services']}
+
+    def expand(names, mapping):
+        return ','.join(mapping[name] for name in names) if names else 'any'
+
+    df = rules_to_dataframe(rules)
+    df['Application'] = df['Application'].str.lower()
+    df['Extracted Source'] = [expand(rule['source'], values) for rule in rules]
+    df['Extracted Destination'] = [expand(rule['destination'], values) for rule in rules]
+    df['Extracted Service'] = [expand(rule['service'], services) for rule in rules]
+    return df
+
+
+def write_dataset(directory: str, rule_count: int, seed: int = 0) -> dict:
+    """
+    rule_count 규모의 데이터셋 파일을 directory에 쓰고 경로 사전을 반환합니다.
+    """
+    os.makedirs(directory, exist_ok=True)
+    objects = generate_objects(rule_count, seed)
+    rules = generate_rules(rule_count, seed, objects)
+    paths = {
+        'paloalto': os.path.join(directory, 'paloalto_config.xml'),
+        'paloalto_hitcount': os.path.join(directory, 'paloalto_hitcount.xml'),
+        'mf2_rules': os.path.join(directory, 'bench.fwrules'),
+        'ngf': os.path.join(directory, 'ngf_rules.json'),
+    }
+    with open(paths['paloalto'], 'w', encoding='utf-8') as file:
+        file.write(paloalto_config_xml(rules, objects))
+    with open(paths['paloalto_hitcount'], 'w', encoding='utf-8') as file:
+        file.write(paloalto_hit_count_xml(rules, seed=seed))
+    with open(paths['mf2_rules'], 'w', encoding='utf-8') as file:
+        file.write(mf2_rule_file(rules, objects))
+    for file_name, content in mf2_object_files(objects).items():
+        paths[file_name] = os.path.join(directory, file_name)
+        with open(paths[file_name], 'w', encoding='utf-8') as file:
+            file.write(content)
+    with open(paths['ngf'], 'w', encoding='utf-8') as file:
+        json.dump(ngf_rules_payload(rules, seed), file)
+    return paths
@@ -0,0 +1,456 @@
+"""
+오프라인 부하 테스트용 가상 장비 서버
+
+- Palo Alto XML API (HTTPS): keygen, config show/get, op 명령(system info/state, rule-hit-count, config audit, pending-changes)
+- NGF REST (HTTPS): 외부 로그인/로그아웃, fw4 규칙, 객체 조회
+- MF2 SSH/SCP (paramiko): ls, cat, md5sum 등 FPAT가 실행하는 명령과 scp 다운로드
+
+응답 데이터는 benchmarks/generators.py로 만들며, 요청마다 지연(latency)과 오류율(error_rate)을 줄 수 있습니다.
+
+    python -m benchmarks.mock_devices --rules 10000 --latency 0.05
+"""
+import os
+import sys
+import json
+import time
+import shlex
+import socket
+import random
+import hashlib
+import logging
+import argparse
+import datetime
+import tempfile
+import threading
+import ssl
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import paramiko
+
+from benchmarks import generators
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+MF2_REMOTE_DIRECTORY = '/secui/etc/'
+MF2_RULE_FILE = 'mock.fwrules'
+MF2_INFO = "MODEL=MF2-MOCK\nTYPE=FW\nMAC=00:00:00:00:00:01\nSERIAL=MOCK0001\n"
+
+
+class DeviceData:
+    """
+    가상 장비가 응답할 합성 설정입니다. 모든 서버가 같은 규칙 모델을 공유합니다.
+    """
+
+    def __init__(self, rule_count: int = 1000, seed: int = 0, vsys_count: int = 2):
+        objects = generators.generate_objects(rule_count, seed)
+        rules = generators.generate_rules(rule_count, seed, objects)
+        self.rule_count = rule_count
+        self.vsys_names = [f'vsys{i + 1}' for i in range(vsys_count)]
+        self.paloalto_config = generators.paloalto_config_xml(rules, objects, vsys_count).encode('utf-8')
+        per_vsys = (len(rules) + vsys_count - 1) // vsys_count
+        self.paloalto_hit_count = {
+            name: generators.paloalto_hit_count_xml(rules[i * per_vsys:(i + 1) * per_vsys], name, seed).encode('utf-8')
+            for i, name in enumerate(self.vsys_names)
+        }
+        self.ngf_rules = json.dumps(generators.ngf_rules_payload(rules, seed)).encode('utf-8')
+        self.ngf_objects = {
+            '/api/op/host/4/objects': [{'name': name, 'ip': ip} for name, ip in objects['hosts']],
+            '/api/op/network/4/objects': [{'name': name, 'ip': f'{ip}/{mask}'} for name, ip, mask in objects['networks']],
+            '/api/op/domain/4/objects': [],
+            '/api/op/group/4/objects': [{'name': name} for name, _, _ in objects['groups']],
+            '/api/op/service/objects': [{'name': name, 'protocol': protocol, 'port': port} for name, protocol, port in objects['services']],
+            '/api/op/service-group/objects': [],
+        }
+        self.mf2_files = {MF2_RULE_FILE: generators.mf2_rule_file(rules, objects).encode('utf-8')}
+        self.mf2_files.update({name: content.encode('utf-8') for name, content in generators.mf2_object_files(objects).items()})
+
+
+def make_self_signed_cert(directory: str) -> tuple:
+    """
+    localhost용 자체 서명 인증서를 directory에 만들고 (cert 경로, key 경로)를 반환합니다.
+    """
+    from cryptography import x509
+    from cryptography.x509.oid import NameOID
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, 'localhost')])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=365))
+        .sign(key, hashes.SHA256())
+    )
+    cert_file = os.path.join(directory, 'mock_cert.pem')
+    key_file = os.path.join(directory, 'mock_key.pem')
+    with open(cert_file, 'wb') as file:
+        file.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_file, 'wb') as file:
+        file.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.TraditionalOpenSSL, serialization.NoEncryption()))
+    return cert_file, key_file
+
+
+# ────────────── HTTPS ──────────────
+
+class MockHTTPSServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, handler, data: DeviceData, latency: float = 0.0, error_rate: float = 0.0, chunk_size: int = 65536):
+        super().__init__(address, handler)
+        self.data = data
+        self.latency = latency
+        self.error_rate = error_rate
+        self.chunk_size = chunk_size
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logging.debug("%s %s", self.address_string(), format % args)
+
+    def begin_request(self) -> bool:
+        """
+        지연과 오류율을 적용합니다. 오류를 응답했으면 False를 반환합니다.
+        """
+        with self.server._lock:
+            self.server.request_count += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.server.error_rate and random.random() < self.server.error_rate:
+            self.send_body(b'Service Unavailable', 'text/plain', status=503)
+            return False
+        return True
+
+    def send_body(self, body: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        chunk_size = self.server.chunk_size
+        for start in range(0, len(body), chunk_size):
+            self.wfile.write(body[start:start + chunk_size])
+
+
+class PaloAltoHandler(MockHandler):
+    """
+    PaloAltoAPI가 사용하는 /api/ 엔드포인트를 흉내 냅니다.
+    """
+
+    def do_GET(self):
+        if not self.begin_request():
+            return
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path.rstrip('/') != '/api':
+            self.send_body(b'Not Found', 'text/plain', status=404)
+            return
+        body = self.respond(params)
+        self.send_body(body.encode('utf-8') if isinstance(body, str) else body, 'application/xml')
+
+    def respond(self, params: dict):
+        data = self.server.data
+        request_type = params.get('type')
+        if request_type == 'keygen':
+            return '<response status="success"><result><key>MOCKAPIKEY</key></result></response>'
+        if request_type == 'config':
+            if params.get('xpath') == '/config/devices/entry/vsys/entry':
+                entries = ''.join(f'<entry name="{name}"/>' for name in data.vsys_names)
+                return f'<response status="success"><result>{entries}</result></response>'
+            return data.paloalto_config
+        if request_type == 'op':
+            cmd = params.get('cmd', '')
+            if '<system><info/>' in cmd:
+                return (
+                    '<response status="success"><result><system><hostname>mock-pa</hostname>'
+                    '<ip-address>127.0.0.1</ip-address><mac-address>00:00:00:00:00:01</mac-address>'
+                    '<uptime>10 days, 1:00:00</uptime><model>PA-MOCK</model><serial>MOCK0001</serial>'
+                    '<sw-version>10.1.0</sw-version><app-version>8000-0000</app-version></system></result></response>'
+                )
+            if '<system><state>' in cmd:
+                state = '\n'.join(f'cfg.general.max-{name}: {value}' for name, value in
+                                  [('address', 40000), ('address-group', 4000), ('service', 4000), ('service-group', 1000), ('policy-rule', 20000)])
+                return f'<response status="success"><result>{state}</result></response>'
+            if 'rule-hit-count' in cmd:
+                for name in data.vsys_names:
+                    if f"'{name}'" in cmd or f'"{name}"' in cmd:
+                        return data.paloalto_hit_count[name]
+                return data.paloalto_hit_count[data.vsys_names[0]]
+            if '<config><audit>' in cmd:
+                return '<response status="success"><result><entry><version>1</version><date>2024/01/01 00:00:00</date></entry></result></response>'
+            if 'pending-changes' in cmd:
+                return '<response status="success"><result>no</result></response>'
+        return '<response status="error"><msg>unsupported request</msg></response>'
+
+
+class NGFHandler(MockHandler):
+    """
+    NGFClient가 사용하는 REST 엔드포인트를 흉내 냅니다.
+    """
+    TOKEN = 'mock-api-token'
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def authorized(self) -> bool:
+        if self.headers.get('Authorization') == self.TOKEN:
+            return True
+        self.send_body(b'{"result": null, "msg": "unauthorized"}', 'application/json', status=401)
+        return False
+
+    def do_POST(self):
+        self.read_body()
+        if not self.begin_request():
+            return
+        if self.path == '/api/au/external/login':
+            self.send_body(json.dumps({'result': {'api_token': self.TOKEN}}).encode('utf-8'), 'application/json')
+        else:
+            self.send_body(b'{}', 'application/json', status=404)
+
+    def do_DELETE(self):
+        if not self.begin_request():
+            return
+        if self.path == '/api/au/external/logout' and self.authorized():
+            self.send_body(b'{"result": "ok"}', 'application/json')
+        elif self.path != '/api/au/external/logout':
+            self.send_body(b'{}', 'application/json', status=404)
+
+    def do_GET(self):
+        if not self.begin_request() or not self.authorized():
+            return
+        data = self.server.data
+        if self.path == '/api/po/fw/4/rules':
+            self.send_body(data.ngf_rules, 'application/json')
+        elif self.path in data.ngf_objects:
+            self.send_body(json.dumps({'result': data.ngf_objects[self.path]}).encode('utf-8'), 'application/json')
+        else:
+            self.send_body(b'{}', 'application/json', status=404)
+
+
+def start_https_server(handler, data: DeviceData, port: int = 0, latency: float = 0.0, error_rate: float = 0.0,
+                       cert: tuple = None, host: str = '127.0.0.1') -> MockHTTPSServer:
+    """
+    가상 HTTPS 서버를 백그라운드 스레드로 시작합니다. port=0이면 빈 포트를 사용합니다(server.port).
+    """
+    if cert is None:
+        cert = make_self_signed_cert(tempfile.mkdtemp(prefix='fpat_mock_'))
+    server = MockHTTPSServer((host, port), handler, data, latency, error_rate)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(*cert)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, name=f'{handler.__name__}-{server.port}', daemon=True).start()
+    logging.info(f"{handler.__name__} listening on https://{host}:{server.port}")
+    return server
+
+
+def start_paloalto_server(data: DeviceData, port: int = 0, latency: float = 0.0, error_rate: float = 0.0, cert: tuple = None) -> MockHTTPSServer:
+    return start_https_server(PaloAltoHandler, data, port, latency, error_rate, cert)
+
+
+def start_ngf_server(data: DeviceData, port: int = 0, latency: float = 0.0, error_rate: float = 0.0, cert: tuple = None) -> MockHTTPSServer:
+    return start_https_server(NGFHandler, data, port, latency, error_rate, cert)
+
+
+# ────────────── SSH / SCP ──────────────
+
+class MF2ServerInterface(paramiko.ServerInterface):
+    def __init__(self, password: str = None):
+        self.password = password
+        self.commands = {}
+        self.ready = threading.Condition()
+
+    def check_auth_password(self, username, password):
+        if self.password is None or password == self.password:
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def get_allowed_auths(self, username):
+        return 'password'
+
+    def check_channel_request(self, kind, chanid):
+        if kind == 'session':
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        with self.ready:
+            self.commands[channel.get_id()] = command.decode('utf-8')
+            self.ready.notify_all()
+        return True
+
+    def wait_command(self, channel, timeout: float = 10.0) -> str:
+        with self.ready:
+            self.ready.wait_for(lambda: channel.get_id() in self.commands, timeout)
+            return self.commands.pop(channel.get_id(), None)
+
+
+class MockMF2Server:
+    """
+    MF2 장비를 흉내 내는 SSH 서버입니다. FPAT가 실행하는 셸 명령과 scp -f(다운로드)만 지원합니다.
+    """
+
+    def __init__(self, data: DeviceData, port: int = 0, latency: float = 0.0, error_rate: float = 0.0,
+                 password: str = None, host: str = '127.0.0.1'):
+        self.data = data
+        self.latency = latency
+        self.error_rate = error_rate
+        self.password = password
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((host, port))
+        self.socket.listen(100)
+        self.port = self.socket.getsockname()[1]
+        self.request_count = 0
+        self._running = True
+        threading.Thread(target=self._accept_loop, name=f'mf2-ssh-{self.port}', daemon=True).start()
+        logging.info(f"MockMF2Server listening on ssh://{host}:{self.port}")
+
+    def stop(self):
+        self._running = False
+        self.socket.close()
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                client, _ = self.socket.accept()
+            except OSError:
+                break
+            threading.Thread(target=self._serve_connection, args=(client,), daemon=True).start()
+
+    def _serve_connection(self, client):
+        transport = paramiko.Transport(client)
+        transport.add_server_key(self.host_key)
+        interface = MF2ServerInterface(self.password)
+        try:
+            transport.start_server(server=interface)
+            while transport.is_active():
+                channel = transport.accept(1)
+                if channel is None:
+                    continue
+                command = interface.wait_command(channel)
+                if command is not None:
+                    self._run_command(channel, command)
+        except (paramiko.SSHException, EOFError, OSError) as e:
+            logging.debug(f"SSH connection closed: {e}")
+        finally:
+            transport.close()
+
+    def _run_command(self, channel, command: str):
+        self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate and random.random() < self.error_rate:
+            channel.sendall_stderr(b'mock: temporary failure\n')
+            channel.send_exit_status(1)
+            channel.close()
+            return
+
+        # "cd <dir> && <command>" 형식은 작업 디렉터리만 바꿉니다.
+        if '&&' in command:
+            command = command.split('&&', 1)[1].strip()
+
+        try:
+            if command.startswith('scp '):
+                status = self._send_file(channel, command)
+            else:
+                channel.sendall(self._shell(command).encode('utf-8'))
+                status = 0
+        except OSError:
+            status = 1
+        channel.send_exit_status(status)
+        channel.close()
+
+    def _shell(self, command: str) -> str:
+        files = self.data.mf2_files
+        if command.startswith('ls -ls') and '.fwrules' in command:
+            return f"  8 -rw-r--r-- 1 root root {len(files[MF2_RULE_FILE])} Jan  1 00:00 {MF2_RULE_FILE}\n"
+        if command.startswith('ls') and '.conf' in command:
+            return ''.join(f"{name}\n" for name in sorted(files) if name.endswith('.conf'))
+        if command.startswith('md5sum'):
+            names = [MF2_RULE_FILE] + [name for name in shlex.split(command)[1:] if name in files]
+            return ''.join(f"{hashlib.md5(files[name]).hexdigest()}  {name}\n" for name in names)
+        if command == 'cat /etc/SECUIMF2.info':
+            return MF2_INFO
+        if command == 'hostname':
+            return 'mock-mf2\n'
+        if command == 'uptime':
+            return ' 10:00:00 up 10 days,  1:00,  1 user,  load average: 0.00, 0.00, 0.00\n'
+        if command == 'rpm -q mf2':
+            return 'mf2-4.0.0-1.x86_64\n'
+        return ''
+
+    def _send_file(self, channel, command: str) -> int:
+        """
+        scp -f <path> 요청에 SCP 송신 프로토콜로 파일을 보냅니다.
+        """
+        name = os.path.basename(shlex.split(command)[-1])
+        content = self.data.mf2_files.get(name)
+        if channel.recv(1) != b'\x00':
+            return 1
+        if content is None:
+            channel.sendall(f"\x01scp: {name}: No such file or directory\n".encode('utf-8'))
+            return 1
+        channel.sendall(f"C0644 {len(content)} {name}\n".encode('utf-8'))
+        if channel.recv(1) != b'\x00':
+            return 1
+        channel.sendall(content)
+        channel.sendall(b'\x00')
+        channel.recv(1)
+        return 0
+
+
+def start_mf2_server(data: DeviceData, port: int = 0, latency: float = 0.0, error_rate: float = 0.0, password: str = None) -> MockMF2Server:
+    return MockMF2Server(data, port, latency, error_rate, password)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='benchmarks.mock_devices', description='FPAT mock firewall servers')
+    parser.add_argument('--rules', type=int, default=1000, help='Number of rules served by each device')
+    parser.add_argument('--latency', type=float, default=0.0, help='Delay per request in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Ratio of requests answered with an error')
+    parser.add_argument('--paloalto-port', type=int, default=8443, help='Palo Alto XML API port (0: disabled)')
+    parser.add_argument('--ngf-port', type=int, default=8444, help='NGF REST API port (0: disabled)')
+    parser.add_argument('--mf2-port', type=int, default=2222, help='MF2 SSH port (0: disabled)')
+    parser.add_argument('--password', type=str, default=None, help='SSH password (default: accept any)')
+    args = parser.parse_args()
+
+    data = DeviceData(args.rules)
+    cert = make_self_signed_cert(tempfile.mkdtemp(prefix='fpat_mock_'))
+    servers = []
+    if args.paloalto_port:
+        servers.append(start_paloalto_server(data, args.paloalto_port, args.latency, args.error_rate, cert))
+    if args.ngf_port:
+        servers.append(start_ngf_server(data, args.ngf_port, args.latency, args.error_rate, cert))
+    if args.mf2_port:
+        servers.append(start_mf2_server(data, args.mf2_port, args.latency, args.error_rate, args.password))
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,345 @@
+"""
+FPAT 오프라인 벤치마크
+
+합성 데이터(benchmarks/generators.py)로 익스포터 파서, 분석 함수, 중복 검사 함수, 엑셀 저장 시간을 측정하고
+결과를 history 파일(JSON Lines)에 누적합니다. 직전 기록보다 threshold 이상 느려진 항목은 회귀로 표시합니다.
+
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --sizes 1000,10000 --only parse,analyze
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import generators
+from modules import analysis_module, checking_overlapped, shadow_analysis, metrics
+from modules import paloalto_api, secui_mf2_v2, secui_ngf_v2
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_HISTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history.jsonl')
+BENCHMARKS = []
+
+
+def benchmark(name: str, group: str):
+    """
+    벤치마크 함수를 등록합니다. 함수는 Dataset을 받아 측정할 함수(인자 없음)를 반환합니다.
+    """
+    def register(func):
+        BENCHMARKS.append((name, group, func))
+        return func
+    return register
+
+
+class Dataset:
+    """
+    규모별 합성 데이터와 파일 경로입니다. DataFrame은 처음 사용할 때 만들어 재사용합니다.
+    """
+
+    def __init__(self, rule_count: int, directory: str, seed: int = 0):
+        self.rule_count = rule_count
+        self.directory = directory
+        self.objects = generators.generate_objects(rule_count, seed)
+        self.rules = generators.generate_rules(rule_count, seed, self.objects)
+        self.paths = generators.write_dataset(directory, rule_count, seed)
+        self._cache = {}
+
+    def cached(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def output(self, name: str) -> str:
+        return os.path.join(self.directory, f'{name}.xlsx')
+
+    def rule_df(self) -> pd.DataFrame:
+        def build():
+            df = generators.rules_to_dataframe(self.rules, vsys_count=2)
+            df['Category'] = 'any'
+            return df
+        return self.cached('rule_df', build)
+
+    def extracted_df(self) -> pd.DataFrame:
+        return self.cached('extracted_df', lambda: generators.extracted_dataframe(self.rules, self.objects))
+
+    def offline_paloalto(self):
+        """
+        장비 접속 없이 파일의 설정 XML을 반환하는 PaloAltoAPI 인스턴스를 만듭니다.
+        """
+        api = object.__new__(paloalto_api.PaloAltoAPI)
+        api.hostname = 'benchmark'
+        api.api_key = ''
+        with open(self.paths['paloalto'], encoding='utf-8') as file:
+            config = file.read()
+        api.get_config = lambda config_type='running': config
+        return api
+
+
+# ────────────── PARSERS ──────────────
+
+@benchmark('paloalto.export_security_rules', 'parse')
+def bench_paloalto_rules(dataset):
+    api = dataset.offline_paloalto()
+    return lambda: api.export_security_rules('running')
+
+
+@benchmark('paloalto.export_network_objects', 'parse')
+def bench_paloalto_objects(dataset):
+    api = dataset.offline_paloalto()
+    return lambda: api.export_network_objects('running')
+
+
+@benchmark('paloalto.parse_hit_count_xml', 'parse')
+def bench_paloalto_hit_count(dataset):
+    with open(dataset.paths['paloalto_hitcount'], 'rb') as file:
+        content = file.read()
+    return lambda: paloalto_api.PaloAltoAPI.parse_hit_count_xml(content)
+
+
+@benchmark('mf2.rule_parsing', 'parse')
+def bench_mf2_rules(dataset):
+    return lambda: secui_mf2_v2.rule_parsing(dataset.paths['mf2_rules'])
+
+
+@benchmark('mf2.export_objects', 'parse')
+def bench_mf2_objects(dataset):
+    paths = dataset.paths
+
+    def run():
+        secui_mf2_v2.export_address_objects(paths['groupobject.conf'], paths['hostobject.conf'], paths['networkobject.conf'])
+        return secui_mf2_v2.export_service_objects(paths['serviceobject.conf'])
+    return run
+
+
+@benchmark('ngf.parse_rules', 'parse')
+def bench_ngf_rules(dataset):
+    client = object.__new__(secui_ngf_v2.NGFClient)
+    with open(dataset.paths['ngf'], encoding='utf-8') as file:
+        payload = json.load(file)
+
+    def run():
+        return pd.DataFrame([info for info in map(client._parse_rule, payload['result']) if info is not None])
+    return run
+
+
+@benchmark('ngf.iter_json_array_items', 'parse')
+def bench_ngf_stream(dataset):
+    client = object.__new__(secui_ngf_v2.NGFClient)
+    with open(dataset.paths['ngf'], 'rb') as file:
+        content = file.read()
+
+    def run():
+        chunks = (content[i:i + 65536] for i in range(0, len(content), 65536))
+        return sum(1 for rule in secui_ngf_v2.iter_json_array_items(chunks, 'result') if client._parse_rule(rule) is not None)
+    return run
+
+
+# ────────────── ANALYSIS ──────────────
+
+@benchmark('analysis.find_redundant_rows', 'analyze')
+def bench_find_redundant(dataset):
+    df = dataset.rule_df()
+    columns = ['Enable', 'Action', 'Source', 'User', 'Destination', 'Service', 'Application', 'Vsys']
+    return lambda: analysis_module.find_redundant_rows(df, columns, progress=False)
+
+
+@benchmark('analysis.analyze_redundant_policies', 'analyze')
+def bench_analyze_redundant(dataset):
+    df = dataset.rule_df()
+    return lambda: analysis_module.analyze_redundant_policies(df, 'paloalto', dataset.output('redundant'))
+
+
+@benchmark('analysis.find_shadowed_rules', 'analyze')
+def bench_shadow(dataset):
+    df = dataset.extracted_df()
+    return lambda: shadow_analysis.find_shadowed_rules(df, token_fields=['User', 'Application'])
+
+
+@benchmark('analysis.compare_and_save_firewall_policies', 'analyze')
+def bench_compare(dataset):
+    before = dataset.rule_df()
+
+    def build_after():
+        after = before.sample(frac=0.98, random_state=0).sort_index()
+        changed = after.sample(frac=0.05, random_state=1).index
+        after.loc[changed, 'Destination'] = after.loc[changed, 'Destination'] + ',h_0'
+        moved = after.iloc[:50]
+        return pd.concat([after.iloc[50:], moved])
+    after = dataset.cached('compare_after', build_after)
+    return lambda: analysis_module.compare_and_save_firewall_policies(before, after, dataset.output('validation'), order_aware=True)
+
+
+# ────────────── OVERLAP ──────────────
+
+def _overlap_target(df) -> int:
+    # any 애플리케이션은 모든 규칙과 겹치므로 애플리케이션이 지정된 첫 규칙을 기준으로 비교합니다.
+    specific = np.flatnonzero(df['Application'].to_numpy() != 'any')
+    return int(specific[0]) if len(specific) else 0
+
+
+def _overlap_scan(df, target_position):
+    target = df.iloc[target_position]
+    return sum(checking_overlapped.check_overlaps(target, df.iloc[i]) for i in range(len(df)))
+
+
+@benchmark('overlap.check_overlaps', 'overlap')
+def bench_check_overlaps(dataset):
+    df = dataset.extracted_df()
+    return lambda: _overlap_scan(df, _overlap_target(df))
+
+
+@benchmark('overlap.find_overlapping_rules_bitset', 'overlap')
+def bench_find_overlapping_rules(dataset):
+    df = dataset.extracted_df()
+    app_bits = checking_overlapped.encode_applications(df)
+    return lambda: len(checking_overlapped.find_overlapping_rules(df, _overlap_target(df), np.arange(len(df)), app_bits))
+
+
+# ────────────── EXCEL ──────────────
+
+@benchmark('excel.paloalto_save_dfs_to_excel', 'write')
+def bench_paloalto_excel(dataset):
+    api = dataset.offline_paloalto()
+    df = dataset.rule_df()
+    return lambda: api.save_dfs_to_excel(df, 'rules', dataset.output('paloalto_rules'))
+
+
+@benchmark('excel.mf2_save_dfs_to_excel', 'write')
+def bench_mf2_excel(dataset):
+    df = dataset.rule_df()
+    return lambda: secui_mf2_v2.save_dfs_to_excel(df, 'rules', dataset.output('mf2_rules'))
+
+
+# ────────────── RUNNER ──────────────
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+def previous_result(history: list, name: str, rule_count: int):
+    for record in reversed(history):
+        if record['benchmark'] == name and record['rules'] == rule_count:
+            return record
+    return None
+
+
+def time_call(func, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(sizes: list, groups: list = None, names: list = None, repeat: int = 1, history_file: str = DEFAULT_HISTORY,
+        threshold: float = 0.2, seed: int = 0) -> list:
+    """
+    선택한 벤치마크를 규모별로 실행하고 결과를 history_file에 추가합니다.
+
+    :return: 측정 결과 리스트 (회귀 여부 'regression' 포함)
+    """
+    history = load_history(history_file)
+    commit = git_commit()
+    results = []
+
+    # 분석 함수 내부의 진행 로그는 측정 결과 출력에 섞이지 않도록 끕니다.
+    logging.disable(logging.INFO)
+    try:
+        for rule_count in sizes:
+            with tempfile.TemporaryDirectory(prefix=f'fpat_bench_{rule_count}_') as directory:
+                dataset = Dataset(rule_count, directory, seed)
+                for name, group, factory in BENCHMARKS:
+                    if groups and group not in groups:
+                        continue
+                    if names and name not in names:
+                        continue
+                    seconds = time_call(factory(dataset), repeat)
+                    record = {
+                        'date': time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
+                        'commit': commit,
+                        'python': platform.python_version(),
+                        'pandas': pd.__version__,
+                        'benchmark': name,
+                        'group': group,
+                        'rules': rule_count,
+                        'seconds': round(seconds, 4),
+                        'rules_per_sec': round(rule_count / seconds, 1) if seconds else None,
+                        'peak_rss_mb': metrics.peak_rss_mb(),
+                    }
+                    previous = previous_result(history, name, rule_count)
+                    record['regression'] = bool(previous and previous['seconds'] and seconds > previous['seconds'] * (1 + threshold))
+                    results.append(record)
+                    print(format_result(record, previous), flush=True)
+    finally:
+        logging.disable(logging.NOTSET)
+
+    if history_file:
+        with open(history_file, 'a', encoding='utf-8') as file:
+            for record in results:
+                file.write(json.dumps(record) + '\n')
+    return results
+
+
+def format_result(record: dict, previous: dict = None) -> str:
+    line = f"{record['benchmark']:<45} {record['rules']:>7} rules {record['seconds']:>10.3f}s {record['rules_per_sec'] or 0:>12.0f} rules/s"
+    if previous:
+        change = (record['seconds'] / previous['seconds'] - 1) * 100 if previous['seconds'] else 0
+        line += f"  ({change:+.0f}% vs {previous.get('commit') or previous['date']})"
+    if record['regression']:
+        line += '  REGRESSION'
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='benchmarks.run_benchmarks', description='FPAT offline benchmarks')
+    parser.add_argument('--sizes', type=str, default=','.join(map(str, DEFAULT_SIZES)), help='Rule counts, comma separated')
+    parser.add_argument('--only', type=str, default=None, help='Groups to run: parse,analyze,overlap,write')
+    parser.add_argument('--benchmark', type=str, default=None, help='Benchmark names to run, comma separated')
+    parser.add_argument('--repeat', type=int, default=1, help='Repetitions per benchmark (best time is recorded)')
+    parser.add_argument('--history', type=str, default=DEFAULT_HISTORY, help="History file ('' to disable)")
+    parser.add_argument('--threshold', type=float, default=0.2, help='Slowdown ratio reported as regression')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit with status 1 when a regression is found')
+    parser.add_argument('--list', action='store_true', help='List benchmarks and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, group, _ in BENCHMARKS:
+            print(f"{group:<8} {name}")
+        return
+
+    results = run(
+        sizes=[int(size) for size in args.sizes.split(',')],
+        groups=args.only.split(',') if args.only else None,
+        names=args.benchmark.split(',') if args.benchmark else None,
+        repeat=args.repeat,
+        history_file=args.history,
+        threshold=args.threshold,
+    )
+    if args.fail_on_regression and any(record['regression'] for record in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
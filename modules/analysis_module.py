@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 pd.options.mode.chained_assignment = None  # default='warn'people
 
 from collections import defaultdict
@@ -6,57 +7,137 @@ from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, PatternFill, Alignment
 import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-from tqdm import tqdm
 import re
 import os
+import bisect
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from modules import shadow_analysis, metrics
+from modules.rule_store import RuleStore
+from modules.redundancy_index import RedundancyIndex
 
-def analyze_redundant_policies(df, vendor, file_name):
+def normalize_policy(policy_series):
+    normalized_policy = policy_series.apply(lambda x: ','.join(sorted(x.split(','))) if isinstance(x, str) else x)
+    return tuple(normalized_policy)
+
+def find_redundant_rows(df_filtered, columns_to_check, progress=True):
+    df_check = df_filtered[columns_to_check]
+    policy_map = defaultdict(list)
+
+    results_list = []
+    current_no = 1
+
+    ticker = metrics.ProgressTicker('Checking Policies', len(df_filtered), enabled=progress)
+    for i in range(len(df_filtered)):
+        ticker.update()
+        try:
+            current_policy = normalize_policy(df_check.iloc[i])
+            if current_policy in policy_map:
+                row = df_filtered.iloc[i].to_dict()
+                row.update({'No': policy_map[current_policy], 'Type': 'Lower'})
+                results_list.append(row)
+            else:
+                policy_map[current_policy] = current_no
+                row = df_filtered.iloc[i].to_dict()
+                row.update({'No': current_no, 'Type': 'Upper'})
+                results_list.append(row)
+                current_no += 1
+        except Exception as e:
+            logging.error(f'Error in checking policy at index {i}: {e}')
+            continue
+
+    logging.info('Converting results to DataFrame')
+    return pd.DataFrame(results_list)
+
+def _find_redundant_shard(shard, columns_to_check):
+    return find_redundant_rows(shard, columns_to_check, progress=False)
+
+def find_redundant_rows_partitioned(df_filtered, columns_to_check, workers):
+    """
+    규칙을 vsys별(Vsys 컬럼이 없으면 정규화 키 해시 범위별)로 나누어 프로세스 풀에서 중복을 탐지합니다.
+    같은 정규화 키는 항상 같은 조각에 들어가므로 결과는 단일 실행과 같으며,
+    그룹 번호는 각 그룹 Upper 규칙의 원래 위치 순으로 다시 매겨 실행마다 동일하게 유지됩니다.
+    """
+    df_filtered = df_filtered.copy()
+    df_filtered['_pos'] = np.arange(len(df_filtered))
+
+    if 'Vsys' in columns_to_check:
+        shard_keys = df_filtered['Vsys'].astype(str).to_numpy()
+    else:
+        rule_hashes = RuleStore.from_dataframe(df_filtered, fields=columns_to_check).rule_hashes()
+        shard_keys = (rule_hashes % np.uint64(workers)).astype(np.int64)
+    shards = [shard for _, shard in df_filtered.groupby(shard_keys, sort=True)]
+    logging.info(f'Checking {len(shards)} partitions with {workers} workers')
+
+    with ProcessPoolExecutor(max_workers=min(workers, max(1, len(shards)))) as executor:
+        partials = list(executor.map(_find_redundant_shard, shards, [columns_to_check] * len(shards)))
+
+    for shard_no, partial in enumerate(partials):
+        partial['_shard'] = shard_no
+    results = pd.concat(partials, ignore_index=True)
+    if results.empty:
+        return results.drop(columns=['_pos', '_shard'], errors='ignore')
+
+    # 조각별 그룹 번호를 Upper 규칙의 원래 위치 기준 전역 번호로 변환합니다.
+    upper_pos = results[results['Type'] == 'Upper'].set_index(['_shard', 'No'])['_pos']
+    group_pos = upper_pos.reindex(pd.MultiIndex.from_arrays([results['_shard'], results['No']])).to_numpy()
+    results['No'] = pd.factorize(group_pos, sort=True)[0] + 1
+
+    results = results.sort_values('_pos', kind='stable').reset_index(drop=True)
+    return results.drop(columns=['_pos', '_shard'])
+
+def find_redundant_rows_incremental(df_filtered, columns_to_check, index_file):
+    """
+    이전 실행에서 저장한 지문 색인을 불러와 추가/변경된 규칙만 다시 정규화하고,
+    지문이 처음 나온 규칙을 Upper, 이후 같은 지문의 규칙을 Lower로 표시합니다.
+    """
+    index = RedundancyIndex.load(index_file, columns_to_check)
+    fingerprints = index.update(df_filtered)
+    index.save(index_file)
+
+    results = df_filtered.reset_index(drop=True)
+    results['No'] = pd.factorize(fingerprints)[0] + 1
+    results['Type'] = np.where(pd.Series(fingerprints).duplicated().to_numpy(), 'Lower', 'Upper')
+    return results
+
+def normalize_service_names(df):
+    """
+    Palo Alto 서비스명의 '_'를 '-'로 통일합니다. 객체를 확장한 경우 원래 이름은 두고 Extracted Service만 바꿉니다.
+    """
+    column = 'Extracted Service' if 'Extracted Service' in df.columns else 'Service'
+    df[column] = df[column].str.replace('_', '-')
+    return df
+
+def analyze_redundant_policies(df, vendor, file_name, resolver=None, workers=None, index_file=None):
     logging.info("Redundant Policies Analysis Started")
     try:
         logging.info('Parsing firewall policies')
-        df_filtered = df[(df['Enable'] == 'Y') & (df['Action'] == 'Allow')]
-
-        columns_to_check = ['Enable', 'Action', 'Source', 'User', 'Destination', 'Service', 'Application']
-        if 'Vsys' in df.columns:
-            columns_to_check.append('Vsys')
-        
-        if vendor == 'paloalto':
-            df_filtered['Service'] = df_filtered['Service'].str.replace('_','-')
-            columns_to_check.append('Category')
-        
-        df_check = df_filtered[columns_to_check]
-
-        def normalize_policy(policy_series):
-            normalized_policy = policy_series.apply(lambda x: ','.join(sorted(x.split(','))) if isinstance(x, str) else x)
-            return tuple(normalized_policy)
-        
-        policy_map = defaultdict(list)
+        with metrics.stage('parse', rows=len(df)):
+            df_filtered = df[(df['Enable'] == 'Y') & (df['Action'] == 'Allow')]
 
-        results_list = []
-        current_no = 1
+            columns_to_check = ['Enable', 'Action', 'Source', 'User', 'Destination', 'Service', 'Application']
+            if 'Vsys' in df.columns:
+                columns_to_check.append('Vsys')
 
-        logging.info('Checking for redundant policies')
+        with metrics.stage('normalize', rows=len(df_filtered)):
+            # 객체 테이블은 원래 이름으로 조회해야 하므로 서비스명 정규화는 객체 확장 뒤에 합니다.
+            if resolver is not None:
+                logging.info('Resolving objects')
+                df_filtered = resolver.attach(df_filtered)
+                columns_to_check = [f'Extracted {col}' if col in ['Source', 'Destination', 'Service'] else col for col in columns_to_check]
 
-        for i in tqdm(range(len(df_filtered)), desc='Checking Policies'):
-            try:
-                current_policy = normalize_policy(df_check.iloc[i])
-                if current_policy in policy_map:
-                    row = df_filtered.iloc[i].to_dict()
-                    row.update({'No': policy_map[current_policy], 'Type': 'Lower'})
-                    results_list.append(row)
-                else:
-                    policy_map[current_policy] = current_no
-                    row = df_filtered.iloc[i].to_dict()
-                    row.update({'No': current_no, 'Type': 'Upper'})
-                    results_list.append(row)
-                    current_no += 1
-            except Exception as e:
-                logging.error(f'Error in checking policy at index {i}: {e}')
-                continue
+            if vendor == 'paloalto':
+                df_filtered = normalize_service_names(df_filtered)
+                columns_to_check.append('Category')
         
-        logging.info('Converting results to DataFrame')
-        results = pd.DataFrame(results_list)
+        logging.info('Checking for redundant policies')
+        with metrics.stage('analyze', rows=len(df_filtered)):
+            if index_file:
+                results = find_redundant_rows_incremental(df_filtered, columns_to_check, index_file)
+            elif workers and workers > 1:
+                results = find_redundant_rows_partitioned(df_filtered, columns_to_check, workers)
+            else:
+                results = find_redundant_rows(df_filtered, columns_to_check)
 
         logging.info('Ensuring each No group contains both Upper and Lower.')
         def ensure_upper_and_lower(df):
@@ -83,85 +164,292 @@ def analyze_redundant_policies(df, vendor, file_name):
         header_font = Font(bold=True, color='FFFFFF')
 
         logging.info("saving results to excel")
-        with pd.ExcelWriter(file_name, engine='openpyxl') as writer:
-            if 'vsys' in df.columns:
-                for vsys, vsys_df in duplicated_results.groupby('vsys'):
-                    vsys_df.to_excel(writer, index=False, sheet_name=f'Analysis_{vsys}')
-                    worksheet = writer.sheets[f'Analysis_{vsys}']
+        with metrics.stage('write', rows=len(duplicated_results)):
+            with pd.ExcelWriter(file_name, engine='openpyxl') as writer:
+                if 'vsys' in df.columns:
+                    for vsys, vsys_df in duplicated_results.groupby('vsys'):
+                        vsys_df.to_excel(writer, index=False, sheet_name=f'Analysis_{vsys}')
+                        worksheet = writer.sheets[f'Analysis_{vsys}']
+
+                        for cell in worksheet[1]:
+                            cell.fill = header_fill
+                            cell.font = header_font
+                    
+                        for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row, min_col=1, max_col=worksheet.max_column):
+                            for cell in row:
+                                if row[1].value == 'Upper':
+                                    cell.fill = upper_fill
+                                elif row[1].value == 'Lower':
+                                    cell.fill = lower_fill
+                else:
+                    duplicated_results.to_excel(writer, index=False, sheet_name='Analysis')
+                    worksheet = writer.sheets['Analysis']
 
                     for cell in worksheet[1]:
                         cell.fill = header_fill
                         cell.font = header_font
-                    
+                
                     for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row, min_col=1, max_col=worksheet.max_column):
                         for cell in row:
                             if row[1].value == 'Upper':
                                 cell.fill = upper_fill
                             elif row[1].value == 'Lower':
                                 cell.fill = lower_fill
-            else:
-                duplicated_results.to_excel(writer, index=False, sheet_name='Analysis')
+        
+        logging.info(f"Results have been saved to {file_name}")
+    except Exception as e:
+        logging.error(f"Error in analyzing redundant policies: {e}")
+    
+    logging.info("Redundant Policies Analysis Completed")
+
+def analyze_shadowed_policies(df, vendor, file_name, resolver=None):
+    logging.info("Shadowed Policies Analysis Started")
+    try:
+        logging.info('Parsing firewall policies')
+        df_check = df.reset_index(drop=True)
+
+        token_fields = ['User', 'Application']
+        if resolver is not None:
+            logging.info('Resolving objects')
+            df_check = resolver.attach(df_check)
+
+        if vendor == 'paloalto':
+            df_check = normalize_service_names(df_check)
+            token_fields.append('Category')
+
+        logging.info('Checking for shadowed policies')
+        with metrics.stage('analyze', rows=len(df_check)):
+            pairs = shadow_analysis.find_shadowed_rules(df_check, token_fields=[col for col in token_fields if col in df_check.columns], resolver=resolver)
+            results = shadow_analysis.build_shadow_report(df.reset_index(drop=True), pairs)
+        logging.info(f"Shadowed: {(pairs['Relation'] == 'Shadowed').sum()}, Redundant: {(pairs['Relation'] == 'Redundant').sum()}")
+
+        # style
+        upper_fill = PatternFill(start_color="daeef3", end_color="daeef3", fill_type="solid")
+        lower_fill = PatternFill(start_color="f2f2f2", end_color="f2f2f2", fill_type="solid")
+        header_fill = PatternFill(start_color="00b0f0", end_color="00b0f0", fill_type="solid")
+        header_font = Font(bold=True, color='FFFFFF')
+
+        logging.info("saving results to excel")
+        with metrics.stage('write', rows=len(results)):
+            with pd.ExcelWriter(file_name, engine='openpyxl') as writer:
+                results.to_excel(writer, index=False, sheet_name='Analysis')
                 worksheet = writer.sheets['Analysis']
 
                 for cell in worksheet[1]:
                     cell.fill = header_fill
                     cell.font = header_font
-                
+
                 for row in worksheet.iter_rows(min_row=2, max_row=worksheet.max_row, min_col=1, max_col=worksheet.max_column):
                     for cell in row:
                         if row[1].value == 'Upper':
                             cell.fill = upper_fill
                         elif row[1].value == 'Lower':
                             cell.fill = lower_fill
-        
+
         logging.info(f"Results have been saved to {file_name}")
     except Exception as e:
-        logging.error(f"Error in analyzing redundant policies: {e}")
-    
-    logging.info("Redundant Policies Analysis Completed")
+        logging.error(f"Error in analyzing shadowed policies: {e}")
+
+    logging.info("Shadowed Policies Analysis Completed")
+
+def get_policy_key(df_before, df_after):
+    key = ['Rule Name']
+    if 'Vsys' in df_before.columns and 'Vsys' in df_after.columns:
+        key = ['Vsys', 'Rule Name']
+    return key
+
+def diff_firewall_policies(df_before, df_after, key=None, ignore_columns=('Seq',)):
+    """
+    두 정책 테이블을 비교하여 추가/삭제 정책과 변경 내역을 반환합니다.
+    변경 여부는 컬럼 단위 마스크로 한 번에 계산하며, 변경 내역은 (규칙, 필드, 변경 전, 변경 후)
+    형태의 long-format 테이블로 모든 변경을 담습니다.
+
+    :param df_before: 변경 전(running) 정책 DataFrame
+    :param df_after: 변경 후(candidate) 정책 DataFrame
+    :param key: 규칙 식별 컬럼 리스트 (기본값: 'Rule Name', 양쪽에 Vsys가 있으면 Vsys 포함)
+    :param ignore_columns: 비교에서 제외할 컬럼
+    :return: (added, removed, changes)
+    """
+    if key is None:
+        key = get_policy_key(df_before, df_after)
+    compare_cols = [col for col in df_before.columns if col in df_after.columns and col not in key and col not in ignore_columns]
+
+    df_merged = df_before.merge(df_after, on=key, how='outer', suffixes=('_before', '_after'), indicator=True)
+    merge_state = df_merged['_merge'].to_numpy()
+
+    added = df_merged.loc[merge_state == 'right_only', key + [f'{col}_after' for col in df_after.columns if col not in key]]
+    removed = df_merged.loc[merge_state == 'left_only', key + [f'{col}_before' for col in df_before.columns if col not in key]]
+    added = added.rename(columns=lambda x: x[:-len('_after')] if x.endswith('_after') else x).reset_index(drop=True)
+    removed = removed.rename(columns=lambda x: x[:-len('_before')] if x.endswith('_before') else x).reset_index(drop=True)
+
+    both = df_merged[merge_state == 'both']
+    key_values = both[key].reset_index(drop=True)
+
+    row_parts, field_parts, before_parts, after_parts = [], [], [], []
+    for col in compare_cols:
+        before = both[f'{col}_before'].to_numpy(dtype=object)
+        after = both[f'{col}_after'].to_numpy(dtype=object)
+        before_na = pd.isna(before)
+        after_na = pd.isna(after)
+        mask = (before_na != after_na) | (~before_na & ~after_na & (before != after))
+        rows = np.flatnonzero(mask)
+        if len(rows) == 0:
+            continue
+        row_parts.append(rows)
+        field_parts.append(np.full(len(rows), col, dtype=object))
+        before_parts.append(before[rows])
+        after_parts.append(after[rows])
+
+    if row_parts:
+        rows = np.concatenate(row_parts)
+        # 규칙 순서(병합 순서)를 유지하고, 같은 규칙 안에서는 컬럼 순서를 유지합니다.
+        order = np.argsort(rows, kind='stable')
+        rows = rows[order]
+        changes = key_values.iloc[rows].reset_index(drop=True)
+        changes['Field'] = np.concatenate(field_parts)[order]
+        changes['Before'] = np.concatenate(before_parts)[order]
+        changes['After'] = np.concatenate(after_parts)[order]
+    else:
+        changes = pd.DataFrame(columns=key + ['Field', 'Before', 'After'])
+
+    return added, removed, changes
+
+MEMBER_FIELDS = ['Source', 'User', 'Destination', 'Service', 'Application']
+
+def longest_increasing_subsequence(values):
+    """
+    값 배열에서 최장 증가 부분수열을 O(n log n)으로 구하여 해당 위치(index) 리스트를 반환합니다.
+    """
+    tails = []
+    tail_indices = []
+    predecessors = [-1] * len(values)
+
+    for i, value in enumerate(values):
+        pos = bisect.bisect_left(tails, value)
+        if pos > 0:
+            predecessors[i] = tail_indices[pos - 1]
+        if pos == len(tails):
+            tails.append(value)
+            tail_indices.append(i)
+        else:
+            tails[pos] = value
+            tail_indices[pos] = i
 
-def compare_and_save_firewall_policies(df_before, df_after, output_filename='firewall_policy_changes.xlsx'):
+    result = []
+    i = tail_indices[-1] if tail_indices else -1
+    while i != -1:
+        result.append(i)
+        i = predecessors[i]
+    return result[::-1]
+
+def detect_moved_policies(df_before, df_after, key=None):
+    """
+    양쪽에 모두 존재하는 규칙 중 상대 순서가 바뀐(이동된) 규칙을 찾습니다.
+    변경 후 순서에서 변경 전 위치의 최장 증가 부분수열에 속한 규칙은 제자리로 보고,
+    나머지를 이동된 규칙으로 판단하므로 최소 개수의 이동만 보고됩니다. Vsys가 있으면 vsys별로 판단합니다.
+
+    :return: key, Seq_before, Seq_after 컬럼의 DataFrame
+    """
+    if key is None:
+        key = get_policy_key(df_before, df_after)
+    group_cols = key[:-1]
+
+    def positions(df, suffix):
+        table = df[key].copy()
+        table[f'Seq_{suffix}'] = df['Seq'].to_numpy() if 'Seq' in df.columns else np.arange(1, len(df) + 1)
+        table[f'_pos_{suffix}'] = np.arange(len(df))
+        return table.drop_duplicates(subset=key, keep='first')
+
+    common = positions(df_after, 'after').merge(positions(df_before, 'before'), on=key, how='inner')
+    common = common.sort_values('_pos_after', kind='stable').reset_index(drop=True)
+
+    before_positions = common['_pos_before'].to_numpy()
+    moved_mask = np.zeros(len(common), dtype=bool)
+    if group_cols:
+        groups = common.groupby(group_cols, sort=False).indices.values()
+    else:
+        groups = [np.arange(len(common))]
+
+    for indices in groups:
+        group_moved = np.ones(len(indices), dtype=bool)
+        group_moved[longest_increasing_subsequence(before_positions[indices].tolist())] = False
+        moved_mask[indices] = group_moved
+
+    return common.loc[moved_mask, key + ['Seq_before', 'Seq_after']].reset_index(drop=True)
+
+def diff_policy_members(changes, fields=MEMBER_FIELDS):
+    """
+    diff_firewall_policies의 변경 내역 중 콤마로 구분된 멤버 필드를 멤버 단위로 비교합니다.
+    멤버 순서만 바뀐 경우는 변경으로 보지 않습니다.
+
+    :return: key, Field, Added Members, Removed Members 컬럼의 DataFrame
+    """
+    key = [col for col in changes.columns if col not in ('Field', 'Before', 'After')]
+    member_changes = changes[changes['Field'].isin(fields)].reset_index(drop=True)
+
+    def split_members(values):
+        return [set(m.strip() for m in str(v).split(',') if m.strip()) if not pd.isna(v) else set() for v in values]
+
+    before_sets = split_members(member_changes['Before'])
+    after_sets = split_members(member_changes['After'])
+    member_changes['Added Members'] = [','.join(sorted(a - b)) for a, b in zip(after_sets, before_sets)]
+    member_changes['Removed Members'] = [','.join(sorted(b - a)) for a, b in zip(after_sets, before_sets)]
+
+    member_changes = member_changes[(member_changes['Added Members'] != '') | (member_changes['Removed Members'] != '')]
+    return member_changes[key + ['Field', 'Added Members', 'Removed Members']].reset_index(drop=True)
+
+def summarize_policy_diff(added, removed, moved, member_changes, changes, key):
+    """
+    추가/삭제/이동/변경 결과를 규칙당 한 줄의 요약 테이블로 정리합니다.
+    """
+    details = []
+
+    for _, row in added[key].iterrows():
+        details.append((*row, 'Added', ''))
+    for _, row in removed[key].iterrows():
+        details.append((*row, 'Removed', ''))
+    for row in moved.itertuples(index=False):
+        details.append((*row[:len(key)], 'Moved', f'{row[-2]} -> {row[-1]}'))
+
+    for row in member_changes.itertuples(index=False):
+        parts = [f'+{m}' for m in row[-2].split(',') if m] + [f'-{m}' for m in row[-1].split(',') if m]
+        details.append((*row[:len(key)], 'Modified', f'{row[len(key)]}: {" ".join(parts)}'))
+
+    other_changes = changes[~changes['Field'].isin(MEMBER_FIELDS)]
+    for row in other_changes.itertuples(index=False):
+        details.append((*row[:len(key)], 'Modified', f'{row[-3]}: {row[-2]} -> {row[-1]}'))
+
+    compact = pd.DataFrame(details, columns=key + ['Change', 'Detail'])
+    if compact.empty:
+        return compact
+    compact = compact.groupby(key + ['Change'], sort=False)['Detail'].agg(lambda x: '; '.join(d for d in x if d)).reset_index()
+    return compact
+
+def compare_and_save_firewall_policies(df_before, df_after, output_filename='firewall_policy_changes.xlsx', order_aware=False):
     def compare_firewall_policies(df_before, df_after):
-        # Merge the two dataframes on 'Rule Name' column to compare row by row
-        df_merged = df_before.merge(df_after, on='Rule Name', how='outer', suffixes=('_before', '_after'), indicator=True)
-
-        # Find added, removed, and changed rows
-        added = df_merged[df_merged['_merge'] == 'right_only']
-        removed = df_merged[df_merged['_merge'] == 'left_only']
-
-        # Ensure 'Rule Name' is always included in added and removed rows
-        added_col = ['Rule Name'] + [col for col in added.columns if col.endswith('_after')]
-        removed_col = ['Rule Name'] + [col for col in removed.columns if col.endswith('_before')]
-
-        added = added[added_col].rename(columns=lambda x: x.replace('_after', ''))
-        removed = removed[removed_col].rename(columns=lambda x: x.replace('_before', ''))
-
-        # Identify changed rows, ignoring changes in 'Seq'
-        common_cols = [col for col in df_before.columns if col not in ['Rule Name', 'Seq']]
-        change_conditions = [df_merged[f'{col}_before'] != df_merged[f'{col}_after'] for col in common_cols]
-        changed = df_merged[(df_merged['_merge'] == 'both') & pd.concat(change_conditions, axis=1).any(axis=1)]
-
-        # create a dataframe to store only the changes
-        changes_list = []
-        for idx, row in changed.iterrows():
-            changes = {'Rule Name': row['Rule Name']}
-            for col in common_cols:
-                if row[f'{col}_before'] != row[f'{col}_after']:
-                    changes[f'{col}_before'] = row[f'{col}_before']
-                    changes[f'{col}_after'] = row[f'{col}_after']
-            changes_list.append(changes)
-            changed_df = pd.DataFrame(changes_list)
-
-            return added, removed, changed_df
+        key = get_policy_key(df_before, df_after)
+        added, removed, changes = diff_firewall_policies(df_before, df_after, key=key)
+
+        # 변경된 규칙별로 변경 전/후 값을 한 행에 펼칩니다.
+        changed_cols = [col for col in df_before.columns if col in set(changes['Field'])]
+        changed_df = changes.pivot_table(index=key, columns='Field', values=['Before', 'After'], aggfunc='first', sort=False)
+        ordered = []
+        for col in changed_cols:
+            ordered += [('Before', col), ('After', col)]
+        changed_df = changed_df.reindex(columns=ordered)
+        changed_df.columns = [f'{col}_{state.lower()}' for state, col in changed_df.columns]
+        changed_df = changed_df.reset_index()
+
+        return key, added, removed, changed_df, changes
     
-    def display_and_save_results(added, removed, changed, output_filename):
+    def display_and_save_results(added, removed, changed, changes, output_filename, order_sheets=None):
         added_count = len(added)
         removed_count = len(removed)
         changed_count = len(changed)
 
         logging.info(f"Added: {added_count} rows")
         logging.info(f"Removed: {removed_count} rows")
-        logging.info(f"Changed: {changed_count} rows")
+        logging.info(f"Changed: {changed_count} rows ({len(changes)} fields)")
 
         logging.info(f"Saving results to {output_filename}")
         with pd.ExcelWriter(output_filename, engine='openpyxl') as writer:
@@ -169,14 +457,36 @@ def compare_and_save_firewall_policies(df_before, df_after, output_filename='fir
                 'Category': ['Added', 'Removed', 'Changed'],
                 'Count': [added_count, removed_count, changed_count]
             }
+            if order_sheets:
+                summary_data['Category'].append('Moved')
+                summary_data['Count'].append(len(order_sheets['Moved']))
             summary_df = pd.DataFrame(summary_data)
             summary_df.to_excel(writer, index=False, sheet_name='Summary')
 
             added.to_excel(writer, index=False, sheet_name='Added')
             removed.to_excel(writer, index=False, sheet_name='Removed')
             changed.to_excel(writer, index=False, sheet_name='Changed')
+            changes.to_excel(writer, index=False, sheet_name='Changed Fields')
+
+            if order_sheets:
+                for sheet_name, sheet_df in order_sheets.items():
+                    sheet_df.to_excel(writer, index=False, sheet_name=sheet_name)
         
         logging.info(f"Results have been saved to {output_filename}")
     
-    added, removed, changed = compare_firewall_policies(df_before, df_after)
-    display_and_save_results(added, removed, changed, output_filename)
\ No newline at end of file
+    with metrics.stage('analyze', rows=len(df_before) + len(df_after)):
+        key, added, removed, changed, changes = compare_firewall_policies(df_before, df_after)
+
+        order_sheets = None
+        if order_aware:
+            logging.info("Detecting moved rules and member-level changes")
+            moved = detect_moved_policies(df_before, df_after, key=key)
+            member_changes = diff_policy_members(changes)
+            order_sheets = {
+                'Moved': moved,
+                'Member Changes': member_changes,
+                'Compact': summarize_policy_diff(added, removed, moved, member_changes, changes, key),
+            }
+
+    with metrics.stage('write', rows=len(added) + len(removed) + len(changes)):
+        display_and_save_results(added, removed, changed, changes, output_filename, order_sheets)
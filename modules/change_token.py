@@ -0,0 +1,118 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import xml.etree.ElementTree as ET
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+MF2_REMOTE_DIRECTORY = '/secui/etc/'
+MF2_CHECKSUM_COMMAND = (
+    'md5sum $(ls -t *.fwrules | head -1) '
+    'groupobject.conf hostobject.conf networkobject.conf serviceobject.conf'
+)
+
+
+def make_token(*parts) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode('utf-8')
+        digest.update(part)
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+class TokenCache:
+    """
+    장비별 마지막 변경 토큰을 로컬 JSON 파일에 보관합니다.
+    """
+
+    def __init__(self, path: str = '.fpat_change_tokens.json'):
+        self.path = path
+        self.tokens = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    self.tokens = json.load(file)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable token cache {path}: {e}")
+
+    def has_changed(self, key: str, token: str) -> bool:
+        entry = self.tokens.get(key)
+        return entry is None or entry.get('token') != token
+
+    def update(self, key: str, token: str):
+        self.tokens[key] = {
+            'token': token,
+            'updated': time.strftime("%Y-%m-%d %H:%M:%S", time.localtime()),
+        }
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump(self.tokens, file, ensure_ascii=False, indent=2)
+
+
+# ────────────── VENDOR PROBES ──────────────
+
+def paloalto_change_token(api, config_type: str = 'running') -> str:
+    """
+    Palo Alto 설정 변경 토큰을 반환합니다.
+    running은 커밋 이력(show config audit info)으로 계산하며, candidate는 미커밋 변경이 있을 때만
+    candidate 설정 전체를 해시합니다.
+    """
+    audit_params = (
+        ('type', 'op'),
+        ('cmd', '<show><config><audit><info/></audit></config></show>'),
+        ('key', api.api_key)
+    )
+    audit = ET.fromstring(api.get_api_data(audit_params).text)
+    audit_text = ET.tostring(audit.find('./result'), encoding='unicode') if audit.find('./result') is not None else ''
+    if config_type != 'candidate':
+        return make_token('paloalto', 'running', audit_text)
+
+    pending_params = (
+        ('type', 'op'),
+        ('cmd', '<check><pending-changes></pending-changes></check>'),
+        ('key', api.api_key)
+    )
+    pending = ET.fromstring(api.get_api_data(pending_params).text).findtext('./result')
+    if pending != 'yes':
+        return make_token('paloalto', 'candidate', audit_text)
+    return make_token('paloalto', 'candidate', audit_text, api.get_config('candidate'))
+
+
+def mf2_change_token(host: str, username: str, password: str, port: int = 22) -> str:
+    """
+    MF2 장비의 최신 fwrules 파일과 객체 conf 파일의 md5sum 결과로 변경 토큰을 계산합니다.
+    """
+    from modules.secui_mf2_v2 import create_ssh_client, exec_remote_command
+
+    ssh = create_ssh_client(host, port, username, password)
+    try:
+        _, stdout, _ = exec_remote_command(ssh, MF2_CHECKSUM_COMMAND, MF2_REMOTE_DIRECTORY)
+        return make_token('mf2', stdout.read())
+    finally:
+        ssh.close()
+
+
+def ngf_change_token(hostname: str, ext_clnt_id: str, ext_clnt_secret: str) -> str:
+    """
+    NGF 규칙 응답을 스트리밍하며 규칙 수와 내용 해시로 변경 토큰을 계산합니다.
+    규칙을 DataFrame으로 만들지 않으므로 메모리와 파싱 비용 없이 비교할 수 있습니다.
+    """
+    from modules.secui_ngf_v2 import NGFClient
+
+    client = NGFClient(hostname, ext_clnt_id, ext_clnt_secret)
+    if not client.login():
+        raise ValueError("NGF login failed")
+    try:
+        digest = hashlib.sha256()
+        count = 0
+        for rule in client.iter_fw4_rules():
+            # 조회 시점마다 달라지는 hit 정보는 변경으로 보지 않습니다.
+            rule = {k: v for k, v in rule.items() if k not in ('last_hit_time', 'hit_count')}
+            digest.update(json.dumps(rule, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+            count += 1
+    finally:
+        client.logout()
+    return make_token('ngf', str(count), digest.hexdigest())
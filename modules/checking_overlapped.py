@@ -1,5 +1,8 @@
 import ipaddress
 import re
+import numpy as np
+
+from modules.name_bitset import NameBitset
 
 # 정책 추출
 
@@ -97,6 +100,9 @@ def check_overlaps(data1, data2):
     if not is_application_overlap(data1['Application'], data2['Application']):
         return False
     
+    return check_address_service_overlaps(data1, data2)
+
+def check_address_service_overlaps(data1, data2):
     if not is_service_overlap(data1['Extracted Service'], data2['Extracted Service']):
         return False
     
@@ -105,9 +111,39 @@ def check_overlaps(data1, data2):
     
     return True
 
-def analyze_impact(moved_policy_name, df):
-    impacted_rules = []
-    matched_rules = []
+def encode_applications(df):
+    """
+    규칙 테이블의 Application 컬럼을 한 번에 비트 배열로 인코딩합니다(규칙 테이블마다 한 번).
+    """
+    return NameBitset().encode_array(df['Application'].astype(str))
+
+def find_overlapping_rules(df, target_position, candidate_positions, app_bits=None):
+    """
+    target_position 규칙과 겹치는 candidate_positions 규칙 위치를 반환합니다.
+    애플리케이션은 비트 배열로 후보 전체를 한 번에 거르고, 남은 규칙만 서비스/주소를 비교합니다.
+    빈 값처럼 비트가 없는 애플리케이션은 문자열 비교 결과를 따르도록 후보에 남깁니다.
+    """
+    candidates = np.asarray(candidate_positions, dtype=np.int64)
+    if app_bits is None:
+        app_bits = encode_applications(df)
+    target_bits = app_bits[target_position]
+    if target_bits.any():
+        candidate_bits = app_bits[candidates]
+        candidates = candidates[NameBitset.overlap_any(candidate_bits, target_bits) | ~candidate_bits.any(axis=1)]
+
+    target = df.iloc[target_position]
+    matched = []
+    for position in candidates:
+        rule = df.iloc[position]
+        if is_application_overlap(target['Application'], rule['Application']) and check_address_service_overlaps(target, rule):
+            matched.append(int(position))
+    return matched
+
+def deny_positions(df, start_index, end_index):
+    actions = df['Action'].to_numpy()[start_index:end_index + 1]
+    return start_index + np.flatnonzero(actions == 'deny')
+
+def analyze_impact(moved_policy_name, df, app_bits=None):
 
     target_index = df[df['Rule Name'] == moved_policy_name].index[0]
     reference_index = df.index[-1]
@@ -119,23 +155,14 @@ def analyze_impact(moved_policy_name, df):
     start_index = min(target_index, reference_index)
     end_index = max(target_index, reference_index)
 
-    for i in range(start_index, end_index + 1):
-        if df.iloc[i]['Action'] == 'deny':
-            impacted_rules.append(i)
-    
-    if impacted_rules:
-        for index in impacted_rules:
-            if check_overlaps(df.iloc[start_index], df.iloc[index]):
-                matched_rules.append(index)
+    impacted_rules = deny_positions(df, start_index, end_index)
+    matched_rules = find_overlapping_rules(df, start_index, impacted_rules, app_bits)
     
     result = {target_index: matched_rules}
 
     return result
 
-def analyze_impact_2(moved_policy_name, df):
-    impacted_rules = []
-    matched_rules = []
-
+def analyze_impact_2(moved_policy_name, df, app_bits=None):
     moved_index = df[df['Rule Name'] == moved_policy_name].index[0]
     reference_index = df.index[-2]
 
@@ -146,15 +173,11 @@ def analyze_impact_2(moved_policy_name, df):
     start_index = min(moved_index, reference_index)
     end_index = max(moved_index, reference_index)
 
-    for i in range(start_index, end_index + 1):
-        if df.iloc[i]['Action'] == 'deny':
-            impacted_rules.append(df.iloc[i])
+    impacted_rules = deny_positions(df, start_index, end_index)
     
-    if impacted_rules:
-        for rule in impacted_rules:
-            if check_overlaps(df.iloc[start_index], rule):
-                matched_rules.append(rule)
-                print(rule['Rule Name', 'Source', 'Destination', 'Service', 'Application', 'Description'])
+    if len(impacted_rules):
+        for position in find_overlapping_rules(df, start_index, impacted_rules, app_bits):
+            print(df.iloc[position][['Rule Name', 'Source', 'Destination', 'Service', 'Application', 'Description']])
     else:
         print("영향받는 정책이 없습니다.")
 
@@ -176,10 +199,11 @@ def main():
     rules_df = rule_converting(config)
     result = []
     total_target = len(targets)
+    app_bits = encode_applications(rules_df)
     for i, target_policy_name in enumerate(targets):
         print(f'진행률: {i+1}/{total_target}')
         try:
-            result.append(analyze_impact(target_policy_name, rules_df))
+            result.append(analyze_impact(target_policy_name, rules_df, app_bits))
         except:
             print(f'error - {target_policy_name}')
     
@@ -0,0 +1,267 @@
+import os
+import logging
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from modules import deletion_process, frame_io, metrics
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+STAGES = ['parse', 'enrich', 'exception', 'classify', 'notice']
+
+# 장비 종류별 예외 처리 방식 (deletion_process.EXCEPTION_HANDLERS의 키)
+EXCEPTION_VENDORS = {
+    'paloalto': 'paloalto',
+    'secui': 'secui',
+    'mf2': 'secui',
+    'ngf': 'secui',
+}
+
+
+def default_checkpoint_format() -> str:
+    return 'parquet' if frame_io.pyarrow is not None else 'pkl'
+
+
+def checkpoint_path(directory: str, name: str, stage: str, format: str = 'pkl') -> str:
+    return os.path.join(directory, f"{name}.{stage}{frame_io.FORMATS[format]}")
+
+
+def normalize_blanks(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    빈 문자열을 결측값으로 바꿉니다. Excel로 저장 후 다시 읽었을 때와 같은 값이 되도록 맞추는 용도입니다.
+    """
+    text_columns = df.select_dtypes(include=['object', 'string']).columns
+    if len(text_columns):
+        df[text_columns] = df[text_columns].replace('', np.nan)
+    return df
+
+
+def mark_unused(df: pd.DataFrame, usage_df: pd.DataFrame, unused_days: int) -> pd.DataFrame:
+    """
+    히트 카운트 결과(Rule Name, Unused Days)로 미사용여부('사용'/'미사용')를 채웁니다.
+    히트 카운트에 없는 규칙은 기존 값을 유지합니다.
+    """
+    days = usage_df.drop_duplicates(subset=['Rule Name']).set_index('Rule Name')['Unused Days']
+    rule_days = pd.to_numeric(df['Rule Name'].map(days), errors='coerce')
+    found = rule_days.notna()
+    df.loc[found, '미사용여부'] = np.where(rule_days[found] >= unused_days, '미사용', '사용')
+    return df
+
+
+def mark_redundant(df: pd.DataFrame, redundant_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    중복정책 정리 결과(organize_redundant_file의 _정리 파일: Rule Name, 작업구분)로 중복여부를 채웁니다.
+    중복여부가 채워진 규칙은 공지 대상에서 제외됩니다. 정리 결과에 없는 규칙은 기존 값을 유지합니다.
+    """
+    tasks = redundant_df.drop_duplicates(subset=['Rule Name']).set_index('Rule Name')['작업구분']
+    current = df['중복여부'] if '중복여부' in df.columns else pd.Series(np.nan, index=df.index, dtype=object)
+    found = df['Rule Name'].map(tasks)
+    df['중복여부'] = found.where(found.notna(), current)
+    return df
+
+
+def has_usage(df: pd.DataFrame) -> bool:
+    """
+    공지 분류에 필요한 미사용여부('사용'/'미사용')가 하나라도 채워져 있는지 확인합니다.
+    """
+    return '미사용여부' in df.columns and bool(df['미사용여부'].isin(['사용', '미사용']).any())
+
+
+class DeletionPipeline:
+    """
+    정책 삭제 작업(parse → enrich → exception → classify → notice)을 하나의 DataFrame으로 메모리에서 이어서 실행합니다.
+    단계 사이에는 Excel을 읽고 쓰지 않으며, checkpoint_dir를 지정하면 단계별 결과를 checkpoint_format
+    (기본값: pyarrow가 있으면 parquet, 없으면 pickle)으로 남겨 해당 파일부터 이후 단계를 다시 실행할 수 있습니다.
+    최종 정리 파일은 output_format으로, 공지 파일은 항상 Excel로 저장합니다.
+
+    공지 분류는 미사용여부(usage_df)와 중복여부(redundant_df)를 사용합니다. 미사용여부가 비어 있으면 공지 파일을 만들지 않습니다.
+    """
+
+    def __init__(self, vendor: str, info_df: pd.DataFrame = None, usage_df: pd.DataFrame = None,
+                 checkpoint_dir: str = None, unused_days: int = 90, current_date: datetime = None,
+                 checkpoint_format: str = None, output_format: str = 'xlsx', exception_rules: list = None,
+                 notice_workers: int = None, redundant_df: pd.DataFrame = None):
+        if vendor not in EXCEPTION_VENDORS:
+            raise ValueError(f"Unsupported vendor: {vendor}")
+        self.vendor = vendor
+        self.info_df = info_df
+        self.usage_df = usage_df
+        self.checkpoint_dir = checkpoint_dir
+        self.unused_days = unused_days
+        self.current_date = current_date
+        self.checkpoint_format = checkpoint_format or default_checkpoint_format()
+        self.output_format = output_format
+        # None이면 장비 종류별 기본 예외 규칙(deletion_process.*_EXCEPTION_RULES)을 사용합니다.
+        self.exception_rules = exception_rules
+        self.notice_workers = notice_workers
+        self.redundant_df = redundant_df
+        frame_io.require_pyarrow(self.checkpoint_format)
+        frame_io.require_pyarrow(self.output_format)
+
+    # ────────────── STAGES ──────────────
+
+    def parse(self, df: pd.DataFrame) -> pd.DataFrame:
+        return deletion_process.parse_request_frame(df)
+
+    def enrich(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.info_df is None:
+            raise ValueError("enrich stage requires a request info file")
+        info_df = deletion_process.to_text_frame(self.info_df)
+        auto_extension_id = deletion_process.auto_extension_ids(info_df) if 'REQUEST_STATUS' in info_df.columns else None
+        return deletion_process.enrich_request_info(deletion_process.to_text_frame(df), info_df, auto_extension_id)
+
+    def exception(self, df: pd.DataFrame) -> pd.DataFrame:
+        handler = deletion_process.EXCEPTION_HANDLERS[EXCEPTION_VENDORS[self.vendor]]
+        with metrics.stage('exception', rows=len(df)):
+            return handler(df, self.current_date, self.exception_rules)
+
+    def classify(self, df: pd.DataFrame) -> pd.DataFrame:
+        with metrics.stage('classify', rows=len(df)):
+            df = normalize_blanks(df)
+            if self.usage_df is not None:
+                df = mark_unused(df, self.usage_df, self.unused_days)
+            if self.redundant_df is not None:
+                df = mark_redundant(df, self.redundant_df)
+            elif '중복여부' not in df.columns:
+                df['중복여부'] = np.nan
+        return df
+
+    # ────────────── RUNNER ──────────────
+
+    def save_checkpoint(self, df: pd.DataFrame, name: str, stage: str):
+        if not self.checkpoint_dir:
+            return
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = checkpoint_path(self.checkpoint_dir, name, stage, self.checkpoint_format)
+        with metrics.stage('checkpoint', rows=len(df)):
+            frame_io.write_frame(df, path)
+        logging.info(f"Checkpoint '{stage}' has been saved to {path}")
+
+    def run(self, df: pd.DataFrame, output_base: str, stages: list = None, write_output: bool = True) -> dict:
+        """
+        stages(기본값: 전체 단계)를 순서대로 실행합니다.
+        write_output이 True이면 마지막 단계 결과를 {output_base}_vf{output_format 확장자}로,
+        notice 단계가 있으면 공지 파일을 저장합니다.
+
+        :return: {'frame': 최종 DataFrame, 'files': 저장한 파일 목록}
+        """
+        stages = stages or STAGES
+        unknown = [stage for stage in stages if stage not in STAGES]
+        if unknown:
+            raise ValueError(f"Unknown deletion stages: {', '.join(unknown)}")
+        stages = [stage for stage in STAGES if stage in stages]
+
+        name = os.path.basename(output_base)
+        files = []
+        for stage in stages:
+            logging.info(f"[{name}] Running deletion stage '{stage}' ({len(df)} rules)")
+            if stage == 'notice':
+                if write_output and not has_usage(df):
+                    logging.warning(f"[{name}] 미사용여부 is empty (no hit count file); notice files are skipped")
+                elif write_output:
+                    with metrics.stage('notice', rows=len(df)):
+                        files.extend(deletion_process.write_notice_files(df, output_base, self.notice_workers))
+                continue
+            df = getattr(self, stage)(df)
+            self.save_checkpoint(df, name, stage)
+
+        if write_output:
+            output_file = deletion_process.update_version(f"{output_base}{frame_io.FORMATS[self.output_format]}", True)
+            with metrics.stage('write', rows=len(df)):
+                frame_io.write_frame(df, output_file)
+            files.insert(0, output_file)
+            logging.info(f"[{name}] Deletion result has been saved to {output_file}")
+
+        return {'frame': df, 'files': files}
+
+
+# ────────────── BATCH ──────────────
+
+def request_ids(rule_files: list, stages: list = None):
+    """
+    신청정보 파일을 미리 거를 수 있도록 정책 파일들의 신청번호 합집합을 반환합니다.
+    parse 단계를 실행하면 Description에서 파싱하고, 아니면 파일의 Request ID 컬럼을 사용합니다.
+    신청번호를 구할 수 없는 파일이 있으면 None(신청정보 전체 사용)을 반환합니다.
+    """
+    stages = stages or STAGES
+    ids = set()
+    for path in rule_files:
+        if frame_io.file_format(path) == 'xlsx':
+            df = frame_io.read_excel_stream(path, ['Rule Name', 'Description', 'Request ID'])
+        else:
+            df = frame_io.read_frame(path)
+        if 'parse' in stages and {'Rule Name', 'Description'} <= set(df.columns):
+            values = deletion_process.parse_request_columns(df['Rule Name'], df['Description'])['Request ID']
+        elif 'Request ID' in df.columns:
+            values = df['Request ID']
+        else:
+            logging.warning(f"No Request ID in {path}; request info is not pre-filtered")
+            return None
+        ids.update(values.dropna().astype(str))
+    return sorted(ids)
+
+
+_worker_info_df = None
+
+
+def init_worker(info_df: pd.DataFrame = None):
+    """
+    작업자 프로세스마다 신청정보를 한 번만 받아 둡니다 (작업마다 신청정보 파일을 다시 읽지 않도록).
+    """
+    global _worker_info_df
+    _worker_info_df = info_df
+
+
+def run_job(job: dict) -> dict:
+    """
+    정책 파일 하나에 파이프라인을 실행합니다. 실패해도 예외를 올리지 않고 결과의 'error'에 남깁니다.
+
+    :param job: rules, vendor, output_base 및 선택 항목 usage, redundant, stages, checkpoint_dir, checkpoint_format, output_format,
+                exception_rules, notice_workers, unused_days
+    :return: {'rules', 'files', 'rows', 'stages'(metrics.StageRecord 목록)} 또는 {'rules', 'error'}
+    """
+    name = os.path.basename(job['rules'])
+    stage_count = len(metrics.current().stages)
+    try:
+        rule_df = frame_io.read_frame(job['rules'])
+        usage_df = frame_io.read_frame(job['usage']) if job.get('usage') else None
+        redundant_df = frame_io.read_frame(job['redundant']) if job.get('redundant') else None
+        pipeline = DeletionPipeline(job['vendor'], _worker_info_df, usage_df,
+                                    job.get('checkpoint_dir'), job.get('unused_days', 90),
+                                    checkpoint_format=job.get('checkpoint_format'),
+                                    output_format=job.get('output_format', 'xlsx'),
+                                    exception_rules=job.get('exception_rules'),
+                                    notice_workers=job.get('notice_workers'),
+                                    redundant_df=redundant_df)
+        result = pipeline.run(rule_df, job['output_base'], job.get('stages'))
+        return {
+            'rules': job['rules'],
+            'files': result['files'],
+            'rows': len(result['frame']),
+            'stages': metrics.current().stages[stage_count:],
+        }
+    except Exception as e:
+        logging.exception(f"[{name}] Deletion pipeline failed: {e}")
+        return {'rules': job['rules'], 'error': str(e)}
+
+
+def run_jobs(jobs: list, info_df: pd.DataFrame = None, workers: int = None) -> list:
+    """
+    여러 장비의 정책 파일을 처리합니다. workers가 2 이상이면 프로세스 풀에서 동시에 실행하며,
+    작업자에서 기록한 단계 metrics는 현재 프로세스의 metrics에 합쳐집니다.
+    """
+    if not workers or workers <= 1 or len(jobs) <= 1:
+        init_worker(info_df)
+        return [run_job(job) for job in jobs]
+
+    logging.info(f"Running {len(jobs)} deletion jobs with {min(workers, len(jobs))} workers")
+    # 이미 장비별로 프로세스를 나누었으므로 작업자 안에서는 공지 파일을 순서대로 저장합니다.
+    jobs = [dict(job, notice_workers=1) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=init_worker, initargs=(info_df,)) as executor:
+        results = list(executor.map(run_job, jobs))
+    for result in results:
+        metrics.current().stages.extend(result.get('stages', []))
+    return results
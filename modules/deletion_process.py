@@ -1,12 +1,15 @@
 import pandas as pd
+import numpy as np
 pd.options.mode.chained_assignment = None
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Alignment, PatternFill, Font
 import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 import re
-from datetime import datetime, timedelta
+from datetime import datetime
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from modules import metrics, frame_io, exception_engine
 
 COLUMNS = [
     'Rule Name', 'Source', 'User', 'Destination', 'Service', 'Application', 'Description',
@@ -48,7 +51,7 @@ except_list = [
 ]
 
 def update_version(filename: str, final_version: bool = False) -> str:
-    base_name, ext = filename.rsplit('.', 1)
+    base_name, ext = frame_io.split_extension(filename)
 
     match = re.search(r'_v(\d+)$', base_name)
     final_match = re.search(r'_vf$', base_name)
@@ -69,10 +72,10 @@ def update_version(filename: str, final_version: bool = False) -> str:
         else:
             new_base_name = f"{base_name}_v1"
     
-    new_filename = f"{new_base_name}.{ext}"
+    new_filename = f"{new_base_name}{ext}"
     return new_filename
 
-def select_xlsx_files(extension='.xlsx'):
+def select_xlsx_files(extension=frame_io.INPUT_EXTENSIONS):
     file_list = [file for file in os.listdir() if file.endswith(extension)]
     if not file_list:
         print("no excel file")
@@ -97,6 +100,12 @@ def save_to_excel(df, type, file_name):
     sheet = wb[type]
 
     sheet.insert_rows(1)
+    style_notice_sheet(sheet, type)
+    
+    wb.save(file_name)
+
+def style_notice_sheet(sheet, type):
+    """ 공지 시트의 1행에 대상 정책 수를 넣고 2행(헤더)을 꾸밉니다. """
     sheet['A1'] = '="대상 정책 수: "&COUNTA(B:B)-1'
 
     sheet['A1'].font = Font(bold=True)
@@ -110,112 +119,124 @@ def save_to_excel(df, type, file_name):
         for col in range(8, 24):
             cell = sheet.cell(row=2, column=col)
             cell.fill = PatternFill(start_color='ccffff', end_color='ccffff', fill_type='solid')
-    
-    wb.save(file_name)
 
 def remove_extension(filename):
-    return os.path.splitext(filename)[0]
+    return frame_io.split_extension(filename)[0]
 
 # 1. parsing request id from description
+# 신청 설명/규칙명 패턴 (모듈 로드 시 한 번만 컴파일합니다)
+REQUEST_PATTERN = re.compile("MASKED")             # 1: Ruleset ID, 2: 시작일, 3: 종료일, 4: 신청자, 5: 신청번호, 6: MIS ID
+OLD_RULENAME_PATTERN = re.compile("MASKED")        # 1: 신청번호
+OLD_USER_PATTERN = re.compile(r'MASKED')           # 1: 신청자
+OLD_DATE_PATTERN = re.compile(r'MASKED')           # 시작일~종료일
+REQUEST_TYPE_CODES = {'P': 'GROUP', 'F': 'NORMAL', 'S': 'SERVER', 'M': 'PAM'}
+REQUEST_COLUMNS = ['Request Type', 'Request ID', 'Ruleset ID', 'MIS ID', 'Request User', 'Start Date', 'End Date']
+
+def convert_to_date(date_str):
+    try:
+        date_obj = datetime.strptime(date_str, '%Y%m%d')
+        return date_obj.strftime('%Y-%m-%d')
+    except ValueError:
+        return date_str
+
+def convert_dates(values: pd.Series) -> pd.Series:
+    """
+    YYYYMMDD 문자열을 YYYY-MM-DD로 변환합니다. 같은 값은 한 번만 변환합니다.
+    """
+    mapping = {value: convert_to_date(value) for value in pd.unique(values.dropna())}
+    return values.map(mapping)
+
+def extract_groups(values: pd.Series, pattern, anchored: bool = False):
+    """
+    패턴의 일치 여부와 캡처 그룹을 컬럼 단위로 추출합니다. anchored가 True이면 re.match처럼 문자열 시작에서만 찾습니다.
+
+    :return: (일치 여부 Series, 그룹 DataFrame(0: 전체 일치, 1..n: 그룹))
+    """
+    regex = f"^(?:{pattern.pattern})" if anchored else pattern.pattern
+    regex = re.compile(f"({regex})", pattern.flags)
+    # 전체 일치를 0번 그룹으로 감쌌으므로 원래 그룹 번호(1..n)는 그대로 유지됩니다.
+    groups = values.str.extract(regex, expand=True)
+    groups.columns = range(len(groups.columns))
+    return groups[0].notna(), groups
+
+def parse_request_columns(rule_names: pd.Series, descriptions: pd.Series) -> pd.DataFrame:
+    """
+    규칙명과 설명에서 신청 정보(REQUEST_COLUMNS)를 컬럼 단위로 파싱합니다.
+    """
+    default_date = convert_to_date('19000101')
+    result = pd.DataFrame({
+        'Request Type': 'Unknown',
+        'Request ID': None,
+        'Ruleset ID': None,
+        'MIS ID': None,
+        'Request User': None,
+        'Start Date': default_date,
+        'End Date': default_date,
+    }, index=descriptions.index, columns=REQUEST_COLUMNS).astype(object)
+
+    has_description = descriptions.notna()
+    description = descriptions[has_description].astype(str)
+    rule_name = rule_names[has_description].astype(str)
+    if description.empty:
+        return result
+
+    # 신규 형식: 설명 전체에서 신청 정보를 읽고, 신청번호 첫 글자로 신청 유형을 정합니다.
+    matched, groups = extract_groups(description, REQUEST_PATTERN, anchored=True)
+    if matched.any() and len(groups.columns) > 6:
+        rows = matched[matched].index
+        request_id = groups.loc[rows, 5]
+        result.loc[rows, 'Request ID'] = request_id
+        result.loc[rows, 'Ruleset ID'] = groups.loc[rows, 1]
+        mis_id = groups.loc[rows, 6]
+        result.loc[rows, 'MIS ID'] = mis_id.where(mis_id.fillna('') != '', None)
+        result.loc[rows, 'Request User'] = groups.loc[rows, 4]
+        result.loc[rows, 'Start Date'] = convert_dates(groups.loc[rows, 2])
+        result.loc[rows, 'End Date'] = convert_dates(groups.loc[rows, 3])
+        result.loc[rows, 'Request Type'] = request_id.str[:1].map(REQUEST_TYPE_CODES).fillna('Unknown')
+
+    # 이전 형식: 규칙명에 신청번호가 있으면 설명의 신청자/기간으로 덮어씁니다.
+    name_matched, name_groups = extract_groups(rule_name, OLD_RULENAME_PATTERN, anchored=True)
+    if name_matched.any() and len(name_groups.columns) > 1:
+        rows = name_matched[name_matched].index
+        result.loc[rows, 'Request Type'] = 'OLD'
+        result.loc[rows, 'Request ID'] = name_groups.loc[rows, 1]
+
+        user_matched, user_groups = extract_groups(description[rows], OLD_USER_PATTERN)
+        if user_matched.any() and len(user_groups.columns) > 1:
+            user_rows = user_matched[user_matched].index
+            result.loc[user_rows, 'Request User'] = user_groups.loc[user_rows, 1].str.replace("*ACL*", "", regex=False)
+
+        date_matched, date_groups = extract_groups(description[rows], OLD_DATE_PATTERN)
+        if date_matched.any():
+            date_rows = date_matched[date_matched].index
+            period = date_groups.loc[date_rows, 0].str.split('~')
+            result.loc[date_rows, 'Start Date'] = convert_dates(period.str[0])
+            result.loc[date_rows, 'End Date'] = convert_dates(period.str[1])
+
+    return result
+
+def parse_request_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    규칙 DataFrame에 신청 정보 컬럼(REQUEST_COLUMNS)을 추가하여 반환합니다.
+    """
+    with metrics.stage('parse', rows=len(df)):
+        parsed = parse_request_columns(df['Rule Name'], df['Description'])
+        for column in REQUEST_COLUMNS:
+            df[column] = parsed[column]
+    return df
+
 def parse_request_type():
-    def convert_to_date(date_str):
-        try:
-            date_obj = datetime.strptime(date_str, '%Y%m%d')
-            return date_obj.strftime('%Y-%m-%d')
-        except ValueError:
-            return date_str
-    
-    def parse_request_info(rulename, description):
-        data_dict = {
-            "Request Type": "Unknown",
-            "Request ID": None,
-            "Ruleset ID": None,
-            "MIS ID": None,
-            "Request User": None,
-            "Start Date": convert_to_date('19000101'),
-            "End Date": convert_to_date('19000101'),
-        }
-
-        if pd.isnull(description):
-            return data_dict
-        
-        # initial pattern
-        pattern_3 = re.compile("MASKED")
-        pattern_1_rulename = re.compile("MASKED")
-        pattern_1_user = r'MASKED'
-        rulename_1_rulename = r'MASKED'
-        rulename_1_date = r'MASKED'
-
-        # matched
-        match_3 = pattern_3.match(description)
-        name_match = pattern_1_rulename.match(str(rulename))
-        user_match = re.search(pattern_1_user, description)
-        desc_match = re.search(rulename_1_rulename, description)
-        date_match = re.search(rulename_1_date, description)
-
-        if match_3:
-            data_dict = {
-                "Request Type": None,
-                "Request ID": match_3.group(5),
-                "Ruleset ID": match_3.group(1),
-                "MIS ID": match_3.group(6) if match_3.group(6) else None,
-                "Request User": match_3.group(4),
-                "Start Date": convert_to_date(match_3.group(2)),
-                "End Date": convert_to_date(match_3.group(3)),
-            }
-            
-            type_code = data_dict["Request ID"][:1]
-            if type_code == "P":
-                data_dict["Request Type"] = "GROUP"
-            elif type_code == "F":
-                data_dict["Request Type"] = "NORMAL"
-            elif type_code == "S":
-                data_dict["Request Type"] = "SERVER"
-            elif type_code == "M":
-                data_dict["Request Type"] = "PAM"
-            else:
-                data_dict["Request Type"] = "Unknown"
-        
-        if name_match:
-            data_dict['Request Type'] = "OLD"
-            data_dict['Request ID'] = name_match.group(1)
-            if user_match:
-                data_dict['Request User'] = user_match.group(1).replace("*ACL*", "")
-            if date_match:
-                data_dict['Start Date'] = convert_to_date(date_match.group().split("~")[0])
-                data_dict['End Date'] = convert_to_date(date_match.group().split("~")[1])
-        
-        if desc_match:
-            date = description.split(';')[0]
-            start_date = date.split('~')[0].replace('[', '').replace('-', '')
-            end_date = date.split('~')[1].replace(']', '').replace('-', '')
-
-            date_dict = {
-                "Request Type": "OLD",
-                "Request ID": desc_match.group(1).split('-')[1],
-                "Ruleset ID": None,
-                "MIS ID": None,
-                "Request User": user_match.group(1).replace("*ACL*", "") if user_match else None,
-                "Start Date": convert_to_date(start_date),
-                "End Date": convert_to_date(end_date),
-            }
-        
-        return data_dict
-    
     file_name = select_xlsx_files()
-    df = pd.read_excel(file_name)
+    df = frame_io.read_frame(file_name)
 
-    for index, row in df.iterrows():
-        result = parse_request_info(row['Rule Name'], row['Description'])
-        for key, value in result.items():
-            df.at[index, key] = value
+    parse_request_frame(df)
     
-    df.to_excel(update_version(file_name), index=False)
+    frame_io.write_frame(df, update_version(file_name))
 
 # 2. extract request id
 def extract_request_id():
     file_name = select_xlsx_files()
-    df = pd.read_excel(file_name)
+    df = frame_io.read_frame(file_name)
 
     # 'Unknown' 값을 제외하고 고유한 Request Type 값을 추출
     unique_types = df[df['Request Type'] != 'Unknown']['Request Type'].unique()
@@ -227,44 +248,145 @@ def extract_request_id():
     selected_data = df[df['Request Type'].isin(selected_types)]
 
     # 각 Request Type별로 Request ID 값만 추출하여 중복 제거 후 Excel의 각 시트로 저장
-    with pd.ExcelWriter(f"request_id_{file_name}") as writer:
+    with pd.ExcelWriter(f"request_id_{frame_io.replace_extension(file_name, 'xlsx')}") as writer:
         for request_type, group in selected_data.groupby('Request Type'):
             group[['Request ID']].drop_duplicates().to_excel(writer, sheet_name=request_type, index=False)
 
 # 3. add request info
+# GROUP 신청 규칙의 매칭 키 (규칙 컬럼, 신청정보 컬럼). 이 중 하나라도 일치하는 첫 신청 건을 사용합니다.
+GROUP_MATCH_KEYS = [
+    (['Request ID', 'MIS ID'], ['REQUEST_ID', 'MIS_ID']),
+    (['Request ID', 'End Date', 'Request User'], ['REQUEST_ID', 'REQUEST_END_DATE', 'WRITE_PERSON_ID']),
+    (['Request ID', 'End Date', 'Request User'], ['REQUEST_ID', 'REQUEST_END_DATE', 'REQUESTER_ID']),
+]
+REQUEST_MATCH_KEY = (['Request ID'], ['REQUEST_ID'])
+REQUEST_INFO_DATE_COLUMNS = ['REQUEST_START_DATE', 'REQUEST_END_DATE', 'Start Date', 'End Date']
+
+def first_match_positions(rule_df, info_df, rule_columns, info_columns):
+    """
+    규칙마다 키가 일치하는 첫 신청정보 행의 위치(info_df 순서)를 반환합니다. 일치하는 행이 없으면 -1입니다.
+    키별 첫 행만 남긴 색인을 한 번 만들고 merge로 찾습니다.
+    """
+    index = info_df[info_columns].copy()
+    index['_pos'] = np.arange(len(info_df))
+    index = index.drop_duplicates(subset=info_columns, keep='first')
+
+    keys = rule_df[rule_columns].copy()
+    keys.columns = info_columns
+    merged = keys.merge(index, on=info_columns, how='left')
+    return merged['_pos'].fillna(-1).to_numpy(dtype=np.int64)
+
+def match_request_info(rule_df, info_df):
+    """
+    규칙별로 매칭되는 신청정보 행 위치를 반환합니다(-1: 없음).
+    GROUP 규칙은 GROUP_MATCH_KEYS 중 하나라도 일치하는 행 중 info_df에서 가장 앞선 행,
+    그 외 규칙은 REQUEST_ID가 일치하는 첫 행입니다.
+    """
+    positions = first_match_positions(rule_df, info_df, *REQUEST_MATCH_KEY)
+
+    group = (rule_df['Request Type'] == 'GROUP').to_numpy()
+    if group.any():
+        group_df = rule_df[group]
+        candidates = np.vstack([first_match_positions(group_df, info_df, rule_columns, info_columns) for rule_columns, info_columns in GROUP_MATCH_KEYS])
+        candidates = np.where(candidates >= 0, candidates, len(info_df))
+        first = candidates.min(axis=0)
+        positions[group] = np.where(first < len(info_df), first, -1)
+    return positions
+
+def apply_request_info(rule_df, info_df):
+    """
+    매칭된 신청정보를 rule_df에 컬럼 단위로 채웁니다. 매칭되지 않은 신청 규칙은 설명에서 파싱한 값으로 채웁니다.
+    """
+    positions = match_request_info(rule_df, info_df)
+    matched = positions >= 0
+    rows = rule_df.index[matched]
+    info_rows = info_df.iloc[positions[matched]]
+
+    def set_values(col, target, values):
+        if col not in rule_df.columns:
+            rule_df[col] = np.nan
+        rule_df[col] = rule_df[col].astype(object)
+        rule_df.loc[target, col] = values
+
+    def to_dates(values):
+        # 같은 문자열은 한 번만 변환합니다. 값마다 형식을 따로 판단하도록 스칼라 단위로 변환합니다.
+        dates = {value: pd.to_datetime(value, errors='coerce') for value in pd.unique(values)}
+        return np.array([dates[value] for value in values], dtype=object)
+
+    for col in info_df.columns:
+        values = info_rows[col].to_numpy(dtype=object)
+        if col in REQUEST_INFO_DATE_COLUMNS:
+            values = to_dates(values)
+        set_values(col, rows, values)
+
+    fallback = ~matched & ~rule_df['Request Type'].isin(['nan', 'Unknown']).to_numpy()
+    target = rule_df.index[fallback]
+    request_user = rule_df.loc[target, 'Request User']
+    set_values('REQUEST_ID', target, rule_df.loc[target, 'Request ID'].to_numpy(dtype=object))
+    set_values('REQUEST_START_DATE', target, to_dates(rule_df.loc[target, 'Start Date'].to_numpy(dtype=object)))
+    set_values('REQUEST_END_DATE', target, to_dates(rule_df.loc[target, 'End Date'].to_numpy(dtype=object)))
+    set_values('REQUESTER_ID', target, request_user.to_numpy(dtype=object))
+    set_values('REQUESTER_EMAIL', target, (request_user + '@gmail.com').to_numpy(dtype=object))
+    for col in REQUEST_INFO_DATE_COLUMNS[:2]:
+        rule_df[col] = rule_df[col].infer_objects()
+
+    logging.info(f"Request info matched: {int(matched.sum())}, filled from description: {int(fallback.sum())}")
+    return rule_df
+
+# 신청정보 파일에서 읽을 컬럼 (매칭 키 + 규칙에 붙일 값)
+REQUEST_INFO_COLUMNS = [
+    'REQUEST_ID', 'REQUEST_START_DATE', 'REQUEST_END_DATE', 'TITLE', 'REQUESTER_ID',
+    'REQUESTER_EMAIL', 'REQUESTER_NAME', 'REQUESTER_DEPT', 'WRITE_PERSON_ID', 'WRITE_PERSON_EMAIL',
+    'WRITE_PERSON_NAME', 'WRITE_PERSON_DEPT', 'APPROVAL_PERSON_ID', 'APPROVAL_PERSON_EMAIL',
+    'APPROVAL_PERSON_NAME', 'APPROVAL_PERSON_DEPT_NAME', 'MIS_ID', 'REQUEST_STATUS',
+]
+
+def read_request_info(file, request_ids=None) -> pd.DataFrame:
+    """
+    신청정보 파일에서 REQUEST_INFO_COLUMNS만 문자열로 읽습니다.
+    request_ids를 지정하면 해당 신청번호의 행만 남깁니다 (모든 매칭 키에 신청번호가 포함되므로 결과는 같습니다).
+    Excel은 한 행씩 스트리밍으로 읽습니다.
+    """
+    if frame_io.file_format(file) == 'xlsx':
+        df = frame_io.read_excel_stream(file, REQUEST_INFO_COLUMNS, filter_column='REQUEST_ID', filter_values=request_ids)
+    else:
+        df = frame_io.read_frame(file)
+        df = df[[column for column in REQUEST_INFO_COLUMNS if column in df.columns]]
+        if request_ids is not None:
+            df = df[df['REQUEST_ID'].astype(str).isin(pd.Series(request_ids).astype(str))]
+    return to_text_frame(df)
+
+def to_text_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """ 신청정보 매칭 전 초기 처리 (모든 컬럼을 문자열로 통일) """
+    df = df.replace({'nan': None})
+    return df.astype(str)
+
+def auto_extension_ids(info_df: pd.DataFrame) -> pd.Series:
+    """
+    가공된 신청정보에서 자동연장(REQUEST_STATUS 98, 99) 신청번호를 반환합니다.
+    """
+    status = pd.to_numeric(info_df['REQUEST_STATUS'], errors='coerce')
+    return info_df.loc[status.isin([98, 99]), 'REQUEST_ID'].drop_duplicates()
+
+def enrich_request_info(rule_df: pd.DataFrame, info_df: pd.DataFrame, auto_extension_id=None) -> pd.DataFrame:
+    """
+    문자열로 정리된 규칙/신청정보 DataFrame을 매칭하여 신청정보 컬럼을 채우고,
+    자동연장 신청번호에 해당하는 규칙의 REQUEST_STATUS를 '99'로 표시합니다.
+    """
+    # 종료일이 같은 신청은 파일 순서를 유지해야 미리 필터링한 신청정보와 결과가 같습니다.
+    info_df = info_df.sort_values(by='REQUEST_END_DATE', ascending=False, kind='stable')
+    with metrics.stage('enrich', rows=len(rule_df)):
+        apply_request_info(rule_df, info_df)
+    rule_df.replace({'nan': None}, inplace=True)
+
+    if auto_extension_id is not None:
+        rule_df.loc[rule_df['REQUEST_ID'].isin(auto_extension_id), 'REQUEST_STATUS'] = '99'
+    return rule_df
+
 def add_request_info():
     def read_and_process_excel(file):
         """ Excel 파일 읽기 및 초기 처리 """
-        df = pd.read_excel(file)
-        df.replace({'nan': None}, inplace=True)
-        return df.astype(str)
-    
-    def match_and_update_df(rule_df, info_df):
-        """ 조건에 따라 DataFrame의 값을 매칭 및 업데이트 """
-        total = len(rule_df)
-        for idx, row in rule_df.iterrows():
-            print(f"\rProgress: {idx +1}/{total}", end='', flush=True)
-            if row['Request Type'] == 'GROUP':
-                matched_row = info_df[
-                    ((info_df['REQUEST_ID'] == row['Request ID']) & (info_df['MIS_ID'] == row['MIS ID'])) |
-                    ((info_df['REQUEST_ID'] == row['Request ID']) & (info_df['REQUEST_END_DATE'] == row['End Date']) & (info_df['WRITE_PERSON_ID'] == row['Request User'])) |
-                    ((info_df['REQUEST_ID'] == row['Request ID']) & (info_df['REQUEST_END_DATE'] == row['End Date']) & (info_df['REQUESTER_ID'] == row['Request User']))
-                ]
-            else:
-                matched_row = info_df[info_df['REQUEST_ID'] == row['Request ID']]
-            
-            if not matched_row.empty:
-                for col in matched_row.columns:
-                    if col in ['REQUEST_START_DATE', 'REQUEST_END_DATE', 'Start Date', 'End Date']:
-                        rule_df.at[idx, col] = pd.to_datetime(matched_row[col].values[0], errors='coerce')
-                    else:
-                        rule_df.at[idx, col] = matched_row[col].values[0]
-            elif row['Request Type'] != 'nan' and row['Request Type'] != 'Unknown':
-                rule_df.at[idx, 'REQUEST_ID'] = row['Request ID']
-                rule_df.at[idx, 'REQUEST_START_DATE'] = row['Start Date']
-                rule_df.at[idx, 'REQUEST_END_DATE'] = row['End Date']
-                rule_df.at[idx, 'REQUESTER_ID'] = row['Request User']
-                rule_df.at[idx, 'REQUESTER_EMAIL'] = row['Request User'] + '@gmail.com'
+        return to_text_frame(frame_io.read_frame(file))
 
     print('select policy file: ')
     rule_file = select_xlsx_files()
@@ -278,73 +400,25 @@ def add_request_info():
         return False
     
     rule_df = read_and_process_excel(rule_file)
-    info_df = read_and_process_excel(info_file)
-    info_df = info.sort_values(by='REQUEST_END_DATE', ascending=False)
+    with metrics.stage('read_info') as record:
+        info_df = read_request_info(info_file, rule_df['Request ID'].dropna().unique())
+        record.rows = len(info_df)
     auto_extension_id = find_auto_extension_id()
-    match_and_update_df(rule_df, info_df)
-    rule_df.replace({'nan': None}, inplace=True)
-
-    rule_df.loc[rule_df['REQUEST_ID'].isin(auto_extension_id), 'REQUEST_STATUS'] = '99'
+    enrich_request_info(rule_df, info_df, auto_extension_id)
 
-    rule_df.to_excel(update_version(rule_file), index=False)
+    frame_io.write_frame(rule_df, update_version(rule_file))
 
-# 4. exception pa
-def paloalto_exception():
-    print("seelct policy file: ")
-    rule_file = select_xlsx_files()
-    df = pd.read_excel(rule_file)
-
-    current_date = datetime.now()
-    three_months_ago = current_date - timedelta(days=90)
-
-    df["예외"] = ''
-
-    # 1. except list와 request id 일치 시 예외 신청정책으로 표시
-    df['REQUEST_ID'] = df['REQUEST_ID'].fillna('')
-    for id in except_list:
-        df.loc[df['REQUEST_ID'].str.startswith(id, na=False), '예외'] = '예외신청정책'
-    
-    # 2.
-    df.loc[df['REQUEST_STATUS'] == 99, '예외'] = '자동연장정책'
-
-    # 3.
-    df['날짜'] = df['Rule Name'].str.extract(r'(\d{8})', expand=False)
-    df['날짜'] = pd.to_datetime(df['날짜'], format='%Y%m%d', errors='coerce')
-    df.loc[(df['날짜'] >= three_months_ago) & (df['날짜'] <= current_date), '예외'] = '신규정책'
-
-    # 4.
-    deny_std_rule_index = df[df['Rule Nam'] == 'deny_rule'].index[0]
-    df.log[df.index < deny_std_rule_index, '예외'] = '인프라정책'
-
-    # 5.
-    df.loc[df['Rule Name'].str.startswith(('sample_', 'test_')), '예외'] = 'test_group_정책'
-
-    # 6.
-    df.loc[df['Enable'] == 'N', '예외'] = '비활성화정책'
-
-    # 7.
-    df.loc[(df['Rule Name'].str.endswith('_Rule')) & (df['Enable'] == 'N'), '예외'] = '기준정책'
-
-    # 8.
-    df.log[df['Action'] == 'deny', '예외'] = '차단정책'
-
-    df['예외'].fillna('', inplace=True)
+def arrange_exception_columns(df: pd.DataFrame, current_date: datetime) -> pd.DataFrame:
+    """
+    예외 처리 결과에 만료여부/미사용여부 컬럼을 추가하고 검토용 컬럼 순서로 정리합니다.
+    """
+    df['예외'] = df['예외'].fillna('')
 
     cols = list(df.columns)
     cols = ['예외'] + [col for col in cols if col != '예외']
     df = df[cols]
 
-    def check_date(row):
-        try:
-            end_date = pd.to_datetime(row['REQUEST_END_DATE'])
-            return '미만료' if end_date > current_date else '만료'
-        except:
-            return '만료'
-    
-
-    df['만료여부'] = df.apply(check_date, axis=1)
-
-    df.drop(columns=['날짜'], inplace=True)
+    df['만료여부'] = exception_engine.expiry_status(df['REQUEST_END_DATE'], current_date)
 
     df.rename(columns={'Request Type': '신청이력'}, inplace=True)
 
@@ -358,86 +432,137 @@ def paloalto_exception():
     df = df[cols]
 
     cols.insert(cols.index('만료여부') + 1, '미사용여부')
+    df = df.reindex(columns=cols)
     df['미사용여부'] = ''
+    return df
 
-    df.to_excel(update_version(rule_file, True), index=False, engine='openpyxl')
-
-# 5. exception secui
-def secui_exception():
-    print("seelct policy file: ")
-    rule_file = select_xlsx_files()
-    df = pd.read_excel(rule_file)
-
-    current_date = datetime.now()
-    three_months_ago = current_date - timedelta(days=90)
-
-    df["예외"] = ''
-
-    # 1. except list와 request id 일치 시 예외 신청정책으로 표시
-    df['Request ID'].fillna('-', inplace=True)
+# 4. exception pa
+# 예외 규칙 (exception_engine 형식, 앞의 규칙이 우선)
+PALOALTO_EXCEPTION_RULES = [
+    {'label': '차단정책', 'column': 'Action', 'equals': 'deny'},
+    {'label': '기준정책', 'all': [{'column': 'Rule Name', 'suffixes': ['_Rule']}, {'column': 'Enable', 'equals': 'N'}]},
+    {'label': '비활성화정책', 'column': 'Enable', 'equals': 'N'},
+    {'label': 'test_group_정책', 'column': 'Rule Name', 'prefixes': ['sample_', 'test_']},
+    {'label': '인프라정책', 'before': {'column': 'Rule Name', 'equals': 'deny_rule'}},
+    {'label': '신규정책', 'column': 'Rule Name', 'date_pattern': r'(\d{8})', 'date_format': '%Y%m%d', 'within_days': 90},
+    {'label': '자동연장정책', 'column': 'REQUEST_STATUS', 'numeric_equals': 99},
+    {'label': '예외신청정책', 'column': 'REQUEST_ID', 'prefixes': except_list},
+]
 
-    for id in except_list:
-        df.loc[df['Request ID'].str.startswith(id), '예외'] = '예외신청정책'
-    
-    # 2.
-    df.loc[df['REQUEST_STATUS'] == 99, '예외'] = '자동연장정책'
+def paloalto_exception_frame(df: pd.DataFrame, current_date: datetime = None, rules: list = None) -> pd.DataFrame:
+    current_date = current_date or datetime.now()
 
-    # 4.
-    deny_std_rule_index = df[df['Description'].str.contains('deny_rule') == True].index[0]
-    df.log[df.index < deny_std_rule_index, '예외'] = '인프라정책'
+    df['REQUEST_ID'] = df['REQUEST_ID'].fillna('')
+    df['예외'] = exception_engine.tag_exceptions(df, rules or PALOALTO_EXCEPTION_RULES, current_date)
 
-    # 5.
-    df.log[df['Description'].str.contains(('sample_', 'test_')) ==True, '예외'] = 'test_group_정책'
+    return arrange_exception_columns(df, current_date)
 
-    # 6.
-    df.loc[df['Enable'] == 'N', '예외'] = '비활성화정책'
+def paloalto_exception():
+    print("seelct policy file: ")
+    rule_file = select_xlsx_files()
+    df = paloalto_exception_frame(frame_io.read_frame(rule_file))
 
-    # 7.
-    df.loc[(df['Description'].str.contains('기준룰')) & (df['Enable'] == 'N'), '예외'] = '기준정책'
+    frame_io.write_frame(df, update_version(rule_file, True))
 
-    # 8.
-    df.log[df['Action'] == 'deny', '예외'] = '차단정책'
+# 5. exception secui
+SECUI_EXCEPTION_RULES = [
+    {'label': '차단정책', 'column': 'Action', 'equals': 'deny'},
+    {'label': '기준정책', 'all': [{'column': 'Description', 'pattern': '기준룰'}, {'column': 'Enable', 'equals': 'N'}]},
+    {'label': '비활성화정책', 'column': 'Enable', 'equals': 'N'},
+    {'label': 'test_group_정책', 'column': 'Description', 'pattern': 'sample_|test_'},
+    {'label': '인프라정책', 'before': {'column': 'Description', 'pattern': 'deny_rule'}},
+    {'label': '자동연장정책', 'column': 'REQUEST_STATUS', 'numeric_equals': 99},
+    {'label': '예외신청정책', 'column': 'Request ID', 'prefixes': except_list},
+]
 
-    df['예외'].fillna('', inplace=True)
+def secui_exception_frame(df: pd.DataFrame, current_date: datetime = None, rules: list = None) -> pd.DataFrame:
+    current_date = current_date or datetime.now()
 
-    cols = list(df.columns)
-    cols = ['예외'] + [col for col in cols if col != '예외']
-    df = df[cols]
+    df['Request ID'] = df['Request ID'].fillna('-')
+    df['예외'] = exception_engine.tag_exceptions(df, rules or SECUI_EXCEPTION_RULES, current_date)
 
-    def check_date(row):
-        try:
-            end_date = pd.to_datetime(row['REQUEST_END_DATE'])
-            return '미만료' if end_date > current_date else '만료'
-        except:
-            return '만료'
-    
+    return arrange_exception_columns(df, current_date)
 
-    df['만료여부'] = df.apply(check_date, axis=1)
+def secui_exception():
+    print("seelct policy file: ")
+    rule_file = select_xlsx_files()
+    df = secui_exception_frame(frame_io.read_frame(rule_file))
 
-    df.rename(columns={'Request Type': '신청이력'}, inplace=True)
+    frame_io.write_frame(df, update_version(rule_file, True))
 
-    df.drop(columns=['Request ID', 'Ruleset ID', 'MIS ID', 'Request User', 'Start Date', 'End Date'], inplace=True)
+EXCEPTION_HANDLERS = {
+    'paloalto': paloalto_exception_frame,
+    'secui': secui_exception_frame,
+}
 
-    cols = list(df.columns)
-    cols.insert(cols.index('예외') + 1, cols.pop(cols.index('만료여부')))
-    df = df[cols]
+def find_auto_extension_id():
+    print('가공된 신청정보 파일을 선택')
+    selected_file = select_xlsx_files()
+    df = frame_io.read_frame(selected_file)
+
+    return auto_extension_ids(df)
+
+# 6. organize redundant policies
+# 이 신청 유형이 하나라도 포함된 중복정책 그룹은 정리 대상에서 제외합니다.
+EXCLUDED_REQUEST_TYPES = ["PAM", "SERVER", "Unknown"]
+
+def redundant_group_summary(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    늦은종료일/자동연장이 표시된 중복정책 DataFrame의 그룹(No)별 집계를 한 번의 groupby로 계산합니다.
+    """
+    is_group = df['Request Type'] == 'GROUP'
+    delete = ~df['늦은종료일']
+    summary = df.assign(
+        _upper_latest=(df['Type'] == 'Upper') & df['늦은종료일'],
+        _delete=delete,
+        _not_group=~is_group,
+        _group_extension_delete=is_group & df['자동연장'] & delete,
+        _excluded_type=df['Request Type'].isin(EXCLUDED_REQUEST_TYPES),
+    ).groupby('No').agg(
+        requester_count=('Request User', 'nunique'),
+        upper_latest=('_upper_latest', 'any'),
+        auto_extension=('자동연장', 'any'),
+        any_delete=('_delete', 'any'),
+        all_delete=('_delete', 'all'),
+        any_not_group=('_not_group', 'any'),
+        group_extension_delete=('_group_extension_delete', 'any'),
+        excluded_type=('_excluded_type', 'any'),
+    )
+    # GROUP 신청 행의 서로 다른 신청번호 수 (빈 값도 하나로 셉니다)
+    summary['group_request_ids'] = df[is_group].groupby('No')['Request ID'].nunique(dropna=False).reindex(summary.index, fill_value=0)
+    return summary
+
+def classify_redundant_groups(df: pd.DataFrame, auto_extension_id) -> pd.DataFrame:
+    """
+    그룹별 집계를 행에 다시 붙여 자동연장, 늦은종료일, 신청자검증, 날짜검증, 작업구분, 공지여부, 미사용예외 컬럼을 채우고
+    정리 대상에서 제외할 그룹을 뺀 DataFrame을 반환합니다.
+
+    제외 그룹: 자동연장된 GROUP 신청이 삭제 대상이면서 GROUP 신청번호가 2개 이상인 그룹,
+    GROUP 외 신청이 있고 삭제 행과 자동연장이 함께 있는 그룹, 유지 행이 없는 그룹, EXCLUDED_REQUEST_TYPES가 포함된 그룹
+    """
+    df['자동연장'] = df['Request ID'].isin(auto_extension_id)
 
-    cols.insert(cols.index('예외') + 1, cols.pop(cols.index('신청이력')))
-    df = df[cols]
+    # 그룹에서 종료일이 가장 늦은 첫 행만 유지합니다.
+    latest = df.groupby('No')['End Date'].transform('max')
+    df['늦은종료일'] = (df['End Date'] == latest) & ~df.duplicated(['No', 'End Date'])
 
-    cols.insert(cols.index('만료여부') + 1, '미사용여부')
-    df = df.reindex(columns=cols)
-    df['미사용여부'] = ''
+    summary = redundant_group_summary(df)
+    joined = summary.reindex(df['No'].to_numpy())
 
-    df.to_excel(update_version(rule_file, True), index=False, engine='openpyxl')
+    df['신청자검증'] = (joined['requester_count'] == 1).to_numpy()
+    df['날짜검증'] = joined['upper_latest'].fillna(False).to_numpy(dtype=bool)
 
-def find_auto_extension_id():
-    print('가공된 신청정보 파일을 선택')
-    selected_file = select_xlsx_files()
-    df = pd.read_excel(selected_file)
-    filtered_df = df[df['REQEUST_STATUS'].isin([98, 99])]['REQUEST_ID'].drop_duplicates()
+    df['작업구분'] = np.where(df['늦은종료일'], '유지', '삭제')
+    df['공지여부'] = ~df['신청자검증']
+    df['미사용예외'] = ~df['날짜검증'] & df['늦은종료일']
 
-    return filtered_df
+    excluded = (
+        (summary['auto_extension'] & (summary['group_request_ids'] >= 2) & summary['group_extension_delete']) |
+        (summary['any_not_group'] & summary['any_delete'] & summary['auto_extension']) |
+        summary['all_delete'] |
+        summary['excluded_type']
+    )
+    return df[~df['No'].isin(summary.index[excluded])]
 
 def organize_redundant_file():
     expected_columns = ['No', 'Type', 'Seq', 'Rule Name', 'Enable', 'Action', 'Source', 'User', 'Destination', 'Service', 'Application', 'Security Profile', 'Category', 'Description', 'Request Type', 'Request ID', 'Ruleset ID', 'MIS ID', 'Request User', 'Start Date', 'End Date']
@@ -446,7 +571,7 @@ def organize_redundant_file():
     try:
         print('중복정책 파일을 선택')
         selected_file = select_xlsx_files()
-        df = pd.read_excel(selected_file)
+        df = frame_io.read_frame(selected_file)
 
         auto_extension_id = find_auto_extension_id()
 
@@ -462,52 +587,7 @@ def organize_redundant_file():
         print(e)
         exit()
     
-    df['자동연장'] = df['Request ID'].isin(auto_extension_id)
-
-    df['늦은종료일'] = df.groupby('No')['End Date'].transform(lambda x: (x == x.max()) & (~x.duplicated(keep='first')))
-
-    df['신청자검증'] = df.groupby('No')['Request User'].transform(lambda x: x.nunique() == 1)
-
-    target_rule_true = df[(df['Type'] == 'Upper') & (df['늦은종료일'] == True)]['No'].unique()
-
-    df['날짜검증'] = False
-
-    df.loc[df['No'].isin(target_rule_true), '날짜검증'] = True
-
-    df['작업구분'] = '유지'
-    df.loc[df['늦은종료일'] == False, '작업구분'] = '삭제'
-
-    df['공지여부'] = False
-    df.loc[df['신청자검증'] == False, '공지여부'] = True
-
-    df['미사용예외'] = False
-    df.loc[(df['날짜검증'] == False) & (df['늦은종료일'] == True), '미사용예외'] = True
-
-    extensioned_df = df.groupby('No').filter(lambda x: x['자동연장'].any())
-    extensioned_group = extensioned_df[extensioned_df['Request Type'] == 'GROUP']
-    exception_target = extensioned_group.groupby('No').filter(lambda x: len(x['Request ID'].unique()) >=2 )
-    exception_id = exception_target[(exception_target['자동연장'] == True) & (exception_target['작업구분'] == '삭제')]['No']
-
-    df = df[~df['No'].isin(exception_id)]
-
-    filtered_no = df.groupby('No').filter(
-        lambda x: (x['Request Type'] != 'GROUP').any() and
-                (x['작업구분'] == '삭제').any() and
-                (x['자동연장'] == True).any()
-    )['No'].unique()
-
-    df = df[~df['No'].isin(filtered_no)]
-
-    filtered_no_2 = df.groupby('No').filter(
-        lambda x: (x['작업구분'] != '유지').all()
-    )['No'].unique()
-
-    df = df[~df['No'].isin(filtered_no_2)]
-
-    target_types = ["PAM", "SERVER", "Unknown"]
-    target_nos = df[df['Request Type'].isin(target_types)]['No'].drop_duplicates()
-    
-    df = df[~df['No'].isin(target_nos)]
+    df = classify_redundant_groups(df, auto_extension_id)
 
     notice_df = df[df['공지여부'] == True]
     delete_df = df[df['공지여부'] == False]
@@ -534,7 +614,7 @@ def add_mis_id():
     file = select_xlsx_files()
     print("select mis id file")
     mis_df = pd.read_csv(select_xlsx_files(".csv"))
-    rule_df = pd.read_excel(file)
+    rule_df = frame_io.read_frame(file)
 
     mis_df_unique = mis_df.drop_duplicates(subset=['ruleset_id'], keep='first')
 
@@ -542,126 +622,96 @@ def add_mis_id():
 
     rule_df['MIS ID'] = rule_df.apply(lambda row: mis_id_map.get(row['Ruleset ID'], row['MIS ID']) if pd.isna(row['MIS ID']) or row['MIS ID'] == '' else row['MIS ID'], axis=1)
 
-    rule_df.to_excel(update_version(file, False), index=False, engine='openpyxl')
+    frame_io.write_frame(rule_df, update_version(file, False))
 
-def notice_file_organization():
-    def expired_used(df, selected_file):
-        filtered_df = df[
-            ((df['예외'].isna()) | (df['예외'] == '신규정책')) &
-            (df['중복여부'].isna()) &
-            (df['신청이력'] != 'Unknown') &
-            (df['만료여부'] == '만료') &
-            (df['미사용여부'] == '사용')
-        ]
-
-        selected_df = filtered_df[COLUMNS]
-        selected_df = selected_df.astype(str)
+def select_notice_columns(filtered_df, columns=COLUMNS):
+    selected_df = filtered_df[columns].astype(str)
 
+    if columns is COLUMNS:
         for date_column in DATE_COLUMNS:
-            selected_df[date_column] = pd.to_datetime(selected_df[date_column]).dt.strftime('%Y-%m-%d')
-        
-        selected_df.rename(TRANSLATED_COLUMNS, inplace=True)
-        selected_df.fillna('', inplace=True)
-        selected_df.replace('nan', '', inplace=True)
+            selected_df[date_column] = exception_engine.to_datetimes(selected_df[date_column]).dt.strftime('%Y-%m-%d')
         
-        type = '만료_사용정책'
-        filename = str(remove_extension(selected_file)) + '_기간만료(공지용).xlsx'
-        selected_df.to_excel(filename, index=False, na_rep='', sheet_name=type)
-        save_to_excel(selected_df, type, filename)
-
-    def expired_unused(df, selected_file):
-        filtered_df = df[
-            ((df['예외'].isna()) | (df['예외'] == '신규정책')) &
-            (df['중복여부'].isna()) &
-            (df['신청이력'] != 'Unknown') &
-            (df['만료여부'] == '만료') &
-            (df['미사용여부'] == '미사용')
-        ]
-
-        selected_df = filtered_df[COLUMNS]
-        selected_df = selected_df.astype(str)
+        selected_df.rename(columns=TRANSLATED_COLUMNS, inplace=True)
+    selected_df.fillna('', inplace=True)
+    selected_df.replace('nan', '', inplace=True)
+    return selected_df
+
+def notice_masks(df: pd.DataFrame) -> dict:
+    """
+    공지 분류별 대상 행 mask를 한 번에 계산합니다. 공통 조건은 한 번씩만 계산하여 재사용합니다.
+    """
+    no_exception = df['예외'].isna()
+    not_duplicated = df['중복여부'].isna()
+    has_history = df['신청이력'] != 'Unknown'
+    expired = df['만료여부'] == '만료'
+    unused = df['미사용여부'] == '미사용'
+
+    new_or_no_exception = (no_exception | (df['예외'] == '신규정책')) & not_duplicated & has_history & expired
+
+    return {
+        '만료_사용정책': new_or_no_exception & (df['미사용여부'] == '사용'),
+        '만료_미사용정책': new_or_no_exception & unused,
+        '미만료_미사용정책': no_exception & not_duplicated & df['신청이력'].isin(['GROUP', 'NORMAL']) & (df['만료여부'] == '미만료') & unused,
+        '이력없음_미사용정책': no_exception & not_duplicated & has_history & expired & unused,
+    }
+
+# (시트명, 파일명 접미사, 로그 이름, 컬럼)
+NOTICE_TARGETS = [
+    ('만료_사용정책', '_기간만료(공지용).xlsx', '기간만료', COLUMNS),
+    ('만료_미사용정책', '_만료_미사용정책(공지용).xlsx', '만료/미사용', COLUMNS),
+    ('미만료_미사용정책', '_장기미사용정책(공지용).xlsx', '장기미사용', COLUMNS),
+    ('이력없음_미사용정책', '_이력없는_미사용정책.xlsx', '이력없는 미사용', COLUMNS_NO_HISTORY),
+]
 
-        for date_column in DATE_COLUMNS:
-            selected_df[date_column] = pd.to_datetime(selected_df[date_column]).dt.strftime('%Y-%m-%d')
-        
-        selected_df.rename(TRANSLATED_COLUMNS, inplace=True)
-        selected_df.fillna('', inplace=True)
-        selected_df.replace('nan', '', inplace=True)
-
-        type = '만료_미사용정책'
-        filename = str(remove_extension(selected_file)) + '_만료_미사용정책(공지용).xlsx'
-        selected_df.to_excel(filename, index=False, na_rep='', sheet_name=type)
-        save_to_excel(selected_df, type, filename)
-
-    def longterm_unused_rules(df, selected_file):
-        filtered_df = df[
-            (df['예외'].isna()) &
-            (df['중복여부'].isna()) &
-            (df['신청이력'].isin(['GROUP', 'NORMAL'])) &
-            (df['만료여부'] == '미만료') &
-            (df['미사용여부'] == '미사용')
-        ]
-
-        selected_df = filtered_df[COLUMNS]
-        selected_df = selected_df.astype(str)
+def write_notice_file(selected_df, type, filename):
+    """
+    공지 파일을 한 번에 저장합니다. 데이터는 2행(헤더)부터 쓰고 1행 대상 정책 수와 헤더 스타일을 같은 통합문서에 적용합니다.
+    """
+    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
+        selected_df.to_excel(writer, index=False, na_rep='', sheet_name=type, startrow=1)
+        style_notice_sheet(writer.sheets[type], type)
+    return filename
+
+def write_notice_files(df, base_name, workers: int = None) -> list:
+    """
+    정리대상 분류별 공지 파일을 {base_name}{접미사}로 저장하고 저장한 파일 목록을 반환합니다.
+    분류 mask는 한 번에 계산하고, 파일은 workers개(기본값: 분류 수) 프로세스에서 동시에 저장합니다.
+    분류 하나가 실패해도 나머지 분류는 계속 진행합니다.
+    """
+    masks = {}
+    try:
+        masks = notice_masks(df)
+    except Exception as e:
+        logging.error(f"공지 분류 실패: {e}")
 
-        for date_column in DATE_COLUMNS:
-            selected_df[date_column] = pd.to_datetime(selected_df[date_column]).dt.strftime('%Y-%m-%d')
-        
-        selected_df.rename(TRANSLATED_COLUMNS, inplace=True)
-        selected_df.fillna('', inplace=True)
-        selected_df.replace('nan', '', inplace=True)
-
-        type = '미만료_미사용정책'
-        filename = str(remove_extension(selected_file)) + '_장기미사용정책(공지용).xlsx'
-        selected_df.to_excel(filename, index=False, na_rep='', sheet_name=type)
-        save_to_excel(selected_df, type, filename)
-
-    def no_history_unused(df, selected_file):
-        filtered_df = df[
-            (df['예외'].isna()) &
-            (df['중복여부'].isna()) &
-            (df['신청이력'] != 'Unknown') &
-            (df['만료여부'] == '만료') &
-            (df['미사용여부'] == '미사용')
-        ]
-
-        selected_df = filtered_df[COLUMNS_NO_HISTORY]
-        selected_df = selected_df.astype(str)
-
-        selected_df.fillna('', inplace=True)
-        selected_df.replace('nan', '', inplace=True)
-
-        type = '이력없음_미사용정책'
-        filename = str(remove_extension(selected_file)) + '_이력없는_미사용정책.xlsx'
-        selected_df.to_excel(filename, index=False, na_rep='', sheet_name=type)
-        save_to_excel(selected_df, type, filename)
+    tasks = []
+    for type, suffix, label, columns in NOTICE_TARGETS:
+        try:
+            tasks.append((label, select_notice_columns(df[masks[type]], columns), type, str(base_name) + suffix))
+        except:
+            logging.error(f"{label} 분류 실패")
+
+    # 프로세스를 띄울 필요가 없으면 현재 프로세스의 스레드 하나에서 순서대로 저장합니다.
+    workers = min(workers or len(tasks), len(tasks))
+    executor_class = ProcessPoolExecutor if workers > 1 else ThreadPoolExecutor
+    written = []
+    with executor_class(max_workers=max(1, workers)) as executor:
+        futures = [(label, executor.submit(write_notice_file, selected_df, type, filename)) for label, selected_df, type, filename in tasks]
+        for label, future in futures:
+            try:
+                written.append(future.result())
+                logging.info(f"{label} 분류 완료")
+            except Exception as e:
+                logging.error(f"{label} 분류 실패: {e}")
+    return written
 
+def notice_file_organization():
     print("분류할 정책파일을 선택하세요.")
     selected_file = select_xlsx_files()
     logging.info("정책 분류 시작")
     try:
-        df = pd.read_excel(selected_file)
-        try:
-            expired_used(df, selected_file)
-            logging.info("기간만료 분류 완료")
-        except:
-            logging.error("기간만료 분류 실패")
-        try:
-            expired_unused(df, selected_file)
-            logging.info("만료/미사용 분류 완료")
-        except:
-            logging.error("만료/미사용 분류 실패")
-        try:
-            longterm_unused_rules(df, selected_file)
-            logging.info("장기미사용 분류 완료")
-        except:
-            logging.error("장기미사용 분류 실패")
-        try:
-            no_history_unused(df, selected_file)
-            logging.info("이력없는 미사용 분류 완료")
-        except:
-            logging.error("이력없는 미사용 분류 실패")
+        df = frame_io.read_frame(selected_file)
+        write_notice_files(df, remove_extension(selected_file))
         logging.info("정책 분류 완료")
     except:
         logging.error("정책 분류 실패")
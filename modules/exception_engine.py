@@ -0,0 +1,117 @@
+"""
+선언적 예외 규칙 엔진
+
+예외 규칙은 dict(또는 같은 구조의 JSON)로 정의하며, 모든 조건을 DataFrame 전체에 대한 벡터 연산으로
+한 번씩만 계산한 뒤 우선순위에 따라 라벨 하나를 고릅니다. 목록의 앞에 있는 규칙이 우선합니다.
+
+규칙 예시:
+    {'label': '예외신청정책', 'column': 'REQUEST_ID', 'prefixes': ['1', '2']}
+    {'label': '신규정책', 'column': 'Rule Name', 'date_pattern': r'(\\d{8})', 'date_format': '%Y%m%d', 'within_days': 90}
+    {'label': '인프라정책', 'before': {'column': 'Rule Name', 'equals': 'deny_rule'}}
+    {'label': '기준정책', 'all': [{'column': 'Rule Name', 'suffixes': ['_Rule']}, {'column': 'Enable', 'equals': 'N'}]}
+
+조건 키:
+    column + prefixes / suffixes / pattern(정규식 포함) / equals / isin / numeric_equals / date_pattern
+    before / after: 조건을 처음 만족하는 행보다 위/아래에 있는 행 (위치 기준, 해당 행이 없으면 없음)
+    all / any: 하위 조건의 AND / OR
+"""
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+CONDITION_KEYS = ['prefixes', 'suffixes', 'pattern', 'equals', 'isin', 'numeric_equals', 'date_pattern']
+
+
+def load_rules(path: str) -> list:
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def to_datetimes(values: pd.Series, format: str = None) -> pd.Series:
+    """
+    날짜 값을 고유 값 단위로 한 번만 변환합니다. 변환할 수 없는 값은 NaT입니다.
+    """
+    codes, uniques = pd.factorize(values)
+    if format:
+        converted = pd.to_datetime(pd.Series(uniques, dtype=object), format=format, errors='coerce')
+    else:
+        converted = pd.Series([pd.to_datetime(value, errors='coerce') for value in uniques], dtype=object)
+        converted = pd.to_datetime(converted, errors='coerce')
+    # 결측값(code -1)은 마지막에 덧붙인 NaT를 가리킵니다.
+    converted = np.append(converted.to_numpy(dtype='datetime64[ns]'), np.datetime64('NaT', 'ns'))
+    return pd.Series(converted[codes], index=values.index)
+
+
+def expiry_status(end_dates: pd.Series, current_date: datetime) -> np.ndarray:
+    """
+    종료일이 current_date 이후이면 '미만료', 그 외(지난 날짜, 빈 값, 날짜가 아닌 값)는 '만료'입니다.
+    """
+    return np.where(to_datetimes(end_dates) > current_date, '미만료', '만료')
+
+
+def text(df: pd.DataFrame, column: str) -> pd.Series:
+    values = df[column]
+    return values.where(values.isna(), values.astype(str))
+
+
+def first_position(mask: np.ndarray):
+    positions = np.flatnonzero(mask)
+    return positions[0] if len(positions) else None
+
+
+def condition_mask(df: pd.DataFrame, condition: dict, current_date: datetime) -> np.ndarray:
+    """
+    조건 하나를 행 단위 bool 배열로 계산합니다.
+    """
+    if 'all' in condition:
+        masks = [condition_mask(df, sub, current_date) for sub in condition['all']]
+        return np.logical_and.reduce(masks) if masks else np.ones(len(df), dtype=bool)
+    if 'any' in condition:
+        masks = [condition_mask(df, sub, current_date) for sub in condition['any']]
+        return np.logical_or.reduce(masks) if masks else np.zeros(len(df), dtype=bool)
+    if 'before' in condition or 'after' in condition:
+        marker = condition.get('before', condition.get('after'))
+        position = first_position(condition_mask(df, marker, current_date))
+        positions = np.arange(len(df))
+        if position is None:
+            return np.zeros(len(df), dtype=bool)
+        return positions < position if 'before' in condition else positions > position
+
+    column = condition['column']
+    if column not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    values = df[column]
+
+    if 'prefixes' in condition:
+        mask = text(df, column).str.startswith(tuple(str(prefix) for prefix in condition['prefixes']))
+    elif 'suffixes' in condition:
+        mask = text(df, column).str.endswith(tuple(str(suffix) for suffix in condition['suffixes']))
+    elif 'pattern' in condition:
+        mask = text(df, column).str.contains(condition['pattern'], regex=True)
+    elif 'equals' in condition:
+        mask = values == condition['equals']
+    elif 'isin' in condition:
+        mask = values.isin(condition['isin'])
+    elif 'numeric_equals' in condition:
+        mask = pd.to_numeric(values, errors='coerce') == condition['numeric_equals']
+    elif 'date_pattern' in condition:
+        dates = text(df, column).str.extract(condition['date_pattern'], expand=False)
+        dates = to_datetimes(dates, condition.get('date_format'))
+        within = current_date - timedelta(days=condition.get('within_days', 90))
+        mask = (dates >= within) & (dates <= current_date)
+    else:
+        raise ValueError(f"Exception rule needs one of {', '.join(CONDITION_KEYS)}, all, any, before or after: {condition}")
+    return mask.fillna(False).to_numpy(dtype=bool)
+
+
+def tag_exceptions(df: pd.DataFrame, rules: list, current_date: datetime = None, default: str = '') -> np.ndarray:
+    """
+    규칙 목록을 한 번에 평가하여 행별 예외 라벨을 반환합니다. 여러 규칙을 만족하면 앞의 규칙이 우선합니다.
+    """
+    current_date = current_date or datetime.now()
+    if not rules:
+        return np.full(len(df), default, dtype=object)
+    masks = [condition_mask(df, rule, current_date) for rule in rules]
+    return np.select(masks, [rule['label'] for rule in rules], default=default).astype(object)
@@ -0,0 +1,113 @@
+import os
+import logging
+import pandas as pd
+from openpyxl.styles import Font, PatternFill
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+FLEET_COLUMNS = [
+    'Device', 'Vendor', 'Vsys', 'Seq', 'Rule Name', 'Enable', 'Action',
+    'Source', 'User', 'Destination', 'Service', 'Application', 'Description'
+]
+KEY_COLUMNS = ['Action', 'Source', 'User', 'Destination', 'Service', 'Application']
+
+
+def normalize_members(series: pd.Series) -> pd.Series:
+    """
+    콤마 구분 멤버를 정렬하고 'Any' 표기를 'any'로 맞춥니다. 같은 값은 한 번만 계산합니다.
+    """
+    def normalize(value):
+        if pd.isna(value):
+            return 'any'
+        members = sorted({'any' if m.strip().lower() == 'any' else m.strip() for m in str(value).split(',') if m.strip()})
+        return ','.join(members) if members else 'any'
+
+    mapping = {value: normalize(value) for value in pd.unique(series)}
+    return series.map(mapping)
+
+
+def normalize_rule_table(df: pd.DataFrame, device: str, vendor: str) -> pd.DataFrame:
+    """
+    paloalto/mf2/ngf 익스포터의 규칙 DataFrame을 장비 공통 스키마(FLEET_COLUMNS)로 변환합니다.
+    """
+    table = pd.DataFrame(index=df.index)
+    for column in FLEET_COLUMNS:
+        table[column] = df[column] if column in df.columns else ''
+    table['Device'] = device
+    table['Vendor'] = vendor
+    table['Enable'] = table['Enable'].astype(str).str.upper()
+    table['Action'] = table['Action'].astype(str).str.lower()
+    if vendor == 'paloalto':
+        table['Service'] = table['Service'].str.replace('_', '-')
+    for column in KEY_COLUMNS[1:]:
+        table[column] = normalize_members(table[column])
+    table['Key'] = pd.util.hash_pandas_object(table[KEY_COLUMNS], index=False).to_numpy()
+    return table.reset_index(drop=True)
+
+
+class FleetIndex:
+    """
+    장비별 규칙의 정규화 키 해시 색인입니다. 파일로 저장해 두고 장비 하나를 추가/갱신할 때는
+    해당 장비의 규칙만 교체하므로 전체 장비를 다시 읽지 않습니다.
+    """
+
+    def __init__(self, table: pd.DataFrame = None):
+        self.table = table if table is not None else pd.DataFrame(columns=FLEET_COLUMNS + ['Key'])
+
+    @classmethod
+    def load(cls, path: str):
+        if path and os.path.exists(path):
+            logging.info(f"Loading fleet index from {path}")
+            return cls(pd.read_pickle(path))
+        return cls()
+
+    def save(self, path: str):
+        self.table.to_pickle(path)
+        logging.info(f"Fleet index has been saved to {path}")
+
+    def devices(self) -> list:
+        return sorted(self.table['Device'].unique())
+
+    def add_device(self, device: str, vendor: str, rule_df: pd.DataFrame):
+        """
+        장비의 규칙을 색인에 추가합니다. 이미 있는 장비면 기존 규칙을 교체합니다.
+        """
+        rules = normalize_rule_table(rule_df, device, vendor)
+        rules = rules[rules['Enable'] == 'Y']
+        remaining = self.table[self.table['Device'] != device]
+        self.table = pd.concat([remaining, rules], ignore_index=True) if not remaining.empty else rules.reset_index(drop=True)
+        logging.info(f"{device}: {len(rules)} rules indexed ({len(self.devices())} devices)")
+
+    def remove_device(self, device: str):
+        self.table = self.table[self.table['Device'] != device].reset_index(drop=True)
+
+    def find_duplicates(self) -> pd.DataFrame:
+        """
+        2대 이상의 장비에 같은 정규화 키로 존재하는 규칙을 No 그룹으로 묶어 반환합니다.
+        """
+        device_counts = self.table.groupby('Key')['Device'].nunique()
+        keys = device_counts[device_counts >= 2].index
+        duplicates = self.table[self.table['Key'].isin(keys)].copy()
+        if duplicates.empty:
+            return pd.DataFrame(columns=['No', 'Devices'] + FLEET_COLUMNS)
+
+        duplicates['No'] = pd.factorize(duplicates['Key'], sort=True)[0] + 1
+        duplicates['Devices'] = duplicates['Key'].map(device_counts)
+        duplicates = duplicates.sort_values(['No', 'Device', 'Vsys', 'Seq'], kind='stable')
+        return duplicates[['No', 'Devices'] + FLEET_COLUMNS].reset_index(drop=True)
+
+
+def save_fleet_report(duplicates: pd.DataFrame, file_name: str):
+    header_fill = PatternFill(start_color="00b0f0", end_color="00b0f0", fill_type="solid")
+    header_font = Font(bold=True, color='FFFFFF')
+    summary = duplicates.groupby('Device').size().rename('Duplicated Rules').reset_index() if not duplicates.empty else pd.DataFrame(columns=['Device', 'Duplicated Rules'])
+
+    with pd.ExcelWriter(file_name, engine='openpyxl') as writer:
+        summary.to_excel(writer, index=False, sheet_name='Summary')
+        duplicates.to_excel(writer, index=False, sheet_name='Analysis')
+        for sheet_name in ['Summary', 'Analysis']:
+            for cell in writer.sheets[sheet_name][1]:
+                cell.fill = header_fill
+                cell.font = header_font
+
+    logging.info(f"Results have been saved to {file_name}")
@@ -0,0 +1,246 @@
+import os
+import json
+import logging
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+try:
+    import pyarrow
+except ImportError:  # Parquet/Feather는 pyarrow가 있을 때만 사용할 수 있습니다.
+    pyarrow = None
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# 파일 형식 → 확장자 (csv.gz처럼 점이 두 개인 확장자가 있으므로 긴 확장자부터 비교합니다)
+FORMATS = {
+    'xlsx': '.xlsx',
+    'parquet': '.parquet',
+    'feather': '.feather',
+    'csv.gz': '.csv.gz',
+    'csv': '.csv',
+    'pkl': '.pkl',
+}
+COLUMNAR_FORMATS = ['parquet', 'feather']
+EXPORT_FORMATS = ['xlsx', 'parquet', 'feather', 'csv.gz']
+INPUT_EXTENSIONS = tuple(FORMATS.values())
+SCHEMA_SUFFIX = '.dtypes.json'
+
+# 규칙/객체/히트카운트 테이블의 컬럼 dtype. CSV처럼 dtype 정보가 없는 파일을 읽을 때와
+# 컬럼형 파일로 저장하기 전에 적용합니다. 그 밖의 컬럼은 값에 따라 문자열 또는 숫자로 둡니다.
+RULE_SCHEMA = {
+    'Seq': 'Int64',
+    'Hit Count': 'Int64',
+    'Unused Days': 'Int64',
+    'Rule Name': 'str',
+    'Enable': 'str',
+    'Action': 'str',
+    'Source': 'str',
+    'User': 'str',
+    'Destination': 'str',
+    'Service': 'str',
+    'Application': 'str',
+    'Description': 'str',
+    'Request ID': 'str',
+    'REQUEST_ID': 'str',
+    'REQUEST_STATUS': 'str',
+}
+
+
+def file_format(path: str) -> str:
+    """
+    파일 이름의 확장자로 형식을 판단합니다. 알 수 없는 확장자는 Excel로 봅니다.
+    """
+    lowered = path.lower()
+    for name, extension in sorted(FORMATS.items(), key=lambda item: -len(item[1])):
+        if lowered.endswith(extension):
+            return name
+    return 'xlsx'
+
+
+def split_extension(path: str):
+    """
+    ('name', '.csv.gz')처럼 형식 확장자를 분리합니다.
+    """
+    extension = FORMATS[file_format(path)]
+    if path.lower().endswith(extension):
+        return path[:-len(extension)], path[-len(extension):]
+    return os.path.splitext(path)
+
+
+def replace_extension(path: str, format: str) -> str:
+    return split_extension(path)[0] + FORMATS[format]
+
+
+def require_pyarrow(format: str):
+    if format in COLUMNAR_FORMATS and pyarrow is None:
+        raise ImportError(f"'{format}' format requires pyarrow (pip install pyarrow)")
+
+
+def apply_schema(df: pd.DataFrame, schema: dict = None) -> pd.DataFrame:
+    """
+    schema(기본값: RULE_SCHEMA)에 있는 컬럼을 해당 dtype으로 변환합니다. 변환할 수 없는 컬럼은 그대로 둡니다.
+    """
+    schema = RULE_SCHEMA if schema is None else schema
+    for column, dtype in schema.items():
+        if column not in df.columns or str(df[column].dtype) == dtype:
+            continue
+        try:
+            if dtype.startswith('datetime'):
+                df[column] = pd.to_datetime(df[column], errors='coerce')
+            elif dtype in ('Int64', 'Float64'):
+                df[column] = pd.to_numeric(df[column], errors='raise').astype(dtype)
+            elif dtype == 'str':
+                df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+            else:
+                df[column] = df[column].astype(dtype)
+        except (ValueError, TypeError):
+            logging.debug(f"Column '{column}' kept as {df[column].dtype} (not {dtype})")
+    return df
+
+
+def columnar_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Parquet/Feather로 저장할 수 있도록 정리한 사본을 반환합니다.
+    스키마 dtype을 적용하고, 문자열과 숫자가 섞인 object 컬럼은 문자열로 통일합니다.
+    """
+    df = apply_schema(df.reset_index(drop=True).copy())
+    for column in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[column], skipna=True) not in ('string', 'empty'):
+            df[column] = df[column].where(df[column].isna(), df[column].astype(str))
+    return df
+
+
+def write_frame(df: pd.DataFrame, path: str, sheet_name: str = 'Sheet1') -> str:
+    """
+    확장자에 맞는 형식으로 DataFrame을 저장합니다. CSV는 dtype 정보를 {path}.dtypes.json에 함께 저장합니다.
+    """
+    format = file_format(path)
+    require_pyarrow(format)
+    if format == 'parquet':
+        columnar_frame(df).to_parquet(path, index=False)
+    elif format == 'feather':
+        columnar_frame(df).to_feather(path)
+    elif format in ('csv', 'csv.gz'):
+        df.to_csv(path, index=False)
+        with open(path + SCHEMA_SUFFIX, 'w', encoding='utf-8') as file:
+            json.dump({column: str(dtype) for column, dtype in df.dtypes.items()}, file, ensure_ascii=False, indent=2)
+    elif format == 'pkl':
+        df.to_pickle(path)
+    else:
+        df.to_excel(path, index=False, sheet_name=sheet_name, engine='openpyxl')
+    return path
+
+
+def read_schema(path: str) -> dict:
+    schema_file = path + SCHEMA_SUFFIX
+    if os.path.exists(schema_file):
+        with open(schema_file, encoding='utf-8') as file:
+            return json.load(file)
+    return RULE_SCHEMA
+
+
+def read_frame(path: str, columns: list = None) -> pd.DataFrame:
+    """
+    확장자에 맞는 형식으로 DataFrame을 읽습니다. columns를 지정하면 해당 컬럼만 읽습니다.
+    CSV는 저장 시 남긴 dtype 정보(없으면 RULE_SCHEMA)를 적용합니다.
+    """
+    format = file_format(path)
+    require_pyarrow(format)
+    if format == 'parquet':
+        return pd.read_parquet(path, columns=columns)
+    if format == 'feather':
+        return pd.read_feather(path, columns=columns)
+    if format in ('csv', 'csv.gz'):
+        schema = read_schema(path)
+        text_columns = {column: str for column, dtype in schema.items() if dtype in ('str', 'object', 'string')}
+        df = pd.read_csv(path, usecols=columns, dtype=text_columns)
+        return apply_schema(df, {column: dtype for column, dtype in schema.items() if column not in text_columns})
+    if format == 'pkl':
+        df = pd.read_pickle(path)
+        return df[columns] if columns else df
+    return pd.read_excel(path, usecols=columns)
+
+
+def text_value(value):
+    """
+    Excel 셀 값을 문자열로 변환합니다. 정수로 저장된 실수는 소수점 없이, 시간이 없는 날짜는 YYYY-MM-DD로 씁니다.
+    빈 셀은 read_excel(dtype=str)과 같이 NaN입니다.
+    """
+    if value is None:
+        return np.nan
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d') if value.time() == datetime.min.time() else value.strftime('%Y-%m-%d %H:%M:%S')
+    return str(value)
+
+
+def read_excel_stream(path: str, columns: list = None, dtypes: dict = None, filter_column: str = None,
+                      filter_values=None, sheet_name: str = None) -> pd.DataFrame:
+    """
+    openpyxl read-only 모드로 시트를 한 행씩 읽어 필요한 컬럼만 DataFrame으로 만듭니다.
+    전체 시트를 메모리에 올리지 않으므로 수십만 행의 신청정보 파일도 필요한 만큼만 메모리를 사용합니다.
+
+    :param columns: 읽을 컬럼 (기본값: 전체). 파일에 없는 컬럼은 건너뜁니다.
+    :param dtypes: 컬럼별 dtype (기본값: 모든 컬럼 'str'). 'str' 외의 값은 DataFrame.astype으로 변환합니다.
+    :param filter_column: filter_values에 값이 있는 행만 남길 컬럼 (문자열로 비교)
+    :param filter_values: filter_column 값 목록 (None이면 필터링하지 않습니다)
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = worksheet.iter_rows(values_only=True)
+        header = [text_value(value) for value in next(rows, ())]
+
+        names = [name for name in (columns or header) if name in header]
+        positions = [header.index(name) for name in names]
+        filter_position = header.index(filter_column) if filter_column in header else None
+        allowed = None if filter_values is None or filter_position is None else {text_value(value) for value in filter_values}
+        if filter_values is not None and filter_position is None:
+            logging.warning(f"Filter column '{filter_column}' not found in {path}; reading all rows")
+
+        data = [[] for _ in names]
+        total = 0
+        for row in rows:
+            total += 1
+            if allowed is not None and (filter_position >= len(row) or text_value(row[filter_position]) not in allowed):
+                continue
+            for values, position in zip(data, positions):
+                values.append(text_value(row[position]) if position < len(row) else np.nan)
+    finally:
+        workbook.close()
+
+    # read_excel(dtype=str)처럼 문자열과 NaN의 object 컬럼으로 만듭니다 (빈 셀이 'None' 문자열이 되지 않도록).
+    df = pd.DataFrame({name: pd.Series(values, dtype=object) for name, values in zip(names, data)}, columns=names)
+    for name, dtype in (dtypes or {}).items():
+        if name in df.columns and dtype != 'str':
+            df[name] = df[name].astype(dtype)
+    logging.info(f"Read {len(df)} of {total} rows ({len(names)} columns) from {path}")
+    return df
+
+
+def save_frames(dfs, sheet_names, file_name: str) -> list:
+    """
+    save_dfs_to_excel과 같은 인자로 DataFrame(들)을 file_name의 형식으로 저장합니다.
+    Excel이 아닌 형식은 시트를 담을 수 없으므로 DataFrame이 여러 개이면 {이름}_{시트명}{확장자}로 나누어 저장합니다.
+
+    :return: 저장한 파일 목록
+    """
+    if not isinstance(dfs, list):
+        dfs = [dfs]
+    if not isinstance(sheet_names, list):
+        sheet_names = [sheet_names]
+
+    if file_format(file_name) == 'xlsx':
+        with pd.ExcelWriter(file_name) as writer:
+            for df, sheet_name in zip(dfs, sheet_names):
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        return [file_name]
+
+    if len(dfs) == 1:
+        return [write_frame(dfs[0], file_name)]
+    base_name, extension = split_extension(file_name)
+    return [write_frame(df, f"{base_name}_{str(sheet_name).replace(' ', '_')}{extension}") for df, sheet_name in zip(dfs, sheet_names)]
@@ -0,0 +1,132 @@
+import sys
+import json
+import time
+import logging
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def peak_rss_mb():
+    """
+    프로세스 최대 상주 메모리(MB)를 반환합니다. 측정할 수 없는 환경에서는 None입니다.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위입니다.
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class StageRecord:
+    def __init__(self, name: str, rows: int = None):
+        self.name = name
+        self.rows = rows
+        self.seconds = None
+        self.peak_rss_mb = None
+
+    def to_dict(self) -> dict:
+        rows_per_sec = round(self.rows / self.seconds, 1) if self.rows and self.seconds else None
+        return {
+            'stage': self.name,
+            'seconds': round(self.seconds, 3) if self.seconds is not None else None,
+            'rows': self.rows,
+            'rows_per_sec': rows_per_sec,
+            'peak_rss_mb': self.peak_rss_mb,
+        }
+
+
+class RunMetrics:
+    """
+    실행 단위(fetch, parse, normalize, analyze, write 등) 소요 시간과 행 수, 최대 메모리를 기록합니다.
+    """
+
+    def __init__(self, name: str = 'fpat'):
+        self.name = name
+        self.started = time.time()
+        self.stages = []
+        # 단계 기록 직후 호출할 함수 목록 (예: tracemalloc 스냅샷)
+        self.hooks = []
+
+    @contextmanager
+    def stage(self, name: str, rows: int = None):
+        """
+        with 블록의 실행 시간을 name 단계로 기록합니다. 행 수는 블록 안에서 record.rows로 지정할 수 있습니다.
+        """
+        record = StageRecord(name, rows)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            record.peak_rss_mb = peak_rss_mb()
+            self.stages.append(record)
+            for hook in self.hooks:
+                hook(record)
+
+    def report(self) -> dict:
+        return {
+            'run': self.name,
+            'started': time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)),
+            'total_seconds': round(time.time() - self.started, 3),
+            'peak_rss_mb': peak_rss_mb(),
+            'stages': [record.to_dict() for record in self.stages],
+        }
+
+    def emit(self, file_name: str = None) -> dict:
+        """
+        기록된 단계를 JSON 한 줄로 로그에 남기고, file_name이 있으면 파일로도 저장합니다.
+        """
+        report = self.report()
+        logging.info(f"Metrics: {json.dumps(report, ensure_ascii=False)}")
+        if file_name:
+            with open(file_name, 'w', encoding='utf-8') as file:
+                json.dump(report, file, ensure_ascii=False, indent=2)
+            logging.info(f"Metrics have been saved to {file_name}")
+        return report
+
+
+class ProgressTicker:
+    """
+    행 단위 반복문의 진행 상황을 interval초마다 한 번만 로그로 남깁니다.
+    """
+
+    def __init__(self, desc: str, total: int, interval: float = 10.0, enabled: bool = True):
+        self.desc = desc
+        self.total = total
+        self.interval = interval
+        self.enabled = enabled
+        self.done = 0
+        self.start = time.perf_counter()
+        self.next_report = self.start + interval
+
+    def update(self, n: int = 1):
+        self.done += n
+        if self.enabled:
+            now = time.perf_counter()
+            if now >= self.next_report:
+                self.next_report = now + self.interval
+                rate = self.done / (now - self.start)
+                logging.info(f"{self.desc}: {self.done}/{self.total} ({rate:.0f} rows/s)")
+
+
+_current = RunMetrics()
+
+
+def current() -> RunMetrics:
+    return _current
+
+
+def reset(name: str = 'fpat') -> RunMetrics:
+    global _current
+    _current = RunMetrics(name)
+    return _current
+
+
+def stage(name: str, rows: int = None):
+    return _current.stage(name, rows)
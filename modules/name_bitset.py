@@ -0,0 +1,96 @@
+import numpy as np
+
+# 'any'는 모든 비트가 1인 값(파이썬 정수 -1)으로 표현하여 나중에 추가되는 이름도 포함하도록 합니다.
+ANY_MASK = -1
+
+
+class NameBitset:
+    """
+    애플리케이션/사용자 이름을 비트 위치에 대응시켜 집합 연산을 비트 연산으로 수행합니다.
+    처음 보는 이름은 새 비트를 할당하며, 같은 문자열의 인코딩 결과는 캐시합니다.
+    """
+
+    def __init__(self, names=None):
+        self.positions = {}
+        self.names = []
+        self._cache = {}
+        for name in names or []:
+            self.position(name)
+
+    def position(self, name: str) -> int:
+        if name not in self.positions:
+            self.positions[name] = len(self.names)
+            self.names.append(name)
+        return self.positions[name]
+
+    @staticmethod
+    def _split(value) -> list:
+        if isinstance(value, str):
+            return [item.strip() for item in value.split(',') if item.strip()]
+        return [str(item).strip() for item in value if str(item).strip()]
+
+    def encode(self, value) -> int:
+        """
+        콤마 구분 문자열 또는 이름 리스트/집합을 비트마스크(int)로 변환합니다. any는 ANY_MASK입니다.
+        """
+        cache_key = value if isinstance(value, str) else None
+        if cache_key is not None and cache_key in self._cache:
+            return self._cache[cache_key]
+
+        mask = 0
+        for name in self._split(value):
+            if name.lower() == 'any':
+                mask = ANY_MASK
+                break
+            mask |= 1 << self.position(name)
+
+        if cache_key is not None:
+            self._cache[cache_key] = mask
+        return mask
+
+    def decode(self, mask: int) -> list:
+        """
+        비트마스크를 이름 리스트로 되돌립니다. ANY_MASK는 ['any']입니다.
+        """
+        if mask < 0:
+            return ['any']
+        names = []
+        position = 0
+        while mask:
+            if mask & 1:
+                names.append(self.names[position])
+            mask >>= 1
+            position += 1
+        return names
+
+    def overlaps(self, value1, value2) -> bool:
+        return (self.encode(value1) & self.encode(value2)) != 0
+
+    def intersection(self, value1, value2) -> list:
+        return self.decode(self.encode(value1) & self.encode(value2))
+
+    # ────────────── NUMPY ──────────────
+
+    def encode_array(self, values) -> np.ndarray:
+        """
+        값 목록을 (n, words) 크기의 uint64 비트 배열로 변환합니다.
+        배열 폭은 인코딩 시점의 이름 수로 고정되며, any는 모든 비트가 1입니다.
+        """
+        masks = [self.encode(value) for value in values]
+        words = max(1, (len(self.names) + 63) // 64)
+        result = np.zeros((len(masks), words), dtype=np.uint64)
+        word_mask = (1 << 64) - 1
+        for i, mask in enumerate(masks):
+            if mask < 0:
+                result[i, :] = np.uint64(word_mask)
+                continue
+            for word in range(words):
+                result[i, word] = (mask >> (64 * word)) & word_mask
+        return result
+
+    @staticmethod
+    def overlap_any(array: np.ndarray, row: np.ndarray) -> np.ndarray:
+        """
+        encode_array 결과의 각 행이 row와 겹치는지 한 번에 계산합니다.
+        """
+        return (array & row).any(axis=1)
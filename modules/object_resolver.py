@@ -0,0 +1,154 @@
+import logging
+import pandas as pd
+
+from modules.shadow_analysis import address_intervals, service_intervals, merge_intervals, split_tokens, is_any
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Palo Alto 기본 제공 서비스
+PREDEFINED_SERVICES = {
+    'service-http': ['tcp/80', 'tcp/8080'],
+    'service-https': ['tcp/443'],
+}
+
+
+class ObjectResolver:
+    """
+    익스포터가 반환하는 객체/그룹 DataFrame으로 규칙의 객체명을 실제 주소/서비스 값으로 확장합니다.
+    중첩 그룹의 확장 결과와 구간 집합은 객체명 단위로 캐시합니다.
+
+    - 네트워크 객체: Name, Value (Palo Alto는 Type 포함)
+    - 네트워크 그룹: Group Name, Entry
+    - 서비스 객체: Name, Protocol, Port
+    - 서비스 그룹: Group Name, Entry
+    """
+
+    def __init__(self, network_df: pd.DataFrame = None, network_group_df: pd.DataFrame = None,
+                 service_df: pd.DataFrame = None, service_group_df: pd.DataFrame = None):
+        self.address_objects = self._object_map(network_df, 'Name', 'Value')
+        self.address_groups = self._object_map(network_group_df, 'Group Name', 'Entry')
+        self.service_objects = {name: list(values) for name, values in PREDEFINED_SERVICES.items()}
+        self.service_groups = self._object_map(service_group_df, 'Group Name', 'Entry')
+
+        if service_df is not None and not service_df.empty:
+            for name, protocol, ports in service_df[['Name', 'Protocol', 'Port']].itertuples(index=False):
+                protocol = str(protocol).lower()
+                members = self.service_objects.setdefault(name, [])
+                port_list = split_tokens(ports)
+                if not port_list:
+                    members.append(protocol)
+                for port in port_list:
+                    members.append(f'{protocol}/{port}')
+
+        self._expanded = {'address': {}, 'service': {}}
+        self._intervals = {'address': {}, 'service': {}}
+
+    @staticmethod
+    def _object_map(df: pd.DataFrame, name_column: str, value_column: str) -> dict:
+        if df is None or df.empty:
+            return {}
+        return {name: split_tokens(value) for name, value in zip(df[name_column], df[value_column])}
+
+    @classmethod
+    def from_paloalto(cls, api, config_type: str = 'running'):
+        """
+        PaloAltoAPI의 객체 익스포트 결과로 resolver를 생성합니다.
+        """
+        return cls(
+            api.export_network_objects(config_type),
+            api.export_network_group_objects(config_type),
+            api.export_service_objects(config_type),
+            api.export_service_group_objects(config_type),
+        )
+
+    @classmethod
+    def from_mf2(cls, object_dfs: list):
+        """
+        secui_mf2.export_objects 결과([address, address_group, service])로 resolver를 생성합니다.
+        """
+        if len(object_dfs) < 3:
+            logging.warning("MF2 object data is incomplete; objects will not be resolved")
+            return cls()
+        address_df, address_group_df, service_df = object_dfs[:3]
+        return cls(address_df, address_group_df, service_df)
+
+    def expand(self, name: str, kind: str = 'address', _visiting: set = None) -> tuple:
+        """
+        객체명을 중첩 그룹까지 확장하여 실제 값 토큰(정렬, 중복 제거)으로 반환합니다.
+        정의되지 않은 이름은 그대로 반환하며, 순환 참조된 그룹은 한 번만 확장합니다.
+
+        :param name: 객체 또는 그룹 이름
+        :param kind: 'address' 또는 'service'
+        """
+        cache = self._expanded[kind]
+        if name in cache:
+            return cache[name]
+
+        objects, groups = (self.address_objects, self.address_groups) if kind == 'address' else (self.service_objects, self.service_groups)
+        if _visiting is None:
+            _visiting = set()
+        if name in _visiting:
+            return ()
+        _visiting.add(name)
+
+        if name in groups:
+            values = set()
+            for member in groups[name]:
+                values.update(self.expand(member, kind, _visiting))
+        elif name in objects:
+            values = set(objects[name])
+        else:
+            values = {name}
+
+        _visiting.discard(name)
+        result = tuple(sorted(values))
+        cache[name] = result
+        return result
+
+    def resolve_field(self, value, kind: str = 'address') -> str:
+        """
+        콤마로 구분된 규칙 필드 값을 확장된 값 문자열로 변환합니다.
+        """
+        values = set()
+        for name in split_tokens(value):
+            values.update(self.expand(name, kind))
+        return ','.join(sorted(values))
+
+    def intervals(self, name: str, kind: str = 'address'):
+        """
+        객체명을 구간 집합으로 변환합니다. 구간으로 표현할 수 없으면 None을 반환합니다.
+        """
+        cache = self._intervals[kind]
+        if name not in cache:
+            converter = address_intervals if kind == 'address' else service_intervals
+            cache[name] = converter(','.join(self.expand(name, kind)))
+        return cache[name]
+
+    def field_intervals(self, value, kind: str = 'address'):
+        """
+        콤마로 구분된 규칙 필드 값을 객체명별로 캐시한 구간 집합의 합집합으로 변환합니다.
+        확장한 값을 문자열로 다시 파싱하는 address_intervals/service_intervals(resolve_field(value))와 결과가 같습니다.
+        """
+        converter = address_intervals if kind == 'address' else service_intervals
+        names = [name for name in split_tokens(value) if self.expand(name, kind)]
+        if not names or any(is_any(self.expand(name, kind)) for name in names):
+            return converter('')
+        parts = [self.intervals(name, kind) for name in names]
+        if any(part is None for part in parts):
+            return None
+        if len(parts) == 1:
+            return parts[0]
+        return merge_intervals([tuple(interval) for part in parts for interval in part.tolist()])
+
+    def attach(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        규칙 테이블에 Extracted Source/Destination/Service 컬럼을 추가한 사본을 반환합니다.
+        컬럼별로 고유 값만 확장한 뒤 map으로 한 번에 적용합니다.
+        """
+        df = df.copy()
+        for column, kind in (('Source', 'address'), ('Destination', 'address'), ('Service', 'service')):
+            if column not in df.columns:
+                continue
+            mapping = {value: self.resolve_field(value, kind) for value in pd.unique(df[column])}
+            df[f'Extracted {column}'] = df[column].map(mapping)
+        return df
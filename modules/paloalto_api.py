@@ -7,7 +7,10 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 import time
 import os
+import io
 import datetime
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
@@ -51,6 +54,8 @@ class PaloAltoAPI:
     def __init__(self, hostname, username, password):
         self.hostname = hostname
         self.base_url = f'https://{hostname}/api/'
+        self.session = requests.Session()
+        self.session.mount('https://', requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16))
         self.api_key = self.get_api_key(username, password)
 
     def save_dfs_to_excel(self, dfs, sheet_names, file_name):
@@ -91,7 +96,7 @@ class PaloAltoAPI:
     
     def get_api_data(self, parameter: dict, time_out: int = 10000):
         try:
-            response = requests.get(self.base_url, params=parameter, verify=False, timeout=time_out)
+            response = self.session.get(self.base_url, params=parameter, verify=False, timeout=time_out)
             return response
         
         except requests.exceptions.RequestException as e:
@@ -338,22 +343,19 @@ class PaloAltoAPI:
 
         return pd.DataFrame(service_group_objects)
     
-    def export_hit_count(self, vsys_name: str = 'vsys1'):
-        parameter = (
-            ('type', 'op'),
-            ('cmd', f"<show><rule-hit-count><vsys><vsys-name><entry name='{vsys_name}'><rule-base><entry name='security'><rules><all/></rules></entry></rule-base></entry></vsys-name></vsys></rule-hit-count></show>"),
-            ('key', self.api_key)
-        )
+    @staticmethod
+    def hit_count_command(vsys_name: str = 'vsys1') -> str:
+        return f"<show><rule-hit-count><vsys><vsys-name><entry name='{vsys_name}'><rule-base><entry name='security'><rules><all/></rules></entry></rule-base></entry></vsys-name></vsys></rule-hit-count></show>"
 
-        response = self.get_api_data(parameter)
-        tree = ET.fromstring(response.text)
+    def export_hit_count(self, vsys_name: str = 'vsys1'):
+        tree = ET.fromstring(self.get_hit_count_xml(vsys_name))
         rules = tree.findall('./result/rule-hit-count/vsys/entry/rule-base/entry/rules/entry')
 
         result = []
         for rule in rules:
             rule_name = str(rule.attrib.get('name'))
             rule_info = self.get_member(rule)
-            hit_count = rule_info[1]
+            hit_count = int(rule_info[1] or 0)
             last_hit_timestamp = int(rule_info[2])
             first_hit_timestamp = int(rule_info[4])
 
@@ -384,4 +386,89 @@ class PaloAltoAPI:
                 "Unused Days": unused_days
             })
         
-        return pd.DataFrame(result)
\ No newline at end of file
+        return pd.DataFrame(result)
+    
+    def get_hit_count_xml(self, vsys_name: str = 'vsys1'):
+        parameter = (
+            ('type', 'op'),
+            ('cmd', self.hit_count_command(vsys_name)),
+            ('key', self.api_key)
+        )
+
+        response = self.get_api_data(parameter)
+        return response.content
+    
+    @staticmethod
+    def parse_hit_count_xml(content: bytes):
+        """
+            rule-hit-count 응답을 iterparse로 읽어 규칙별 컬럼 리스트를 반환하는 함수.
+            처리한 entry 요소는 바로 비워서 응답 크기와 무관하게 메모리를 일정하게 유지한다.
+
+            :param content: rule-hit-count 응답 XML (bytes)
+            :return: (rule_names, hit_counts, last_hit_timestamps, first_hit_timestamps)
+        """
+        fields = {'hit-count': {}, 'last-hit-timestamp': {}, 'first-hit-timestamp': {}}
+        rule_names, hit_counts, last_hits, first_hits = [], [], [], []
+        current = {}
+
+        for event, elem in ET.iterparse(io.BytesIO(content), events=('end',)):
+            if elem.tag in fields:
+                current[elem.tag] = elem.text
+            elif elem.tag == 'entry' and 'hit-count' in current:
+                rule_names.append(str(elem.attrib.get('name')))
+                hit_counts.append(current.get('hit-count') or 0)
+                last_hits.append(current.get('last-hit-timestamp') or 0)
+                first_hits.append(current.get('first-hit-timestamp') or 0)
+                current = {}
+                elem.clear()
+
+        return rule_names, hit_counts, last_hits, first_hits
+    
+    def export_hit_count_all(self, vsys_names: list = None, max_workers: int = 4):
+        """
+            여러 vsys의 히트 카운트를 동시에 조회하여 하나의 DataFrame으로 반환하는 함수.
+            vsys_names를 지정하지 않으면 get_vsys_list()로 전체 vsys를 조회한다.
+            요청은 self.session을 공유하며, 미사용 일수와 날짜 컬럼은 벡터 연산으로 계산한다.
+
+            :param vsys_names: 조회할 vsys 이름 리스트 (기본값: 전체 vsys)
+            :param max_workers: 동시 요청 수
+            :return: export_hit_count와 동일한 컬럼의 DataFrame
+        """
+        if vsys_names is None:
+            vsys_names = self.get_vsys_list()
+        if not vsys_names:
+            return pd.DataFrame(columns=["Vsys", "Rule Name", "Hit Count", "First Hit Date", "Last Hit Date", "Unused Days"])
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(vsys_names)))) as executor:
+            contents = list(executor.map(self.get_hit_count_xml, vsys_names))
+
+        vsys_column, rule_names, hit_counts, last_hits, first_hits = [], [], [], [], []
+        for vsys_name, content in zip(vsys_names, contents):
+            names, hits, lasts, firsts = self.parse_hit_count_xml(content)
+            vsys_column.extend([vsys_name] * len(names))
+            rule_names.extend(names)
+            hit_counts.extend(hits)
+            last_hits.extend(lasts)
+            first_hits.extend(firsts)
+
+        last_ts = np.asarray(last_hits, dtype=np.int64)
+        first_ts = np.asarray(first_hits, dtype=np.int64)
+
+        no_unused_days = 99999
+        no_hit_date = datetime.datetime(1900, 1, 1).strftime('%Y-%m-%d')
+        local_tz = datetime.datetime.now().astimezone().tzinfo
+
+        unused_days = np.where(first_ts == 0, no_unused_days, (int(time.time()) - last_ts) // 86400)
+
+        def to_date_strings(timestamps):
+            dates = pd.to_datetime(timestamps, unit='s', utc=True).tz_convert(local_tz).strftime('%Y-%m-%d')
+            return np.where(timestamps == 0, no_hit_date, dates)
+
+        return pd.DataFrame({
+            "Vsys": vsys_column,
+            "Rule Name": rule_names,
+            "Hit Count": np.asarray(hit_counts, dtype=np.int64),
+            "First Hit Date": to_date_strings(first_ts),
+            "Last Hit Date": to_date_strings(last_ts),
+            "Unused Days": unused_days,
+        })
@@ -9,6 +9,8 @@ import pandas as pd
 from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
 
+from modules import frame_io
+
 # SSL 설정
 requests.packages.urllib3.util.ssl_.DEFAULT_CIPHERS += ':DES-CBC3-SHA'
 requests.packages.urllib3.disable_warnings()
@@ -57,7 +59,7 @@ class PaloAltoAPI:
         self.base_url = f'https://{hostname}/api/'
         self.api_key = self._get_api_key(username, password)
 
-    def save_to_excel(self, data, sheet_names=None) -> str:
+    def save_to_excel(self, data, sheet_names=None, file_format: str = 'xlsx') -> str:
         """
         단일 DataFrame 또는 DataFrame 리스트를 엑셀 파일로 저장합니다.
         파일 이름은 현재 날짜, 호스트명, 시트명을 활용하여 자동 생성됩니다.
@@ -67,9 +69,21 @@ class PaloAltoAPI:
                             리스트가 아닌 경우 단일 시트로 저장됩니다.
                             기본값은 단일 시트의 경우 "Sheet1",
                             다중 시트의 경우 "Sheet1", "Sheet2", ... 로 지정됩니다.
-        :return: 생성된 엑셀 파일 이름
+        :param file_format: 'xlsx'(기본값) 또는 frame_io.EXPORT_FORMATS의 형식
+                            Excel이 아니면 스타일 없이 저장하며, 여러 DataFrame은 시트별 파일로 나뉩니다.
+        :return: 생성된 엑셀 파일 이름 (Excel이 아니면 첫 번째 파일 이름)
         """
         current_date = time.strftime("%Y-%m-%d-%H-%M-%S", time.localtime())
+
+        if file_format != 'xlsx':
+            if not isinstance(data, list):
+                sheet_name = sheet_names if isinstance(sheet_names, str) else "Sheet1"
+                file_name = f"{current_date}_{self.hostname}_{sheet_name}{frame_io.FORMATS[file_format]}"
+            else:
+                if sheet_names is None:
+                    sheet_names = [f"Sheet{i+1}" for i in range(len(data))]
+                file_name = f"{current_date}_{self.hostname}_combined{frame_io.FORMATS[file_format]}"
+            return frame_io.save_frames(data, sheet_names, file_name)[0]
         
         # 단일 DataFrame인 경우
         if not isinstance(data, list):
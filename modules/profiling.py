@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import logging
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+from modules import metrics
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+PROFILE_ENV = 'FPAT_PROFILE'
+PROFILE_MEMORY_ENV = 'FPAT_PROFILE_MEMORY'
+
+
+def env_enabled(name: str) -> bool:
+    return os.environ.get(name, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class StackSampler(threading.Thread):
+    """
+    대상 스레드의 호출 스택을 interval초마다 수집하여 collapsed stack("a;b;c count") 형식으로 집계합니다.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        super().__init__(name='fpat-stack-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = Counter()
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def frame_name(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self.frame_name(frame))
+                frame = frame.f_back
+            if stack:
+                self.counts[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def write_collapsed(self, file_name: str):
+        with open(file_name, 'w', encoding='utf-8') as file:
+            for stack, count in self.counts.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+def tracemalloc_hook(prefix: str, top: int = 10):
+    """
+    단계가 끝날 때마다 tracemalloc 스냅샷을 저장하고 상위 할당 위치를 로그로 남기는 metrics 훅을 만듭니다.
+    """
+    def hook(record):
+        snapshot = tracemalloc.take_snapshot()
+        file_name = f"{prefix}_{len(metrics.current().stages):02d}_{record.name}.tracemalloc"
+        snapshot.dump(file_name)
+        current, peak = tracemalloc.get_traced_memory()
+        logging.info(f"tracemalloc '{record.name}': current {current / 1048576:.1f} MB, peak {peak / 1048576:.1f} MB ({file_name})")
+        for stat in snapshot.statistics('lineno')[:top]:
+            logging.info(f"  {stat}")
+    return hook
+
+
+@contextmanager
+def profile_run(prefix: str, memory: bool = False, interval: float = 0.005):
+    """
+    with 블록을 cProfile과 스택 샘플러로 감싸 {prefix}.prof, {prefix}.collapsed 파일을 남깁니다.
+    memory가 True이면 metrics 단계마다 tracemalloc 스냅샷을 {prefix}_NN_<stage>.tracemalloc으로 저장합니다.
+    프로세스 풀 작업자(--workers) 내부는 수집되지 않습니다.
+    """
+    hook = None
+    if memory:
+        tracemalloc.start()
+        hook = tracemalloc_hook(prefix)
+        metrics.current().hooks.append(hook)
+
+    profiler = cProfile.Profile()
+    sampler = StackSampler(threading.get_ident(), interval)
+    sampler.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        sampler.stop()
+        elapsed = time.perf_counter() - start
+
+        profiler.dump_stats(f"{prefix}.prof")
+        sampler.write_collapsed(f"{prefix}.collapsed")
+        logging.info(f"Profile ({elapsed:.1f}s) has been saved to {prefix}.prof and {prefix}.collapsed")
+        stats = pstats.Stats(profiler)
+        stats.sort_stats('cumulative')
+        with open(f"{prefix}.txt", 'w', encoding='utf-8') as file:
+            stats.stream = file
+            stats.print_stats(40)
+
+        if hook is not None:
+            metrics.current().hooks.remove(hook)
+            tracemalloc.stop()
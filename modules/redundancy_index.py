@@ -0,0 +1,95 @@
+import os
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+def fingerprint_policy(values) -> int:
+    """
+    정책 필드 값(멤버 정렬 후)을 프로세스와 무관하게 같은 64비트 정수로 변환합니다.
+    """
+    normalized = [','.join(sorted(x.split(','))) if isinstance(x, str) else str(x) for x in values]
+    digest = hashlib.blake2b('\x1f'.join(normalized).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class RedundancyIndex:
+    """
+    이전 중복정책 분석 결과를 저장해 두는 지문(fingerprint) 색인입니다.
+    규칙 키(Vsys, Rule Name)별로 원본 값 해시와 정규화 지문을 보관하며,
+    새 export와 비교해 추가/변경된 규칙만 다시 정규화하고 삭제된 규칙은 색인에서 제거합니다.
+    """
+
+    def __init__(self, columns: list = None, rules: pd.DataFrame = None):
+        self.columns = columns
+        self.rules = rules
+
+    @classmethod
+    def load(cls, path: str, columns: list):
+        """
+        색인 파일을 읽습니다. 파일이 없거나 비교 컬럼이 다르면 빈 색인을 반환합니다.
+        """
+        if path and os.path.exists(path):
+            saved = pd.read_pickle(path)
+            if saved.get('columns') == columns:
+                logging.info(f"Loaded redundancy index from {path} ({len(saved['rules'])} rules)")
+                return cls(columns, saved['rules'])
+            logging.info("Redundancy index columns changed; rebuilding")
+        return cls(columns)
+
+    def save(self, path: str):
+        pd.to_pickle({'columns': self.columns, 'rules': self.rules}, path)
+        logging.info(f"Redundancy index has been saved to {path}")
+
+    @staticmethod
+    def rule_keys(df: pd.DataFrame) -> list:
+        return [col for col in ['Vsys', 'Rule Name'] if col in df.columns]
+
+    def update(self, df_filtered: pd.DataFrame) -> np.ndarray:
+        """
+        현재 규칙 테이블로 색인을 갱신하고 규칙 순서대로 지문 배열을 반환합니다.
+
+        :param df_filtered: 분석 대상 규칙 DataFrame (규칙 순서대로)
+        :return: 각 규칙의 지문 (int64 배열)
+        """
+        key = self.rule_keys(df_filtered)
+        current = df_filtered[key].astype(str).reset_index(drop=True)
+        current['RawHash'] = pd.util.hash_pandas_object(df_filtered[self.columns].astype(str), index=False).to_numpy()
+
+        fingerprints = np.zeros(len(current), dtype=np.int64)
+        reuse = np.zeros(len(current), dtype=bool)
+        matched = np.zeros(len(current), dtype=bool)
+        previous_count = 0 if self.rules is None else len(self.rules)
+
+        if previous_count and not current.duplicated(subset=key).any():
+            cached = self.rules[key + ['RawHash']].copy()
+            cached['_cached_pos'] = np.arange(len(cached))
+            merged = current.merge(cached, on=key, how='left', suffixes=('', '_cached'))
+            matched = merged['_cached_pos'].notna().to_numpy()
+            reuse = matched & (merged['RawHash_cached'] == merged['RawHash']).to_numpy()
+            cached_pos = merged['_cached_pos'].to_numpy()[reuse].astype(np.int64)
+            fingerprints[reuse] = self.rules['Fingerprint'].to_numpy()[cached_pos]
+
+        recompute = np.flatnonzero(~reuse)
+        check_values = df_filtered[self.columns].to_numpy(dtype=object)
+        for i in recompute:
+            fingerprints[i] = fingerprint_policy(check_values[i])
+        logging.info(
+            f"Redundancy index: {int(reuse.sum())} reused, {int((matched & ~reuse).sum())} changed, "
+            f"{int((~matched).sum())} added, {previous_count - int(matched.sum())} removed"
+        )
+
+        current['Fingerprint'] = fingerprints
+        self.rules = current
+        return current['Fingerprint'].to_numpy()
+
+    def fingerprint_index(self) -> dict:
+        """
+        지문 → 규칙 키 리스트 사전을 반환합니다.
+        """
+        key = [col for col in ['Vsys', 'Rule Name'] if col in self.rules.columns]
+        grouped = self.rules.groupby('Fingerprint', sort=False)
+        return {fp: group[key].to_records(index=False).tolist() for fp, group in grouped}
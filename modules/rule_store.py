@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+
+RULE_FIELDS = ['Source', 'User', 'Destination', 'Service', 'Application']
+
+_MIX_MULTIPLIER_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_MULTIPLIER_2 = np.uint64(0x94D049BB133111EB)
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+
+def mix_ids(ids: np.ndarray, seed: int = 0) -> np.ndarray:
+    """
+    정수 id를 64비트 해시 값으로 섞습니다(splitmix64). 같은 id는 항상 같은 값을 가집니다.
+    """
+    with np.errstate(over='ignore'):
+        z = ids.astype(np.uint64) + _GOLDEN_GAMMA * np.uint64(seed + 1)
+        z = (z ^ (z >> np.uint64(30))) * _MIX_MULTIPLIER_1
+        z = (z ^ (z >> np.uint64(27))) * _MIX_MULTIPLIER_2
+        return z ^ (z >> np.uint64(31))
+
+
+class RuleField:
+    """
+    규칙 필드 하나를 CSR 형식으로 보관합니다.
+    i번째 규칙의 멤버 id는 ids[offsets[i]:offsets[i + 1]]이며, 규칙 내에서 정렬/중복 제거되어 있습니다.
+    """
+
+    def __init__(self, offsets: np.ndarray, ids: np.ndarray):
+        self.offsets = offsets
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def members(self, i: int) -> np.ndarray:
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def row_index(self) -> np.ndarray:
+        """
+        ids의 각 원소가 속한 규칙 번호 배열을 반환합니다.
+        """
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.lengths())
+
+    def hashes(self, seed: int = 0) -> np.ndarray:
+        """
+        규칙별 멤버 집합의 순서 무관 해시(멤버 해시의 64비트 합)를 반환합니다.
+        """
+        with np.errstate(over='ignore'):
+            cumulative = np.concatenate(([np.uint64(0)], np.cumsum(mix_ids(self.ids, seed), dtype=np.uint64)))
+            return cumulative[self.offsets[1:]] - cumulative[self.offsets[:-1]]
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.nbytes + self.ids.nbytes
+
+
+class RuleStore:
+    """
+    규칙 테이블의 콤마 구분 필드(Source, User, Destination, Service, Application)를
+    객체명 → 정수 id로 인턴하고 필드별 CSR(offsets + ids) 배열로 보관하는 저장소입니다.
+    동일 vocabulary를 공유하면 여러 테이블(running/candidate, 장비 간)을 같은 id 공간에서 비교할 수 있습니다.
+    """
+
+    def __init__(self, vocabulary: dict = None):
+        self.vocabulary = vocabulary if vocabulary is not None else {}
+        self.names = []
+        self._sync_names()
+        self.fields = {}
+        self.index = None
+
+    def _sync_names(self):
+        """
+        공유 vocabulary에 다른 저장소가 추가한 이름을 id → 이름 목록에 반영합니다.
+        """
+        if len(self.names) == len(self.vocabulary):
+            return
+        self.names = [None] * len(self.vocabulary)
+        for name, object_id in self.vocabulary.items():
+            self.names[object_id] = name
+
+    # ────────────── CONVERTERS ──────────────
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, fields: list = None, vocabulary: dict = None):
+        """
+        익스포터가 반환한 규칙 DataFrame을 RuleStore로 변환합니다.
+
+        :param df: 규칙 DataFrame
+        :param fields: 인코딩할 컬럼 (기본값: RULE_FIELDS 중 df에 있는 컬럼)
+        :param vocabulary: 공유할 객체명 → id 사전 (새 이름은 이 사전에 추가됩니다)
+        """
+        store = cls(vocabulary)
+        store.index = df.index
+        if fields is None:
+            fields = [field for field in RULE_FIELDS if field in df.columns]
+        for field in fields:
+            store.fields[field] = store._encode(df[field])
+        return store
+
+    def _intern(self, tokens: pd.Series) -> np.ndarray:
+        codes = tokens.map(self.vocabulary)
+        unknown = codes.isna().to_numpy()
+        if unknown.any():
+            new_names = pd.unique(tokens[unknown])
+            self._sync_names()
+            start = len(self.vocabulary)
+            for offset, name in enumerate(new_names):
+                self.vocabulary[name] = start + offset
+            self.names.extend(new_names)
+            codes = tokens.map(self.vocabulary)
+        return codes.to_numpy(dtype=np.int32)
+
+    def _encode(self, values: pd.Series) -> RuleField:
+        split = values.fillna('').astype(str).str.split(',')
+        tokens = split.explode().str.strip()
+        rows = np.repeat(np.arange(len(values), dtype=np.int64), split.str.len().to_numpy())
+        keep = (tokens != '').to_numpy()
+        tokens = tokens[keep]
+        rows = rows[keep]
+
+        ids = self._intern(tokens) if len(tokens) else np.empty(0, dtype=np.int32)
+
+        # 규칙 내 멤버를 정렬하고 중복을 제거하여 집합 형태로 정규화합니다.
+        order = np.lexsort((ids, rows))
+        ids, rows = ids[order], rows[order]
+        unique = np.ones(len(ids), dtype=bool)
+        unique[1:] = (ids[1:] != ids[:-1]) | (rows[1:] != rows[:-1])
+        ids, rows = ids[unique], rows[unique]
+
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(values)), out=offsets[1:])
+        return RuleField(offsets, ids)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        저장된 필드를 콤마 구분 문자열 컬럼의 DataFrame으로 되돌립니다(멤버는 id 순서).
+        """
+        self._sync_names()
+        names = np.asarray(self.names, dtype=object)
+        data = {}
+        for field, encoded in self.fields.items():
+            data[field] = [','.join(names[encoded.ids[start:end]]) for start, end in zip(encoded.offsets[:-1], encoded.offsets[1:])]
+        return pd.DataFrame(data, index=self.index)
+
+    # ────────────── QUERIES ──────────────
+
+    def __len__(self):
+        return len(self.index) if self.index is not None else 0
+
+    def any_ids(self) -> np.ndarray:
+        return np.asarray([object_id for name, object_id in self.vocabulary.items() if str(name).lower() == 'any'], dtype=np.int32)
+
+    def member_names(self, field: str, i: int) -> list:
+        self._sync_names()
+        return [self.names[object_id] for object_id in self.fields[field].members(i)]
+
+    def rule_hashes(self, fields: list = None) -> np.ndarray:
+        """
+        여러 필드의 멤버 집합을 결합한 규칙별 64비트 해시를 반환합니다.
+        같은 멤버 집합(순서 무관)을 가진 규칙은 같은 해시를 가집니다.
+        """
+        if fields is None:
+            fields = list(self.fields)
+        result = np.zeros(len(self), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for seed, field in enumerate(fields):
+                result = mix_ids(result ^ self.fields[field].hashes(seed), seed)
+        return result
+
+    def overlaps(self, field: str, i: int, j: int) -> bool:
+        """
+        두 규칙의 field 멤버 집합이 겹치는지 확인합니다. any는 모든 멤버와 겹칩니다.
+        """
+        a = self.fields[field].members(i)
+        b = self.fields[field].members(j)
+        any_ids = self.any_ids()
+        if np.isin(a, any_ids).any() or np.isin(b, any_ids).any():
+            return True
+        return len(np.intersect1d(a, b, assume_unique=True)) > 0
+
+    def contains(self, field: str, i: int, j: int) -> bool:
+        """
+        i번째 규칙의 field 멤버 집합이 j번째 규칙의 멤버 집합을 포함하는지 확인합니다.
+        """
+        a = self.fields[field].members(i)
+        if np.isin(a, self.any_ids()).any():
+            return True
+        return bool(np.isin(self.fields[field].members(j), a, assume_unique=True).all())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(encoded.nbytes for encoded in self.fields.values())
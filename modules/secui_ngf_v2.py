@@ -1,4 +1,6 @@
+import re
 import json
+import codecs
 import logging
 import requests
 import pandas as pd
@@ -10,6 +12,60 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
 
+RULE_COLUMNS = [
+    "Seq", "Rule Name", "Enable", "Action", "Source", "User", "Destination",
+    "Service", "Application", "Last Hit Date", "Description"
+]
+
+
+def iter_json_array_items(chunks, key: str):
+    """
+    바이트 조각(chunks)으로 들어오는 JSON 문서에서 key에 해당하는 배열의 원소를
+    전체 문서를 읽지 않고 1건씩 디코딩하여 반환합니다.
+
+    :param chunks: bytes 조각을 반환하는 iterable (예: response.iter_content())
+    :param key: 배열을 담고 있는 최상위 키 이름
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    in_array = False
+    marker = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+        if not in_array:
+            match = marker.search(buffer)
+            if not match:
+                # 키가 조각 경계에 걸칠 수 있으므로 끝부분만 남깁니다.
+                buffer = buffer[-(len(key) + 64):]
+                continue
+            in_array = True
+            pos = match.end()
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == ']':
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # 원소가 아직 다 수신되지 않았습니다.
+                break
+            yield item
+
+        buffer = buffer[pos:]
+        pos = 0
+
+    if in_array and buffer.strip():
+        logging.error("JSON stream ended before '%s' array was closed", key)
+
+
 class NGFClient:
     """
     NGF API와 연동하여 로그인, 데이터 조회, 규칙 파싱 등의 기능을 제공하는 클라이언트입니다.
@@ -178,6 +234,62 @@ class NGFClient:
             return rules_data
         return None
 
+    def _parse_rule(self, rule: dict) -> dict:
+        """
+        NGF 규칙 1건을 DataFrame 행(dict)으로 변환합니다.
+        default 규칙은 None을 반환합니다.
+        """
+        name = rule.get("name")
+        # default rule은 건너뜁니다.
+        if name == "default":
+            return None
+        use = "Y" if rule.get("use") == 1 else "N"
+        action = "allow" if rule.get("action") == 1 else "deny"
+
+        src_list = rule.get("src")
+        if not src_list:
+            src_list = "any"
+        else:
+            src_list = [src.get("name") for src in src_list]
+
+        user_list = rule.get("user")
+        if not user_list:
+            user_list = "any"
+        else:
+            user_list = [list(user.values())[0] for user in user_list]
+
+        dst_list = rule.get("dst")
+        if not dst_list:
+            dst_list = "any"
+        else:
+            dst_list = [dst.get("name") for dst in dst_list]
+
+        srv_list = rule.get("srv")
+        if not srv_list:
+            srv_list = "any"
+        else:
+            srv_list = [srv.get("name") for srv in srv_list]
+
+        app_list = rule.get("app")
+        if not app_list:
+            app_list = "any"
+        else:
+            app_list = [app.get("name") for app in app_list]
+
+        return {
+            "Seq": rule.get("seq"),
+            "Rule Name": rule.get("fw_rule_id"),
+            "Enable": use,
+            "Action": action,
+            "Source": self.list_to_string(src_list),
+            "User": self.list_to_string(user_list),
+            "Destination": self.list_to_string(dst_list),
+            "Service": self.list_to_string(srv_list),
+            "Application": self.list_to_string(app_list),
+            "Last Hit Date": rule.get("last_hit_time"),
+            "Description": rule.get("desc")
+        }
+
     def export_security_rules(self) -> pd.DataFrame:
         """
         NGF 규칙 데이터를 파싱하여 pandas DataFrame으로 반환합니다.
@@ -188,66 +300,74 @@ class NGFClient:
             return pd.DataFrame()
 
         security_rules = []
-        rules = rules_data.get("result", [])
-        for rule in rules:
-            seq = rule.get("seq")
-            fw_rule_id = rule.get("fw_rule_id")
-            name = rule.get("name")
-            # default rule은 건너뜁니다.
-            if name == "default":
-                continue
-            use = "Y" if rule.get("use") == 1 else "N"
-            action = "allow" if rule.get("action") == 1 else "deny"
+        for rule in rules_data.get("result", []):
+            info = self._parse_rule(rule)
+            if info is not None:
+                security_rules.append(info)
 
-            src_list = rule.get("src")
-            if not src_list:
-                src_list = "any"
-            else:
-                src_list = [src.get("name") for src in src_list]
+        return pd.DataFrame(security_rules)
 
-            user_list = rule.get("user")
-            if not user_list:
-                user_list = "any"
-            else:
-                user_list = [list(user.values())[0] for user in user_list]
+    def iter_fw4_rules(self, read_chunk_size: int = 65536):
+        """
+        FW4 규칙 응답을 스트리밍으로 받아 result 배열의 규칙을 1건씩 반환합니다.
+        응답 전체를 메모리에 올리지 않으며, timeout은 연결/수신 구간별로 적용됩니다.
 
-            dst_list = rule.get("dst")
-            if not dst_list:
-                dst_list = "any"
-            else:
-                dst_list = [dst.get("name") for dst in dst_list]
+        :param read_chunk_size: 소켓에서 한 번에 읽을 바이트 수
+        """
+        endpoint = "/api/po/fw/4/rules"
+        url = f"https://{self.hostname}{endpoint}"
+        try:
+            response = requests.get(
+                url,
+                headers=self._get_headers(token=self.token),
+                verify=False,
+                stream=True,
+                timeout=(3, self.timeout)
+            )
+        except Exception as e:
+            logging.error("Exception during GET %s: %s", endpoint, e)
+            return
 
-            srv_list = rule.get("srv")
-            if not srv_list:
-                srv_list = "any"
-            else:
-                srv_list = [srv.get("name") for srv in srv_list]
+        with response:
+            if response.status_code != 200:
+                logging.error("GET %s Failed, status code: %s", endpoint, response.status_code)
+                return
+            logging.info("GET %s Streaming", endpoint)
+            chunks = response.iter_content(chunk_size=read_chunk_size)
+            yield from iter_json_array_items(chunks, "result")
 
-            app_list = rule.get("app")
-            if not app_list:
-                app_list = "any"
-            else:
-                app_list = [app.get("name") for app in app_list]
-
-            last_hit_time = rule.get("last_hit_time")
-            desc = rule.get("desc")
-
-            info = {
-                "Seq": seq,
-                "Rule Name": fw_rule_id,
-                "Enable": use,
-                "Action": action,
-                "Source": self.list_to_string(src_list),
-                "User": self.list_to_string(user_list),
-                "Destination": self.list_to_string(dst_list),
-                "Service": self.list_to_string(srv_list),
-                "Application": self.list_to_string(app_list),
-                "Last Hit Date": last_hit_time,
-                "Description": desc
-            }
-            security_rules.append(info)
+    def export_security_rules_chunked(self, chunk_size: int = 5000) -> pd.DataFrame:
+        """
+        NGF 규칙을 스트리밍으로 내려받아 chunk_size 단위의 컬럼 묶음으로 DataFrame을 구성합니다.
+        규칙 수가 많은 장비에서 export_security_rules 대신 사용합니다.
 
-        return pd.DataFrame(security_rules)
+        :param chunk_size: DataFrame 조각 하나에 담을 규칙 수
+        :return: 보안 규칙 DataFrame (export_security_rules와 동일한 컬럼)
+        """
+        if not self.login():
+            logging.error("No rules data available")
+            return pd.DataFrame()
+
+        frames = []
+        columns = {column: [] for column in RULE_COLUMNS}
+        try:
+            for rule in self.iter_fw4_rules():
+                info = self._parse_rule(rule)
+                if info is None:
+                    continue
+                for column in RULE_COLUMNS:
+                    columns[column].append(info[column])
+                if len(columns["Seq"]) >= chunk_size:
+                    frames.append(pd.DataFrame(columns))
+                    columns = {column: [] for column in RULE_COLUMNS}
+        finally:
+            self.logout()
+
+        if columns["Seq"]:
+            frames.append(pd.DataFrame(columns))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
 
 
 # ────────────── 모듈 테스트 예시 ──────────────
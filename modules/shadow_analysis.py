@@ -0,0 +1,281 @@
+import re
+import logging
+import numpy as np
+import pandas as pd
+
+from modules.checking_overlapped import ip_to_range, is_valid_ip_format
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+IPV4_MAX = 2**32 - 1
+
+# 서비스는 프로토콜별 포트 공간을 하나의 정수 축에 이어 붙여 구간으로 표현합니다.
+PORT_SPACE = 65536
+PROTOCOL_INDEX = {'tcp': 0, 'udp': 1, 'sctp': 2, 'icmp': 3}
+SERVICE_MAX = len(PROTOCOL_INDEX) * PORT_SPACE - 1
+
+SERVICE_TOKEN_PATTERN = re.compile(r'^(\w+)(?:/(\d+)(?:-(\d+))?)?$')
+
+ADDRESS_FIELDS = ['Source', 'Destination']
+TOKEN_FIELDS = ['User', 'Application']
+
+
+# ────────────── INTERVAL FUNCTIONS ──────────────
+
+def merge_intervals(intervals) -> np.ndarray:
+    """
+    (start, end) 구간 리스트를 정렬 후 겹치거나 맞닿은 구간을 병합하여 (k, 2) 배열로 반환합니다.
+    """
+    if not intervals:
+        return np.empty((0, 2), dtype=np.int64)
+    intervals = sorted(intervals)
+    merged = [list(intervals[0])]
+    for start, end in intervals[1:]:
+        if start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return np.asarray(merged, dtype=np.int64)
+
+
+def intervals_contain(outer: np.ndarray, inner: np.ndarray) -> bool:
+    """
+    병합된 구간 집합 outer가 inner의 모든 구간을 포함하는지 확인합니다.
+    """
+    if len(inner) == 0:
+        return True
+    if len(outer) == 0:
+        return False
+    idx = np.searchsorted(outer[:, 0], inner[:, 0], side='right') - 1
+    if (idx < 0).any():
+        return False
+    return bool((outer[idx, 1] >= inner[:, 1]).all())
+
+
+def split_tokens(value) -> list:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    return [token.strip() for token in str(value).split(',') if token.strip()]
+
+
+def is_any(tokens) -> bool:
+    return any(token.lower() == 'any' for token in tokens)
+
+
+def address_intervals(value):
+    """
+    주소 필드 값을 IP 구간 집합으로 변환합니다. 변환할 수 없는 토큰(객체명 등)이 있으면 None을 반환합니다.
+    """
+    tokens = split_tokens(value)
+    if not tokens or is_any(tokens):
+        return np.array([[0, IPV4_MAX]], dtype=np.int64)
+    ranges = []
+    for token in tokens:
+        if not is_valid_ip_format(token):
+            return None
+        ranges.append(ip_to_range(token))
+    return merge_intervals(ranges)
+
+
+def service_intervals(value):
+    """
+    서비스 필드 값(tcp/80, udp/1000-2000, icmp 등)을 프로토콜별 포트 구간 집합으로 변환합니다.
+    변환할 수 없는 토큰이 있으면 None을 반환합니다.
+    """
+    tokens = split_tokens(value)
+    if not tokens or is_any(tokens):
+        return np.array([[0, SERVICE_MAX]], dtype=np.int64)
+    ranges = []
+    for token in tokens:
+        match = SERVICE_TOKEN_PATTERN.match(token.lower())
+        if not match or match.group(1) not in PROTOCOL_INDEX:
+            return None
+        base = PROTOCOL_INDEX[match.group(1)] * PORT_SPACE
+        if match.group(2) is None:
+            start, end = 0, PORT_SPACE - 1
+        else:
+            start = int(match.group(2))
+            end = int(match.group(3)) if match.group(3) else start
+        if start > end or end >= PORT_SPACE:
+            return None
+        ranges.append((base + start, base + end))
+    return merge_intervals(ranges)
+
+
+def tokens_contain(outer: frozenset, inner: frozenset) -> bool:
+    return is_any(outer) or inner <= outer
+
+
+def enclosing_block(start: int, end: int, bits: int = 32) -> tuple:
+    """
+    구간을 포함하는 가장 작은 CIDR 블록을 (prefix 길이, 네트워크 번호)로 반환합니다.
+    """
+    prefix = bits - (start ^ end).bit_length()
+    return prefix, start >> (bits - prefix)
+
+
+# ────────────── FIELD RESOLUTION ──────────────
+
+class _FieldResolver:
+    """
+    같은 값이 반복되는 규칙 필드를 캐시하며 구간/토큰 집합으로 변환합니다.
+    """
+
+    def __init__(self, converter):
+        self.converter = converter
+        self.cache = {}
+
+    def __call__(self, value, token_value=None):
+        """
+        token_value를 지정하면 멤버 집합은 해당 값(예: 객체를 확장한 값)으로 만듭니다.
+        """
+        key = str(value)
+        if key not in self.cache:
+            self.cache[key] = (self.converter(value), frozenset(split_tokens(value if token_value is None else token_value)))
+        return self.cache[key]
+
+
+def _span_arrays(resolved, maximum):
+    """
+    규칙별 구간 집합의 전체 범위(최소 시작, 최대 끝)를 배열로 만듭니다.
+    변환되지 않은 규칙은 다른 규칙을 구간으로 포함할 수 없도록 빈 범위로 둡니다.
+    """
+    lo = np.full(len(resolved), maximum + 1, dtype=np.int64)
+    hi = np.full(len(resolved), -1, dtype=np.int64)
+    for i, (intervals, _) in enumerate(resolved):
+        if intervals is not None:
+            lo[i] = intervals[0, 0]
+            hi[i] = intervals[-1, 1]
+    return lo, hi
+
+
+# ────────────── SHADOW DETECTION ──────────────
+
+def find_shadowed_rules(df: pd.DataFrame, token_fields: list = None, resolver=None) -> pd.DataFrame:
+    """
+    상위 규칙에 완전히 포함되어 절대 매칭되지 않는 하위 규칙을 찾습니다.
+    주소/서비스는 구간 집합 포함 관계로, User/Application 등은 멤버 집합 포함 관계로 비교합니다.
+    'Extracted Source/Destination/Service' 컬럼이 있으면 객체가 확장된 해당 값을 사용합니다.
+
+    모든 규칙 쌍을 비교하지 않도록 목적지 구간을 감싸는 CIDR 블록으로 규칙을 분할한 색인을 만들고,
+    하위 규칙의 블록과 그 상위 블록들에 속한 앞선 규칙만 후보로 검사합니다.
+
+    :param df: 규칙 순서대로 정렬된 정책 DataFrame (Enable == 'Y'인 규칙만 비교)
+    :param token_fields: 멤버 집합으로 비교할 컬럼 (기본값: User, Application)
+    :param resolver: ObjectResolver. 지정하면 주소/서비스 구간을 원래 객체명으로 resolver의 객체명별 캐시에서 가져옵니다.
+    :return: Lower Index, Upper Index, Relation 컬럼의 DataFrame (인덱스는 df의 위치)
+    """
+    if token_fields is None:
+        token_fields = [field for field in TOKEN_FIELDS if field in df.columns]
+
+    def column(name):
+        extracted = f'Extracted {name}'
+        return df[extracted] if extracted in df.columns else df[name]
+
+    if resolver is None:
+        address_resolver = _FieldResolver(address_intervals)
+        service_resolver = _FieldResolver(service_intervals)
+        sources = [address_resolver(v) for v in column('Source')]
+        destinations = [address_resolver(v) for v in column('Destination')]
+        services = [service_resolver(v) for v in column('Service')]
+    else:
+        address_resolver = _FieldResolver(lambda value: resolver.field_intervals(value, 'address'))
+        service_resolver = _FieldResolver(lambda value: resolver.field_intervals(value, 'service'))
+        sources = [address_resolver(v, t) for v, t in zip(df['Source'], column('Source'))]
+        destinations = [address_resolver(v, t) for v, t in zip(df['Destination'], column('Destination'))]
+        services = [service_resolver(v, t) for v, t in zip(df['Service'], column('Service'))]
+    token_values = {field: [frozenset(split_tokens(v)) for v in df[field]] for field in token_fields}
+
+    src_lo, src_hi = _span_arrays(sources, IPV4_MAX)
+    svc_lo, svc_hi = _span_arrays(services, SERVICE_MAX)
+
+    enabled = (df['Enable'] == 'Y').to_numpy() if 'Enable' in df.columns else np.ones(len(df), dtype=bool)
+    actions = df['Action'].astype(str).str.lower().to_numpy()
+    partitions = df['Vsys'].to_numpy() if 'Vsys' in df.columns else np.zeros(len(df))
+
+    def field_contains(upper, lower):
+        upper_intervals, upper_tokens = upper
+        lower_intervals, lower_tokens = lower
+        if tokens_contain(upper_tokens, lower_tokens):
+            return True
+        if upper_intervals is None or lower_intervals is None:
+            return False
+        return intervals_contain(upper_intervals, lower_intervals)
+
+    def covers(upper, lower):
+        for values in (destinations, sources, services):
+            if not field_contains(values[upper], values[lower]):
+                return False
+        for values in token_values.values():
+            if not tokens_contain(values[upper], values[lower]):
+                return False
+        return True
+
+    # 목적지 블록 색인: (vsys, prefix, network) -> 규칙 위치 리스트, 객체명 목적지는 (vsys, 'raw')
+    index = {}
+    blocks = []
+    for i, (intervals, _) in enumerate(destinations):
+        if intervals is None:
+            block = (partitions[i], 'raw')
+        else:
+            block = (partitions[i],) + enclosing_block(int(intervals[0, 0]), int(intervals[-1, 1]))
+        blocks.append(block)
+        if enabled[i]:
+            index.setdefault(block, []).append(i)
+    index = {block: np.asarray(positions, dtype=np.int64) for block, positions in index.items()}
+
+    results = []
+    for i in range(len(df)):
+        if not enabled[i]:
+            continue
+        block = blocks[i]
+        if block[1] == 'raw':
+            lookup = [(block[0], 0, 0), block]
+        else:
+            partition, prefix, network = block
+            lookup = [(partition, q, network >> (prefix - q)) for q in range(prefix + 1)]
+
+        candidates = [index[key] for key in lookup if key in index]
+        if not candidates:
+            continue
+        candidates = np.concatenate(candidates)
+        candidates = candidates[candidates < i]
+        if sources[i][0] is not None:
+            candidates = candidates[(src_lo[candidates] <= src_lo[i]) & (src_hi[candidates] >= src_hi[i])]
+        if services[i][0] is not None:
+            candidates = candidates[(svc_lo[candidates] <= svc_lo[i]) & (svc_hi[candidates] >= svc_hi[i])]
+
+        for upper in np.sort(candidates):
+            if covers(upper, i):
+                relation = 'Redundant' if actions[upper] == actions[i] else 'Shadowed'
+                results.append((i, int(upper), relation))
+                break
+
+    return pd.DataFrame(results, columns=['Lower Index', 'Upper Index', 'Relation'])
+
+
+def build_shadow_report(df: pd.DataFrame, pairs: pd.DataFrame) -> pd.DataFrame:
+    """
+    find_shadowed_rules 결과를 중복정책 분석과 같은 No/Type 그룹 형식의 테이블로 변환합니다.
+    """
+    if pairs.empty:
+        return pd.DataFrame(columns=['No', 'Type', 'Relation'] + list(df.columns))
+
+    upper_positions = pd.unique(pairs['Upper Index'])
+    group_no = {position: no for no, position in enumerate(upper_positions, start=1)}
+
+    upper = df.iloc[upper_positions].copy()
+    upper.insert(0, 'Relation', '')
+    upper.insert(0, 'Type', 'Upper')
+    upper.insert(0, 'No', [group_no[p] for p in upper_positions])
+    upper['_order'] = upper_positions
+
+    lower = df.iloc[pairs['Lower Index'].to_numpy()].copy()
+    lower.insert(0, 'Relation', pairs['Relation'].to_numpy())
+    lower.insert(0, 'Type', 'Lower')
+    lower.insert(0, 'No', pairs['Upper Index'].map(group_no).to_numpy())
+    lower['_order'] = pairs['Lower Index'].to_numpy()
+
+    report = pd.concat([upper, lower], ignore_index=True)
+    report = report.sort_values(by=['No', 'Type', '_order'], ascending=[True, False, True], kind='stable')
+    return report.drop(columns='_order').reset_index(drop=True)